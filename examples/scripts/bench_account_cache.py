@@ -0,0 +1,54 @@
+"""
+Benchmark: account reads (positions, balance, orders) with and without the
+push-maintained account cache, plus a consistency check across a fill.
+"""
+import logging
+import time
+
+import fake_opend
+from futu import TrdSide, OrderType
+from moomoo_mcp.opend.client import get_client
+
+N = 500
+
+
+def timed_reads(client):
+    t0 = time.perf_counter()
+    for _ in range(N):
+        client.get_positions()
+        client.get_balance()
+        client.get_orders(symbol="HK.00700")
+    return (time.perf_counter() - t0) / (3 * N)
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.002)
+    client = get_client()
+    client.place_order("HK.00700", 100, 10.0, TrdSide.BUY, OrderType.NORMAL)
+
+    opend.calls.clear()
+    pull = timed_reads(client)
+    print(f"pull:  {pull * 1e6:9.1f} us/read  ({opend.total_calls()} OpenD requests for {3 * N} reads)")
+
+    client.enable_account_push()
+    opend.calls.clear()
+    push = timed_reads(client)
+    print(f"cache: {push * 1e6:9.1f} us/read  ({opend.total_calls()} OpenD requests for {3 * N} reads)")
+
+    # A fill arrives as order + deal pushes; the next reads must reflect it
+    trade_ctx = client._trade_ctx
+    before = client.get_positions()[0]["qty"], client.get_balance()["cash"]
+    order = client.place_order("HK.00700", 100, 10.0, TrdSide.BUY, OrderType.NORMAL)
+    trade_ctx.fill(order["order_id"])
+    opend.calls.clear()
+    after = client.get_positions()[0]["qty"], client.get_balance()["cash"]
+    status = client.get_orders(symbol="HK.00700")[-1]["order_status"]
+    print(f"after fill: qty {before[0]} -> {after[0]}, cash {before[1]:.0f} -> {after[1]:.0f}, "
+          f"order {status}, {opend.total_calls()} reload requests")
+    assert after[0] == before[0] + 100 and status == "FILLED_ALL"
+    print(f"account cache stats: {client.account_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
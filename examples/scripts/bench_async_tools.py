@@ -0,0 +1,51 @@
+"""
+Benchmark: tool throughput at 1, 8 and 32 concurrent calls against a fake OpenD.
+
+Compares the async tool layer registered in server.py with calling the
+sync tools one after another (the old behaviour).
+"""
+import asyncio
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.server import mcp
+from moomoo_mcp.market_data.get_quote import get_quote
+
+LATENCY = 0.02
+CALLS = 64
+SYMBOLS = [f"HK.{i:05d}" for i in range(CALLS)]
+
+
+def bench_sync() -> float:
+    t0 = time.perf_counter()
+    for s in SYMBOLS:
+        get_quote(s)
+    return CALLS / (time.perf_counter() - t0)
+
+
+async def bench_async(concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(symbol: str):
+        async with sem:
+            await mcp.call_tool("get_quote", {"symbol": symbol})
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(s) for s in SYMBOLS))
+    return CALLS / (time.perf_counter() - t0)
+
+
+def main():
+    logging.disable(logging.INFO)
+    fake_opend.install(latency=LATENCY)
+    print(f"Fake OpenD latency: {LATENCY * 1000:.0f} ms/request, {CALLS} get_quote calls\n")
+    print(f"{'mode':<22}{'calls/s':>10}")
+    print(f"{'sync (serial)':<22}{bench_sync():>10.1f}")
+    for c in (1, 8, 32):
+        rate = asyncio.run(bench_async(c))
+        print(f"{f'async x{c}':<22}{rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: a 30-name rebalance as 30 sequential place_order calls (market legs
+each fetch a quote) vs one place_basket call (one snapshot, one risk pass,
+concurrent submission). The place_order rate limit is lifted so the numbers
+show round-trip latency; with it, both are paced by OpenD's order quota.
+"""
+import logging
+import time
+
+import fake_opend
+from futu import TrdSide, OrderType
+from moomoo_mcp.config import config
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+SYMBOLS = [f"HK.{i:05d}" for i in range(1, 31)]
+
+
+def legs():
+    return [
+        {"symbol": s, "quantity": 10, "side": "BUY" if i % 2 else "SELL",
+         **({"order_type": "MARKET"} if i % 3 == 0 else {"price": 10.0})}
+        for i, s in enumerate(SYMBOLS)
+    ]
+
+
+def main():
+    logging.disable(logging.INFO)
+    config.max_order_value = 1e9
+    config.max_basket_value = 1e12
+    opend = fake_opend.install(latency=0.02)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    for leg in legs():
+        client.place_order(
+            leg["symbol"], leg["quantity"], leg.get("price", 0.0),
+            TrdSide.BUY if leg["side"] == "BUY" else TrdSide.SELL,
+            OrderType.MARKET if leg.get("order_type") == "MARKET" else OrderType.NORMAL,
+        )
+    serial = time.perf_counter() - t0
+    print(f"sequential place_order: {serial * 1000:7.1f} ms  {dict(opend.calls)}")
+
+    opend.calls.clear()
+    result = client.place_basket(legs())
+    print(f"place_basket:           {result['elapsed_s'] * 1000:7.1f} ms  {dict(opend.calls)}")
+    assert result["placed"] == len(SYMBOLS)
+
+    # One oversized leg is rejected on its own; the rest still go out
+    config.max_order_value = 2000.0
+    basket = legs()
+    basket[4]["quantity"] = 10_000
+    result = client.place_basket(basket)
+    print(f"oversized leg: placed {result['placed']}, rejected {result['rejected']}: "
+          f"{[r['error'] for r in result['legs'] if r['status'] == 'rejected']}")
+    assert result["rejected"] == 1
+
+
+if __name__ == "__main__":
+    main()
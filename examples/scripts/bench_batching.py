@@ -0,0 +1,62 @@
+"""
+Benchmark: a burst of single-symbol get_quote calls with and without micro-batching.
+
+64 threads each ask for a different symbol at the same moment; with a 3 ms
+window they are folded into a handful of get_stock_quote requests. Also
+checks that a burst larger than max_batch (or than the free capacity) is sent
+in chunks no bigger than either.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fake_opend
+from moomoo_mcp.opend.batcher import MicroBatcher
+from moomoo_mcp.opend.client import get_client
+
+BURST = 64
+SYMBOLS = [f"HK.{i:05d}" for i in range(1, BURST + 1)]
+
+
+def burst(client) -> float:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=BURST) as pool:
+        list(pool.map(client.get_quote, SYMBOLS))
+    return time.perf_counter() - t0
+
+
+def chunking():
+    sizes = []
+
+    def fetch(symbols):
+        sizes.append(len(symbols))
+        time.sleep(0.005)
+        return {s: {"code": s} for s in symbols}
+
+    for capacity, limit in ((None, 8), (lambda: 5, 5)):
+        sizes.clear()
+        batcher = MicroBatcher(fetch, window=0.003, max_batch=8, capacity=capacity)
+        with ThreadPoolExecutor(max_workers=BURST) as pool:
+            rows = list(pool.map(batcher.submit, SYMBOLS))
+        assert [r["code"] for r in rows] == SYMBOLS and max(sizes) <= limit, sizes
+        print(f"max_batch=8, capacity={'none' if capacity is None else 5}: chunk sizes {sorted(sizes, reverse=True)}")
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.02)
+    client = get_client()
+
+    elapsed = burst(client)
+    print(f"unbatched : {elapsed * 1000:6.0f} ms, get_stock_quote requests: {opend.calls['get_stock_quote']}")
+
+    client.enable_batching(window=0.003)
+    opend.calls.clear()
+    elapsed = burst(client)
+    print(f"batched   : {elapsed * 1000:6.0f} ms, get_stock_quote requests: {opend.calls['get_stock_quote']}")
+    print(f"batching stats: {client.batching_stats()['quote']}")
+    chunking()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: pulling out of 40 resting orders on one symbol, as get_orders plus
+one cancel_order per order vs one cancel_orders call; then a full flatten, which
+falls back to per-order cancels on a simulated account and uses cancel_all_order
+on a real one (with an order filling and a new one arriving mid-flatten). The
+modify_order rate limit is lifted so the numbers show round-trip latency.
+"""
+import logging
+import time
+
+import fake_opend
+from futu import TrdSide, OrderType
+from moomoo_mcp.config import config
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+PER_SYMBOL = 40
+
+
+def seed(client, symbols):
+    for s in symbols:
+        for i in range(PER_SYMBOL):
+            client.place_order(s, 10, 10.0 + i * 0.1, TrdSide.BUY if i % 2 else TrdSide.SELL, OrderType.NORMAL)
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.02)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    seed(client, ["HK.00700", "HK.00005", "HK.00388"])
+
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    for order in client.get_orders(symbol="HK.00700", status_filter=["SUBMITTED"]):
+        client.cancel_order(order["order_id"])
+    print(f"get_orders + cancel_order loop: {(time.perf_counter() - t0) * 1000:7.1f} ms  {dict(opend.calls)}")
+
+    opend.calls.clear()
+    result = client.cancel_orders(symbol="HK.00005")
+    print(f"cancel_orders(symbol):          {result['elapsed_s'] * 1000:7.1f} ms  {dict(opend.calls)}  "
+          f"cancelled {len(result['cancelled'])}, failed {len(result['failures'])}")
+    assert len(result["cancelled"]) == PER_SYMBOL
+
+    opend.calls.clear()
+    result = client.cancel_orders(symbol="HK.00388", side="SELL", min_price=11.0)
+    print(f"cancel_orders(side, price):     {result['elapsed_s'] * 1000:7.1f} ms  {dict(opend.calls)}  "
+          f"cancelled {len(result['cancelled'])}")
+
+    opend.calls.clear()
+    result = client.cancel_orders()
+    print(f"cancel_orders() paper [{result['method']}]: {result['elapsed_s'] * 1000:7.1f} ms  {dict(opend.calls)}  "
+          f"cancelled {len(result['cancelled'])}")
+    assert result["method"] == "per_order" and not result["failures"]
+    assert not client.get_orders(status_filter=["SUBMITTED"])
+
+    # Real account: one cancel_all_order; the report reflects what OpenD actually cancelled
+    seed(client, ["HK.00700"])
+    config.env = "live"
+    trade_ctx = client._trade_ctx
+    cancel_all = trade_ctx.cancel_all_order
+    filled = str(trade_ctx._next_id - 1)
+    late = {}
+
+    def racing_cancel_all(**kwargs):
+        trade_ctx.fill(filled)
+        late["order"] = client.place_order("HK.00700", 10, 9.0, TrdSide.BUY, OrderType.NORMAL)
+        return cancel_all(**kwargs)
+
+    trade_ctx.cancel_all_order = racing_cancel_all
+    opend.calls.clear()
+    try:
+        result = client.cancel_orders()
+    finally:
+        config.env = "paper"
+    print(f"cancel_orders() live  [{result['method']}]: {result['elapsed_s'] * 1000:7.1f} ms  {dict(opend.calls)}  "
+          f"cancelled {len(result['cancelled'])}, not cancelled {result['not_cancelled']}")
+    assert result["method"] == "cancel_all_order"
+    assert filled not in result["cancelled"] and str(late["order"]["order_id"]) in result["cancelled"]
+    assert len(result["cancelled"]) == PER_SYMBOL
+
+    # Real account, cancel_all_order rejected: falls back to per-order cancels
+    seed(client, ["HK.00005"])
+    config.env = "live"
+    trade_ctx.cancel_all_order = lambda **kwargs: (fake_opend.RET_ERROR, "cancel all rejected")
+    try:
+        result = client.cancel_orders()
+    finally:
+        config.env = "paper"
+        trade_ctx.cancel_all_order = cancel_all
+    print(f"cancel_orders() live, rejected [{result['method']}]: cancelled {len(result['cancelled'])}  "
+          f"({result['fallback_error']})")
+    assert result["method"] == "per_order" and len(result["cancelled"]) == PER_SYMBOL
+
+
+if __name__ == "__main__":
+    main()
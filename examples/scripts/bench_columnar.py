@@ -0,0 +1,48 @@
+"""
+Benchmark: records vs columnar (format="columns") tool output.
+
+Measures JSON payload size and encode time (DataFrame -> Python -> JSON)
+for bulk outputs: 1000 kline bars, a 400-symbol snapshot and an option chain.
+"""
+import json
+import logging
+import time
+
+import fake_opend
+from fake_opend import make_klines
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.utils.encoding import encode_frame
+
+ROUNDS = 50
+
+
+def measure(df, format, precision=None):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        payload = json.dumps(encode_frame(df, format, precision))
+    return len(payload), (time.perf_counter() - t0) / ROUNDS * 1000
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.0)
+    client = get_client()
+    quote_ctx = client._quote_ctx
+
+    frames = {
+        "kline x1000": make_klines("HK.00700", 1000),
+        "snapshot x400": quote_ctx.get_market_snapshot([f"HK.{i:05d}" for i in range(1, 401)])[1],
+        "option chain x42": quote_ctx.get_option_chain("HK.00700", start="2025-01-01", end="2025-03-28")[1],
+    }
+    print(f"{'payload':<18}{'records':>22}{'columns':>22}{'columns, 3 dp':>22}")
+    for name, df in frames.items():
+        cells = [measure(df, "records"), measure(df, "columns"), measure(df, "columns", 3)]
+        print(f"{name:<18}" + "".join(f"{size / 1024:>10.1f} KB {ms:>6.2f} ms" for size, ms in cells))
+
+    # The tool path end to end
+    rows = client.get_kline("HK.00700", limit=1000, format="columns")
+    assert len(rows["close"]) == 1000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: field projection on polling-style calls.
+
+Compares full rows with `fields` projections (explicit names and presets)
+for a 400-symbol snapshot and single quotes: JSON bytes and time per call,
+with OpenD latency set to zero so only conversion cost is measured.
+"""
+import json
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+ROUNDS = 200
+UNIVERSE = [f"HK.{i:05d}" for i in range(1, 401)]
+
+
+def measure(fn):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        payload = json.dumps(fn(), default=str)
+    return len(payload), (time.perf_counter() - t0) / ROUNDS * 1000
+
+
+def main():
+    logging.disable(logging.INFO)
+    fake_opend.install(latency=0.0)
+    client = get_client()
+    client._scheduler = RequestScheduler({})  # the fake OpenD has no rate limit
+
+    cases = {
+        "snapshot x400, all fields": lambda: client.get_market_snapshot(UNIVERSE),
+        "snapshot x400, price preset": lambda: client.get_market_snapshot(UNIVERSE, fields=["price"]),
+        "snapshot x400, 2 fields": lambda: client.get_market_snapshot(UNIVERSE, fields=["code", "last_price"]),
+        "quote, all fields": lambda: client.get_quote("HK.00700"),
+        "quote, 2 fields": lambda: client.get_quote("HK.00700", fields=["last_price", "volume"]),
+        "positions, risk preset": lambda: client.get_positions(fields=["risk"]),
+        "balance, 3 fields": lambda: client.get_balance(fields=["cash", "power", "total_assets"]),
+    }
+    for name, fn in cases.items():
+        size, ms = measure(fn)
+        print(f"{name:<30}{size:>9,} bytes {ms:>8.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
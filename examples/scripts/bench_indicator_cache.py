@@ -0,0 +1,71 @@
+"""
+Benchmark: an agent repeating the same get_technical_indicators request
+between bar closes, with the result cache off vs on (both the full recompute
+and the incremental path), then a bar closes and the next request must miss.
+OpenD latency is zero so the numbers show compute, not the network.
+"""
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+from moomoo_mcp.analysis.indicators import compile_plan, parse_indicator
+from moomoo_mcp.analysis.result_cache import results
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+WATCHLIST = [f"HK.{i:05d}" for i in range(1, 21)]
+INDICATORS = ["RSI_14", "SMA_20", "SMA_200", "EMA_50", "MACD", "BOLL", "ATR", "VOL_SMA_20", "RSI"]
+LIMIT = 1000
+REPEATS = 20
+
+
+def poll(incremental):
+    return {s: get_technical_indicators(s, INDICATORS, limit=LIMIT, incremental=incremental) for s in WATCHLIST}
+
+
+def main():
+    logging.disable(logging.WARNING)
+    opend = fake_opend.install(latency=0.0)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    size = results.max_entries
+
+    for incremental in (False, True):
+        timings = {}
+        for enabled in (False, True):
+            results.max_entries = size if enabled else 0
+            results.clear()
+            expected = poll(incremental)  # first request: computes (and seeds streams)
+            t0 = time.perf_counter()
+            for _ in range(REPEATS):
+                assert poll(incremental) == expected
+            timings[enabled] = (time.perf_counter() - t0) / (REPEATS * len(WATCHLIST))
+        print(f"{'incremental' if incremental else 'full recompute'} repeats: "
+              f"cache off {timings[False] * 1000:6.3f} ms, on {timings[True] * 1000:6.3f} ms per request "
+              f"(x{timings[False] / timings[True]:.1f})")
+
+    # A bar closes: the next request is a miss and reflects the new bar
+    before = get_technical_indicators("HK.00001", INDICATORS, limit=LIMIT)
+    client._quote_ctx.append_bar("HK.00001", "K_DAY")
+    after = get_technical_indicators("HK.00001", INDICATORS, limit=LIMIT)
+    assert after["timestamp"] != before["timestamp"]
+    fresh = get_technical_indicators("HK.00001", INDICATORS, limit=LIMIT, incremental=False)
+    assert after["indicators"] == fresh["indicators"]
+    print(f"after a bar close: miss, new timestamp {after['timestamp']}; cache {results.stats()}")
+
+    # Plan compilation: memoized vs re-parsing every name
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        compile_plan(INDICATORS)
+    memo = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    for _ in range(n):
+        [parse_indicator(name) for name in INDICATORS]
+    parse = (time.perf_counter() - t0) / n
+    print(f"plan: memoized {memo * 1e6:.2f} us vs parsing {parse * 1e6:.2f} us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: trend context for 5 indicators over 1000 daily bars. Old way:
+get_kline for the bars plus a client-side recompute of the full series. New
+way: one get_technical_indicators(series=True) call, optionally downsampled.
+Also reports how well LTTB vs every-k preserves the close's shape at the same
+point count, and LTTB's cost on long inputs.
+"""
+import json
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+import fake_opend
+from moomoo_mcp.analysis.downsample import downsample_indices
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+from moomoo_mcp.analysis.indicators import IndicatorEngine
+from moomoo_mcp.analysis.result_cache import results
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+SYMBOL = "HK.00700"
+INDICATORS = ["RSI_14", "SMA_50", "EMA_20", "MACD", "BOLL"]
+LIMIT = 1000
+RUNS = 20
+
+
+def kb(obj) -> float:
+    return len(json.dumps(obj, default=str)) / 1024
+
+
+def main():
+    logging.disable(logging.WARNING)
+    fake_opend.install(latency=0.02)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    results.max_entries = 0  # every run computes
+
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        bars = client.get_kline(SYMBOL, limit=LIMIT)
+        engine = IndicatorEngine.from_frame(pd.DataFrame(bars))
+        local = {name: engine.series(name) for name in INDICATORS}
+    old_t = (time.perf_counter() - t0) / RUNS
+    print(f"get_kline + local recompute: {old_t * 1000:6.1f} ms, {kb(bars):7.1f} KB on the wire")
+
+    for max_points in (0, 200, 100):
+        t0 = time.perf_counter()
+        for _ in range(RUNS):
+            resp = get_technical_indicators(SYMBOL, INDICATORS, limit=LIMIT, series=True, max_points=max_points)
+        new_t = (time.perf_counter() - t0) / RUNS
+        print(f"series=True max_points={max_points or 'off':>4}: {new_t * 1000:6.1f} ms, {kb(resp):7.1f} KB on the wire")
+    full = get_technical_indicators(SYMBOL, INDICATORS, limit=LIMIT, series=True)["series"]
+    rsi = np.array([np.nan if v is None else v for v in full["RSI_14"]])
+    assert np.allclose(rsi, np.round(local["RSI_14"], 3), equal_nan=True)
+
+    # Shape preservation: error of the linear interpolation through the kept points
+    close = client._quote_ctx.history(SYMBOL, "K_DAY")["close"].to_numpy()[-LIMIT:]
+    x = np.arange(len(close))
+    for target in (50, 100, 200):
+        errs = {}
+        for method in ("lttb", "every_k"):
+            idx = downsample_indices(close, target, method)
+            rebuilt = np.interp(x, idx, close[idx])
+            errs[method] = (np.abs(rebuilt - close).max(), close[idx].max() == close.max())
+        print(f"{target:4d} points: max error lttb {errs['lttb'][0]:7.3f} (keeps high: {errs['lttb'][1]})"
+              f" vs every_k {errs['every_k'][0]:7.3f} (keeps high: {errs['every_k'][1]})")
+
+    y = np.cumsum(np.random.default_rng(0).normal(size=100_000))
+    t0 = time.perf_counter()
+    downsample_indices(y, 1000, "lttb")
+    print(f"lttb 100k -> 1000 points: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
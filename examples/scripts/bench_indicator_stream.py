@@ -0,0 +1,73 @@
+"""
+Benchmark: polling 1-minute indicators across a watchlist as new bars close.
+Full recompute from `limit` bars on every poll vs incremental streams that
+fetch and apply only the bars since the last poll; results are compared.
+"""
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+from moomoo_mcp.analysis.indicators import TechnicalAnalysis
+from moomoo_mcp.analysis.result_cache import results
+from moomoo_mcp.analysis.streaming import IndicatorStream, streams
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+WATCHLIST = [f"HK.{i:05d}" for i in range(1, 21)]
+INDICATORS = ["RSI_14", "SMA_20", "EMA_50", "WMA_20", "MACD", "BOLL", "ATR", "VOL_SMA_20"]
+LIMIT = 1000
+POLLS = 10
+
+
+def poll(incremental):
+    return {s: get_technical_indicators(s, INDICATORS, period="1m", limit=LIMIT, incremental=incremental)
+            for s in WATCHLIST}
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.002)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    results.max_entries = 0  # measure the streams, not the result cache
+    quote_ctx = client._quote_ctx
+    poll(True)  # seed one stream per symbol
+
+    full_t = inc_t = 0.0
+    for _ in range(POLLS):
+        for s in WATCHLIST:
+            quote_ctx.append_bar(s, "K_1M")  # a minute closes on every symbol
+        t0 = time.perf_counter()
+        full = poll(False)
+        full_t += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        inc = poll(True)
+        inc_t += time.perf_counter() - t0
+        for s in WATCHLIST:
+            assert inc[s]["timestamp"] == full[s]["timestamp"]
+            assert inc[s]["indicators"] == full[s]["indicators"], (s, inc[s]["indicators"], full[s]["indicators"])
+
+    n = POLLS * len(WATCHLIST)
+    print(f"full recompute ({LIMIT} bars): {full_t / n * 1000:6.2f} ms per symbol-poll")
+    print(f"incremental streams:         {inc_t / n * 1000:6.2f} ms per symbol-poll  (x{full_t / inc_t:.1f})")
+    print(f"stream stats: {streams.stats()}")
+
+    # Compute alone (no fetch): one closed bar applied to a stream vs a 1000-bar recompute
+    bars = quote_ctx.history("HK.00700", "K_1M")
+    window = bars.tail(LIMIT + 200).reset_index(drop=True)
+    stream = IndicatorStream(INDICATORS)
+    stream.advance(window.iloc[:LIMIT])
+    t0 = time.perf_counter()
+    for i in range(LIMIT, LIMIT + 200):
+        stream.advance(window.iloc[i - 1:i + 1])
+    step = (time.perf_counter() - t0) / 200
+    t0 = time.perf_counter()
+    for i in range(LIMIT, LIMIT + 20):
+        TechnicalAnalysis.compute(window.iloc[i + 1 - LIMIT:i + 1], INDICATORS)
+    batch = (time.perf_counter() - t0) / 20
+    print(f"compute only: stream {step * 1e6:7.1f} us/bar vs recompute {batch * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: multi-year 1-minute history through paginated request_history_kline.
+
+get_kline follows page_req_key for limits above one 1000-bar page, and
+backfill_kline streams every page into the on-disk kline store. Peak Python
+memory is tracked to show pages are not accumulated.
+"""
+import logging
+import tempfile
+import time
+import tracemalloc
+
+import fake_opend
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.storage.kline_store import KlineStore
+
+HISTORY_BARS = 250_000  # ~4 years of CN 1-minute bars
+LIMIT = 20_000
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.005)
+    client = get_client()
+    client._scheduler = type(client._scheduler)({})  # the fake OpenD has no rate limit
+    client._quote_ctx.history_bars = HISTORY_BARS
+    client._quote_ctx.history("HK.00700", "K_1M")  # generate the fake history up front
+
+    t0 = time.perf_counter()
+    rows = client.get_kline("HK.00700", ktype="K_1M", limit=LIMIT)
+    print(f"get_kline(limit={LIMIT}): {len(rows)} bars, {opend.calls['request_history_kline']} pages "
+          f"in {time.perf_counter() - t0:.2f}s ({rows[0]['time_key']} .. {rows[-1]['time_key']})")
+
+    with tempfile.TemporaryDirectory() as root:
+        client._kline_store = KlineStore(root)
+        opend.calls.clear()
+        pages = []
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        summary = client.backfill_kline("HK.00700", ktype="K_1M", start="2000-01-01",
+                                        progress=lambda p, b: pages.append(p))
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"backfill_kline: {summary['bars']} bars in {summary['pages']} pages, {elapsed:.2f}s, "
+              f"peak Python memory {peak / 1e6:.1f} MB, {len(pages)} progress callbacks")
+        print(f"  stored {summary['stored_rows']} rows, {summary['first_time']} .. {summary['last_time']}")
+
+        opend.calls.clear()
+        t0 = time.perf_counter()
+        rows = client.get_kline("HK.00700", ktype="K_1M", limit=LIMIT, start="2000-01-01")
+        print(f"get_kline from store: {len(rows)} bars, {opend.calls['request_history_kline']} requests "
+              f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        client._kline_store = None
+
+
+if __name__ == "__main__":
+    main()
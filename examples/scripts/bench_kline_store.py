@@ -0,0 +1,89 @@
+"""
+Benchmark: repeated get_kline / get_technical_indicators with the on-disk kline store.
+
+Without the store every call re-downloads the full bar range. With it the
+first call seeds the store, later calls are served from disk and, once the
+stored tail goes stale, only the bars since the last stored day are requested.
+Also times a one-bar merge into a 100k-bar 1m series (in-place append vs full
+rewrite) and checks that concurrent merges into one series lose no bars.
+"""
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import fake_opend
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.storage.kline_store import KlineStore
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+
+ROUNDS = 20
+LIMIT = 1000
+
+
+def run(client, opend, label):
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        client.get_kline("HK.00700", ktype="K_DAY", limit=LIMIT)
+    elapsed = time.perf_counter() - t0
+    print(f"{label}: {ROUNDS} x get_kline({LIMIT}) in {elapsed * 1000:.0f} ms, "
+          f"history requests: {opend.calls['request_history_kline']}")
+
+
+def merges():
+    bars = fake_opend.make_klines("HK.00700", 100_001, end=datetime(2025, 1, 2, 16, 0), minutes=1)
+    key = ("HK.00700", "K_1M", "qfq")
+    with tempfile.TemporaryDirectory() as root:
+        store = KlineStore(root)
+        store.merge(key, bars.iloc[:100_000])
+        t0 = time.perf_counter()
+        store.merge(key, bars.iloc[99_999:])  # re-sent forming bar + one new bar
+        append = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.merge(key, bars.iloc[50_000:50_001])  # overlapping: full rewrite
+        rewrite = time.perf_counter() - t0
+        print(f"one-bar merge into {len(bars) - 1} 1m bars: append {append * 1000:.1f} ms, "
+              f"full rewrite {rewrite * 1000:.1f} ms")
+
+        chunks = [bars.iloc[i:i + 50] for i in range(0, 5000, 50)]
+        key = ("HK.00700", "K_1M", "hfq")
+        threads = [threading.Thread(target=store.merge, args=(key, c)) for c in chunks]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pd.testing.assert_frame_equal(store.read(key), bars.iloc[:5000].reset_index(drop=True), check_dtype=False)
+        print(f"{len(chunks)} concurrent merges into one series: no bars lost {store.stats()}")
+
+
+def main():
+    logging.disable(logging.INFO)
+    client = get_client()
+    opend = fake_opend.install(latency=0.02)
+    run(client, opend, "no store  ")
+
+    with tempfile.TemporaryDirectory() as root:
+        client._kline_store = KlineStore(root)
+        run(client, opend, "kline store")
+
+        # Age the stored series past its freshness TTL: the next call fills the gap only
+        key = ("HK.00700", "K_DAY", "qfq")
+        client._kline_store.touch(key, fetched_at=0)
+        calls = opend.calls["request_history_kline"]
+        rows = client.get_kline("HK.00700", ktype="K_DAY", limit=LIMIT)
+        print(f"stale tail: {opend.calls['request_history_kline'] - calls} gap-fill request, {len(rows)} bars returned")
+
+        opend.calls.clear()
+        for _ in range(ROUNDS):
+            get_technical_indicators("HK.00700", indicators=["RSI_14", "SMA_20", "MACD"], limit=200)
+        print(f"{ROUNDS} x get_technical_indicators: history requests: {opend.calls['request_history_kline']}")
+        client._kline_store = None
+    merges()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: RSI/SMA/MACD on 5m, 15m, 60m and 1d bars for one symbol. One
+get_technical_indicators call per timeframe (a history series each) vs one
+get_multi_timeframe_indicators call that fetches 1m bars once, resamples the
+intraday timeframes that are cheaper that way and fetches the rest natively,
+with and without the kline store. The single call must never cost more
+history requests than the separate ones. The resampler is checked against
+a plain per-bar reference and timed on 100k bars.
+"""
+import logging
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import fake_opend
+from moomoo_mcp.analysis.get_multi_timeframe_indicators import get_multi_timeframe_indicators
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+from moomoo_mcp.analysis.resample import resample_bars, sessions_for
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+from moomoo_mcp.storage.kline_store import KlineStore
+
+SYMBOL = "HK.00700"
+INDICATORS = ["RSI_14", "SMA_20", "MACD"]
+TIMEFRAMES = ["5m", "15m", "60m", "1d"]
+LIMIT = 50
+
+
+def reference(df: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """Per-bar session/bucket labelling, then a pandas groupby."""
+    sessions = sessions_for(SYMBOL)
+
+    def label(ts: str) -> str:
+        t = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        m = t.hour * 60 + t.minute
+        if minutes == 0:
+            return t.strftime("%Y-%m-%d 00:00:00")
+        o, c = next(((o, c) for o, c in reversed(sessions) if m > o), sessions[0])
+        m = min(max(m, o), c)
+        end = min(o + max(-(-(m - o) // minutes), 1) * minutes, c)
+        return t.replace(hour=end // 60, minute=end % 60).strftime("%Y-%m-%d %H:%M:%S")
+
+    keys = df["time_key"].map(label)
+    g = df.groupby(keys, sort=True)
+    return pd.DataFrame({"open": g["open"].first(), "close": g["close"].last(), "high": g["high"].max(),
+                         "low": g["low"].min(), "volume": g["volume"].sum()}).reset_index(names="time_key")
+
+
+def requests(opend) -> int:
+    return opend.calls["request_history_kline"]
+
+
+def compare(opend, limit: int):
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    for tf in TIMEFRAMES:
+        get_technical_indicators(SYMBOL, INDICATORS, period=tf, limit=limit, incremental=False)
+    separate = requests(opend)
+    print(f"limit={limit}")
+    print(f"  per-timeframe calls:      {(time.perf_counter() - t0) * 1000:6.0f} ms, "
+          f"{separate} history requests over {len(TIMEFRAMES)} series")
+
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    result = get_multi_timeframe_indicators(SYMBOL, INDICATORS, TIMEFRAMES, limit=limit)
+    print(f"  multi-timeframe (cold):   {(time.perf_counter() - t0) * 1000:6.0f} ms, "
+          f"{requests(opend)} history requests ({result['base_bars']} 1m bars)")
+    print("    bars per timeframe:", {tf: (r["bars"], r["source"]) for tf, r in result["timeframes"].items()},
+          "warnings:", result["warnings"])
+    assert all(r["bars"] == limit for r in result["timeframes"].values())
+    assert requests(opend) <= separate, (requests(opend), separate)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    opend = fake_opend.install(latency=0.02)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    client._quote_ctx.history_bars = 100_000
+    for ktype in ("K_1M", "K_5M", "K_15M", "K_60M", "K_DAY"):
+        client._quote_ctx.history(SYMBOL, ktype)  # generate the fake histories up front
+
+    for limit in (LIMIT, 200):
+        compare(opend, limit)
+
+    with tempfile.TemporaryDirectory() as root:
+        client._kline_store = KlineStore(root)
+        get_multi_timeframe_indicators(SYMBOL, INDICATORS, TIMEFRAMES, limit=LIMIT)
+        for ktype in ("K_1M", "K_60M", "K_DAY"):
+            client._kline_store.touch((SYMBOL, ktype, "qfq"), fetched_at=0)  # as if a minute later
+        opend.calls.clear()
+        t0 = time.perf_counter()
+        get_multi_timeframe_indicators(SYMBOL, INDICATORS, TIMEFRAMES, limit=LIMIT)
+        print(f"multi-timeframe (store):  {(time.perf_counter() - t0) * 1000:6.0f} ms, "
+              f"{requests(opend)} history requests (gap fills)")
+        client._kline_store = None
+
+    # Correctness against the reference, and session boundaries
+    base = client._quote_ctx.history(SYMBOL, "K_1M")
+    for ktype, minutes in (("K_5M", 5), ("K_60M", 60), ("K_DAY", 0)):
+        ours = resample_bars(base.tail(20_000), ktype, SYMBOL)
+        ref = reference(base.tail(20_000), minutes)
+        pd.testing.assert_frame_equal(ours[ref.columns].reset_index(drop=True), ref, check_dtype=False)
+    hours = set(resample_bars(base, "K_60M", SYMBOL)["time_key"].str[11:16])
+    assert hours == {"10:30", "11:30", "12:00", "14:00", "15:00", "16:00"}, hours
+    print("resample matches reference; HK 60m labels:", sorted(hours))
+
+    for ktype in ("K_5M", "K_60M", "K_DAY"):
+        t0 = time.perf_counter()
+        out = resample_bars(base, ktype, SYMBOL)
+        print(f"resample {len(base)} 1m bars -> {ktype:5s}: {(time.perf_counter() - t0) * 1000:6.1f} ms ({len(out)} bars)")
+
+
+if __name__ == "__main__":
+    main()
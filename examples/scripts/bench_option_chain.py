@@ -0,0 +1,117 @@
+"""
+Benchmark: implied volatility and greeks for a 500-contract option chain,
+quoted one contract per snapshot request and solved with a scalar Newton
+loop, vs one analyze_option_chain call (one chunked snapshot, one array
+pass). Also checks the recovered IVs against the fake market's smile, the
+chain cache on a repeat call, and the engine alone on 100k contracts.
+"""
+import logging
+import math
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+import fake_opend
+from moomoo_mcp.analysis.analyze_option_chain import analyze_option_chain
+from moomoo_mcp.analysis.black_scholes import greeks, implied_vol
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+SYMBOL = "HK.00700"
+RATE = 0.04
+VEGA_FLOOR = 1e-3  # price change per vol point below which an IV is not meaningful
+START = (date.today() + timedelta(days=20)).isoformat()
+END = (date.today() + timedelta(days=30)).isoformat()
+
+
+def scalar_iv(price, spot, strike, t, is_call):
+    """Per-contract Newton with bisection fallback, as a quote-by-quote script would do it."""
+    lo, hi, vol = 1e-4, 5.0, 0.3
+    for _ in range(100):
+        diff = fake_opend.option_price(spot, strike, t, vol, is_call, RATE) - price
+        if abs(diff) < 1e-12 * spot:
+            return vol
+        lo, hi = (vol, hi) if diff < 0 else (lo, vol)
+        d1 = (math.log(spot / strike) + (RATE + 0.5 * vol * vol) * t) / (vol * math.sqrt(t))
+        vega = spot * math.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi) * math.sqrt(t)
+        step = vol - diff / vega if vega > 1e-12 else -1.0
+        vol = step if lo < step < hi else 0.5 * (lo + hi)
+    return vol
+
+
+def main():
+    logging.disable(logging.WARNING)
+    opend = fake_opend.install(latency=0.02)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    quote_ctx = client._quote_ctx
+    quote_ctx.option_strikes = 62  # 125 strikes x call/put x 2 weekly expiries = 500 contracts
+    quote_ctx.option_expiries = 2
+
+    # Per-contract: one snapshot request and one scalar solve per code
+    chain = client.get_option_chain(SYMBOL, START, END)
+    client._option_chains.clear()
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    spot = client.get_market_snapshot([SYMBOL])[0]["last_price"]
+    scalar = {}
+    for c in chain:
+        row = client.get_market_snapshot([c["code"]])[0]
+        expiry = datetime.fromisoformat(c["strike_time"]) + timedelta(days=1)
+        t = (expiry - datetime.now()).total_seconds() / (365 * 86400)
+        scalar[c["code"]] = scalar_iv(0.5 * (row["bid_price"] + row["ask_price"]), spot, c["strike_price"], t,
+                                      c["option_type"] == "CALL")
+    naive_s = time.perf_counter() - t0
+    print(f"per-contract, {len(chain)} contracts: {naive_s:6.2f} s  "
+          f"snapshot requests={opend.calls['get_market_snapshot']}")
+
+    # Vectorized: cached chain, one chunked snapshot, one array pass
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    result = analyze_option_chain(SYMBOL, START, END, rate=RATE, format="columns", precision=-1)
+    fast_s = time.perf_counter() - t0
+    print(f"analyze_option_chain:        {fast_s:6.2f} s  snapshot requests={opend.calls['get_market_snapshot']} "
+          f"chain requests={opend.calls['get_option_chain']}  timing {result['timing']}  "
+          f"speedup {naive_s / fast_s:.0f}x")
+
+    cols = result["contracts"]
+    iv = np.array([np.nan if v is None else v for v in cols["iv"]])
+    smile = np.array([fake_opend.option_smile(spot, k) for k in cols["strike_price"]])
+    ref = np.array([scalar[c] for c in cols["code"]])
+    ok = ~np.isnan(iv)
+    # Far from the money the premium barely moves with vol, so float rounding in the quote shows up in the IV
+    tradable = ok & (np.array([v or 0.0 for v in cols["vega"]]) >= VEGA_FLOOR)
+    print(f"  priced {ok.sum()}/{result['count']}  max |iv - smile| = {np.abs(iv - smile)[ok].max():.2e} "
+          f"(vega >= {VEGA_FLOOR}: {np.abs(iv - smile)[tradable].max():.2e} on {tradable.sum()})  "
+          f"max |iv - scalar solver| = {np.abs(iv - ref)[ok].max():.2e}")
+    assert result["unpriced"] == 0 and np.abs(iv - smile)[tradable].max() < 1e-6
+
+    opend.calls.clear()
+    t0 = time.perf_counter()
+    analyze_option_chain(SYMBOL, START, END, rate=RATE)
+    print(f"repeat call: {(time.perf_counter() - t0) * 1000:.0f} ms  chain requests={opend.calls['get_option_chain']}  "
+          f"cache {client.option_chain_stats()}")
+
+    # Engine alone on a synthetic 100k-contract book
+    rng = np.random.default_rng(0)
+    n = 100_000
+    strike = 100.0 * np.exp(rng.uniform(-0.5, 0.5, n))
+    t = rng.uniform(7, 730, n) / 365.0
+    is_call = rng.random(n) < 0.5
+    vol = 0.3 + 0.5 * np.log(strike / 100.0) ** 2
+    price = np.array([fake_opend.option_price(100.0, k, tt, v, c, RATE)
+                      for k, tt, v, c in zip(strike, t, vol, is_call)])
+    t0 = time.perf_counter()
+    solved = implied_vol(price, 100.0, strike, t, RATE, 0.0, is_call)
+    g = greeks(100.0, strike, t, RATE, 0.0, solved, is_call)
+    elapsed = time.perf_counter() - t0
+    ok = ~np.isnan(solved)
+    tradable = ok & (g["vega"] >= VEGA_FLOOR)
+    print(f"engine, {n} contracts: {elapsed * 1000:.0f} ms  priced {ok.sum()}  "
+          f"max |iv error| = {np.abs(solved - vol)[ok].max():.2e} "
+          f"(vega >= {VEGA_FLOOR}: {np.abs(solved - vol)[tradable].max():.2e} on {tradable.sum()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: order lookups from the local order store vs order_list_query,
+and local rejection of cancels against orders that are already terminal.
+"""
+import logging
+import time
+
+import fake_opend
+from futu import TrdSide, OrderType
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.errors import OrderStateError
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+ORDERS = 2000
+SYMBOLS = [f"HK.{i:05d}" for i in range(1, 201)]
+N = 200
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    for _ in range(N):
+        rows = fn()
+    return (time.perf_counter() - t0) / N, rows
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.002)
+    client = get_client()
+    client._scheduler = RequestScheduler({})  # seeding thousands of orders; skip the place_order quota
+    trade_ctx = client._trade_ctx
+    for i in range(ORDERS):
+        order = client.place_order(SYMBOLS[i % len(SYMBOLS)], 100, 10.0, TrdSide.BUY, OrderType.NORMAL)
+        if i % 3 == 0:
+            trade_ctx.fill(order["order_id"])
+
+    query = lambda: client.get_orders(symbol="HK.00007", status_filter=["SUBMITTED"])
+    opend.calls.clear()
+    pull, rows = timed(query)
+    print(f"order_list_query: {pull * 1e6:9.1f} us/lookup ({opend.total_calls()} requests, {len(rows)} rows)")
+
+    client.enable_account_push()
+    opend.calls.clear()
+    query()  # one full order_list_query loads the store
+    local, local_rows = timed(query)
+    print(f"order store:      {local * 1e6:9.1f} us/lookup ({opend.total_calls()} requests, {len(local_rows)} rows)")
+    assert {r["order_id"] for r in rows} == {r["order_id"] for r in local_rows}
+
+    # Fills pushed after the load show up without another query
+    open_id = local_rows[0]["order_id"]
+    trade_ctx.fill(open_id)
+    assert open_id not in [r["order_id"] for r in query()]
+
+    # Cancelling a filled order never reaches OpenD
+    opend.calls.clear()
+    try:
+        client.cancel_order(open_id)
+    except OrderStateError as e:
+        print(f"rejected locally: {e} ({opend.total_calls()} requests)")
+    assert opend.total_calls() == 0
+    print(f"order store stats: {client.account_cache_stats()['orders']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark: get_quote latency with and without the push-fed quote cache.
+
+Pushes are simulated by feeding rows straight into the client's QuoteCache,
+the same path QuotePushHandler uses on futu's callback thread.
+"""
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.opend.client import get_client
+
+SYMBOL = "HK.00700"
+N = 200
+
+
+def timed(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.002)
+    client = get_client()
+
+    pull = timed(lambda: client.get_quote(SYMBOL), 50)
+    pull_calls = opend.total_calls()
+
+    client.enable_quote_push()
+    client.get_quote(SYMBOL)  # warms cache + push subscription
+    opend.calls.clear()
+    row = client.get_quote(SYMBOL)
+    client._quote_cache.on_push([row])
+    push = timed(lambda: client.get_quote(SYMBOL), N)
+
+    print(f"pull mode : {pull * 1e6:10.1f} us/quote  ({pull_calls / 50:.1f} OpenD requests/quote)")
+    print(f"push cache: {push * 1e6:10.1f} us/quote  ({opend.total_calls()} OpenD requests for {N} quotes)")
+    print(f"cache stats: {client.quote_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: stateful pre-trade check latency as the book grows (10 to 100k
+symbols), then an end-to-end run against the fake OpenD where fills pushed
+after an order move the position limit without any re-query (account push
+off, as by default). Also checks
+that a fill pushed while a reseed's query is in flight survives the seed.
+"""
+import logging
+import statistics
+import time
+
+import fake_opend
+from futu import TrdSide, OrderType
+from moomoo_mcp.config import config
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+from moomoo_mcp.risk.engine import MAX_EVENT_IDS, RiskEngine, RiskLimits
+from moomoo_mcp.risk.manager import RiskError
+
+CHECKS = 20_000
+THRESHOLD_US = 50.0
+
+
+def micro(n_symbols):
+    engine = RiskEngine(RiskLimits(max_position_value=1e9, max_gross_exposure=1e15, max_net_exposure=1e15,
+                                   max_daily_turnover=1e15, max_orders_per_minute=10**9))
+    positions = [{"code": f"US.S{i}", "qty": 100, "nominal_price": 10.0} for i in range(n_symbols)]
+    orders = [{"order_id": str(i), "code": f"US.S{i}", "qty": 50, "dealt_qty": 0, "price": 10.0,
+               "trd_side": "BUY", "order_status": "SUBMITTED"} for i in range(0, n_symbols, 10)]
+    engine.seed(positions, orders)
+    samples = []
+    for i in range(CHECKS):
+        symbol = f"US.S{i % n_symbols}"
+        t0 = time.perf_counter()
+        token = engine.check(symbol, TrdSide.BUY, 10, 10.0)
+        samples.append(time.perf_counter() - t0)
+        engine.release(token)
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    print(f"{n_symbols:>7} symbols: p50 {p50:5.1f} us  p99 {p99:5.1f} us  mean {statistics.mean(samples) * 1e6:5.1f} us")
+    return p99
+
+
+def end_to_end():
+    config.max_order_value = 1e9
+    opend = fake_opend.install(latency=0.01)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    client._risk.limits = RiskLimits(max_position_value=100_000)
+    assert not client._account_push  # risk limits get order/deal pushes without the account cache
+
+    # HK.00700: 200 held @ 320 = 64,000; room for 100 more @ 320 before 100,000
+    opend.calls.clear()
+    order = client.place_order("HK.00700", 100, 320.0, TrdSide.BUY, OrderType.NORMAL)
+    seeded = dict(opend.calls)
+    opend.calls.clear()
+    client._trade_ctx.fill(order["order_id"])
+    try:
+        client.place_order("HK.00700", 100, 320.0, TrdSide.BUY, OrderType.NORMAL)
+        raise AssertionError("position limit not enforced")
+    except RiskError as e:
+        print(f"after fill: {e}")
+    client.place_order("HK.00700", 100, 320.0, TrdSide.SELL, OrderType.NORMAL)  # reducing: allowed
+    print(f"seed requests {seeded}, later requests {dict(opend.calls)}")
+    print(f"risk stats: {client.risk_stats()}")
+
+
+def seed_race():
+    engine = RiskEngine(RiskLimits(max_position_value=1e9))
+    engine.seed([{"code": "HK.00700", "qty": 200, "nominal_price": 320.0}], [])
+    since = engine.begin_seed()
+    stale = [{"code": "HK.00700", "qty": 200, "nominal_price": 320.0}]  # queried before the fill below
+    engine.on_deals([{"deal_id": "d1", "code": "HK.00700", "qty": 100, "price": 320.0, "trd_side": "BUY"}])
+    engine.seed(stale, [], since)
+    assert engine.stats()["net_exposure"] == 300 * 320.0, engine.stats()
+    engine.seed(stale, [], engine.begin_seed())  # a later query is authoritative again
+    assert engine.stats()["net_exposure"] == 200 * 320.0, engine.stats()
+    engine.on_deals([{"deal_id": f"x{i}", "code": "HK.00005", "qty": 1, "price": 1.0, "trd_side": "BUY"}
+                     for i in range(3 * MAX_EVENT_IDS)])
+    assert len(engine._deal_ids) == MAX_EVENT_IDS
+    print("fill during reseed kept; deal id memory bounded at", MAX_EVENT_IDS)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    worst = max(micro(n) for n in (10, 1_000, 10_000, 100_000))
+    print(f"worst p99 {worst:.1f} us (threshold {THRESHOLD_US} us)")
+    assert worst < THRESHOLD_US
+    seed_race()
+    end_to_end()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: screening a 500-name universe for RSI_14 < 40, as 500 serial
+get_technical_indicators calls vs one scan_indicators call, then the compute
+stage inline vs across the process pool. The history_kline rate limit is
+lifted so the numbers show fetch latency and compute; the fake OpenD enforces
+the default 100-subscription quota, which a 500-name scan must not touch.
+"""
+import logging
+import os
+import time
+
+import fake_opend
+from moomoo_mcp.analysis import scan_indicators as scan_tool
+from moomoo_mcp.analysis.get_technical_indicators import get_technical_indicators
+from moomoo_mcp.analysis.screener import ScanPool, parse_filters, scan
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+UNIVERSE = "HK.800000"
+INDICATORS = ["RSI_14", "SMA_50", "MACD", "BOLL", "ATR"]
+FILTERS = ["RSI_14 < 40", "close < BOLL_MID"]
+
+
+def main():
+    logging.disable(logging.WARNING)
+    opend = fake_opend.install(latency=0.005)
+    client = get_client()
+    client._scheduler = RequestScheduler({})
+    symbols = client.get_plate_stock(UNIVERSE)
+
+    t0 = time.perf_counter()
+    serial = [get_technical_indicators(s, INDICATORS, limit=300, incremental=False) for s in symbols]
+    serial_t = time.perf_counter() - t0
+    hits = [r["symbol"] for r in serial if r["indicators"]["RSI_14"] < 40
+            and r["last_price"] < r["indicators"]["BOLL"]["BOLL_MID"]]
+    print(f"serial get_technical_indicators: {serial_t:6.2f} s, {len(hits)} matches")
+
+    opend.calls.clear()
+    result = scan_tool.scan_indicators(universe=UNIVERSE, indicators=INDICATORS, filters=FILTERS,
+                                       limit=300, max_results=1000)
+    print(f"scan_indicators:                 {result['timing']['total_s']:6.2f} s, {result['count']} matches  "
+          f"timing {result['timing']}  requests {dict(opend.calls)}")
+    assert sorted(m["symbol"] for m in result["matches"]) == sorted(hits)
+    assert not result["errors"] and result["scanned"] == len(symbols) and opend.calls["subscribe"] == 0 and not opend.rejected["subscribe"]
+
+    # Compute stage alone over the same frames, inline vs the process pool
+    frames, _ = client.get_kline_frames(symbols, limit=300)
+    filters = parse_filters(FILTERS)
+    pool = ScanPool()
+    scan(frames, symbols[:8], INDICATORS, filters, pool, parallel=True)  # start the workers
+    for parallel in (False, True):
+        t0 = time.perf_counter()
+        rows, stages = scan(frames, symbols, INDICATORS, filters, pool, parallel=parallel)
+        print(f"compute {'pool  ' if parallel else 'inline'} ({pool.workers} workers, {os.cpu_count()} cores): "
+              f"{(time.perf_counter() - t0) * 1000:7.1f} ms  {stages}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: rate-limit scheduler under a bulk kline pull with orders mixed in.
+
+The fake OpenD enforces a scaled-down history-kline limit (20 per 2 s). A
+bulk pull of 60 symbols runs in the BULK lane on the async client while
+orders are placed in the TRADING lane; we report rejected requests, how
+long orders took, and the scheduler's queue/wait metrics.
+"""
+import asyncio
+import logging
+import time
+
+import fake_opend
+from futu import TrdSide
+from moomoo_mcp.config import config
+from moomoo_mcp.opend.async_client import AsyncMoomooClient
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import Priority, RequestScheduler
+
+KLINE_LIMIT = (20, 2.0)
+SYMBOLS = [f"HK.{i:05d}" for i in range(1, 61)]
+
+
+async def run(limits) -> None:
+    client = get_client()
+    opend = fake_opend.install(latency=0.01)
+    opend.limit("request_history_kline", *KLINE_LIMIT)
+    client._scheduler = RequestScheduler(limits)
+    aclient = AsyncMoomooClient(client)
+
+    async def pull(symbol):
+        try:
+            await aclient.run_in_lane(Priority.BULK, client.get_kline, symbol, limit=50)
+        except Exception:
+            pass
+
+    async def order(i):
+        await asyncio.sleep(0.5 * i)
+        t0 = time.perf_counter()
+        await aclient.place_order("HK.00700", 100, 10.0, TrdSide.BUY)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(pull(s) for s in SYMBOLS), *(order(i) for i in range(3)))
+    elapsed = time.perf_counter() - t0
+    order_ms = [r * 1000 for r in results[len(SYMBOLS):]]
+    aclient.close()
+
+    print(f"  pulled {len(SYMBOLS)} symbols in {elapsed:.2f}s, rejected by OpenD: {opend.rejected['request_history_kline']}")
+    print(f"  order latency: max {max(order_ms):.0f} ms while bulk pull was running")
+    print(f"  history_kline stats: {client.scheduler_stats().get('history_kline')}")
+
+
+def main():
+    # Rejected requests are logged at ERROR by the client; the counts below cover them
+    logging.disable(logging.ERROR)
+    config.max_order_value = 1e9
+    print("Without scheduler:")
+    asyncio.run(run({}))
+    print("With scheduler:")
+    asyncio.run(run({"history_kline": KLINE_LIMIT, "place_order": (15, 30.0)}))
+
+
+if __name__ == "__main__":
+    main()
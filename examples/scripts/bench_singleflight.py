@@ -0,0 +1,38 @@
+"""
+Benchmark: identical concurrent get_kline calls with single-flight coalescing.
+
+32 threads ask for the same ("HK.00700", K_DAY, 200) bars at once; without
+coalescing that would be 32 history-kline requests against the quota.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fake_opend
+from moomoo_mcp.opend.client import get_client
+
+CONCURRENCY = 32
+
+
+def main():
+    logging.disable(logging.INFO)
+    opend = fake_opend.install(latency=0.05)
+    client = get_client()
+    client.get_kline("HK.00700", limit=1)  # subscribe once up front
+    opend.calls.clear()
+
+    # Mix spellings: all normalize to the same key
+    symbols = ["HK.00700", "00700", "hk.00700", "HK.00700"] * (CONCURRENCY // 4)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        results = list(pool.map(lambda s: client.get_kline(s, ktype="K_DAY", limit=200), symbols))
+    elapsed = time.perf_counter() - t0
+
+    assert all(len(r) == 200 for r in results)
+    print(f"{CONCURRENCY} concurrent get_kline calls in {elapsed * 1000:.0f} ms")
+    print(f"history kline requests sent to OpenD: {opend.calls['request_history_kline']}")
+    print(f"coalescing stats: {client.coalescing_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: snapshot of a 5,000-symbol universe.
+
+The fake OpenD enforces the 400-code request limit and 60 snapshots per 30s,
+with 150 ms per request. Chunks are fetched serially (one worker) and in
+parallel, then one chunk is made to fail to show partial results.
+"""
+import logging
+import time
+
+import fake_opend
+from moomoo_mcp.opend.chunked import ChunkedFetcher
+from moomoo_mcp.opend.client import get_client
+from moomoo_mcp.opend.scheduler import RequestScheduler
+
+UNIVERSE = [f"HK.{i:05d}" for i in range(1, 2501)] + [f"US.S{i:04d}" for i in range(2500)]
+
+
+def scan(client, workers):
+    client._chunked = ChunkedFetcher(max_workers=workers)
+    client._scheduler = RequestScheduler()  # each scan starts with a full burst budget
+    t0 = time.perf_counter()
+    result = client.get_universe_snapshot(UNIVERSE)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    logging.disable(logging.ERROR)
+    opend = fake_opend.install(latency=0.15)
+    opend.limit("get_market_snapshot", 60, 30.0)
+    client = get_client()
+
+    ret, err = client._quote_ctx.get_market_snapshot(UNIVERSE)
+    print(f"one request for {len(UNIVERSE)} codes: {err}")
+
+    for workers in (1, 4, 8):
+        result, elapsed = scan(client, workers)
+        print(f"{workers} worker(s): {result['count']} rows from {result['chunks']} chunks in {elapsed:.2f}s, "
+              f"failures: {len(result['failures'])}")
+    assert [r["code"] for r in result["rows"]] == UNIVERSE
+
+    opend.bad_codes.add("US.S1234")
+    result, elapsed = scan(client, 4)
+    print(f"with one bad code: {result['count']} rows, {len(result['missing'])} missing, "
+          f"failures: {result['failures']}")
+    print(f"rejected by OpenD rate limit: {opend.rejected['get_market_snapshot']}")
+
+
+if __name__ == "__main__":
+    main()
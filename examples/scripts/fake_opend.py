@@ -0,0 +1,422 @@
+"""
+In-process stand-in for Moomoo OpenD, used by the benchmark scripts.
+
+Each request sleeps for a fixed latency to mimic a socket round-trip and
+returns futu-shaped (ret, data) tuples, so MoomooClient runs unmodified.
+"""
+import math
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+import pandas as pd
+from futu import RET_OK, RET_ERROR, TradeOrderHandlerBase, TradeDealHandlerBase
+
+from moomoo_mcp.opend.client import MoomooClient, get_client
+
+
+class FakeOpenD:
+    """Shared state and call accounting for the fake contexts."""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.calls = Counter()
+        self.rejected = Counter()
+        self._limits = {}
+        self._history = {}
+        self.bad_codes = set()  # codes that make a snapshot request fail
+        self._lock = threading.Lock()
+
+    def limit(self, name: str, requests: int, period: float):
+        """Enforces an OpenD-style sliding-window limit on one request type."""
+        self._limits[name] = (requests, period)
+        self._history[name] = deque()
+
+    def hit(self, name: str):
+        """Records a request; returns an error string if it breaks a rate limit."""
+        with self._lock:
+            self.calls[name] += 1
+            if name in self._limits:
+                requests, period = self._limits[name]
+                now = time.monotonic()
+                history = self._history[name]
+                while history and now - history[0] >= period:
+                    history.popleft()
+                if len(history) >= requests:
+                    self.rejected[name] += 1
+                    return f"Request too frequent: at most {requests} per {period:g}s"
+                history.append(now)
+        if self.latency:
+            time.sleep(self.latency)
+        return None
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+def _price(code: str) -> float:
+    return 50.0 + (sum(ord(c) for c in code) % 400)
+
+
+def _quote_row(code: str) -> dict:
+    p = _price(code)
+    return {
+        "code": code, "name": code.split(".")[-1], "data_date": "2025-01-02", "data_time": "10:00:00",
+        "last_price": p, "open_price": p * 0.99, "high_price": p * 1.01, "low_price": p * 0.98,
+        "prev_close_price": p * 0.995, "volume": 1_000_000, "turnover": p * 1_000_000,
+        "turnover_rate": 0.1, "amplitude": 3.0, "suspension": False, "lot_size": 100,
+        "pe_ttm": 18.5, "pb_ratio": 3.2, "total_market_val": p * 1e9,
+    }
+
+
+def option_smile(spot: float, strike: float) -> float:
+    """Implied vol the fake market quotes options at: a smile around the spot."""
+    return 0.3 + 0.5 * math.log(strike / spot) ** 2
+
+
+def option_price(spot: float, strike: float, t: float, vol: float, is_call: bool, rate: float = 0.04) -> float:
+    """Scalar European Black-Scholes price (no dividends)."""
+    if t <= 0:
+        return max(spot - strike, 0.0) if is_call else max(strike - spot, 0.0)
+    cdf = lambda x: 0.5 * math.erfc(-x / math.sqrt(2.0))
+    d1 = (math.log(spot / strike) + (rate + 0.5 * vol * vol) * t) / (vol * math.sqrt(t))
+    d2 = d1 - vol * math.sqrt(t)
+    if is_call:
+        return spot * cdf(d1) - strike * math.exp(-rate * t) * cdf(d2)
+    return strike * math.exp(-rate * t) * cdf(-d2) - spot * cdf(-d1)
+
+
+KTYPE_MINUTES = {"K_1M": 1, "K_3M": 3, "K_5M": 5, "K_15M": 15, "K_30M": 30, "K_60M": 60}
+
+
+# HK regular sessions (minutes after midnight); intraday bars are labelled by their end time
+SESSIONS = [(9 * 60 + 30, 12 * 60), (13 * 60, 16 * 60)]
+
+
+def session_times(end: datetime, count: int, minutes: int) -> list:
+    """The last `count` intraday bar labels at or before `end`, on weekdays within SESSIONS."""
+    days, total = [], 0
+    day = end.replace(hour=0, minute=0)
+    while total < count:
+        if day.weekday() < 5:
+            labels = [day + timedelta(minutes=min(o + k * minutes, c))
+                      for o, c in SESSIONS for k in range(1, -(-(c - o) // minutes) + 1)]
+            labels = [t for t in labels if t <= end]
+            days.append(labels)
+            total += len(labels)
+        day -= timedelta(days=1)
+    out = [t for labels in reversed(days) for t in labels][-count:]
+    return [t.strftime("%Y-%m-%d %H:%M:%S") for t in out]
+
+
+def make_klines(code: str, count: int, end: datetime = None, minutes: int = 0) -> pd.DataFrame:
+    """Deterministic random-walk OHLCV bars ending at `end` (daily unless `minutes` is set)."""
+    import numpy as np
+    rng = np.random.default_rng(sum(ord(c) for c in code))
+    close = _price(code) * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, count))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, count))
+    volume = rng.integers(1_000, 100_000, count)
+    step = timedelta(minutes=minutes) if minutes else timedelta(days=1)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if minutes:
+        times = session_times(end.replace(second=0, microsecond=0), count, minutes)
+    else:
+        times = pd.date_range(end=end, periods=count, freq=step).strftime("%Y-%m-%d %H:%M:%S")
+    return pd.DataFrame({
+        "code": code, "time_key": times, "open": open_, "close": close,
+        "high": high, "low": low, "volume": volume, "turnover": close * volume,
+    })
+
+
+class FakeQuoteContext:
+    def __init__(self, opend: FakeOpenD, history_bars: int = 4000):
+        self._opend = opend
+        self._subs = set()
+        self.sub_quota = 100  # OpenD's default per-account subscription quota
+        self._history = {}
+        self.history_bars = history_bars
+        self.handlers = []
+        # Chain shape: strikes on each side of the spot, and weekly expiries ending at `end`
+        self.option_strikes = 10
+        self.option_expiries = 1
+        self._options = {}  # option code -> (underlying, strike, is_call, expiry date)
+
+    def get_global_state(self):
+        self._opend.hit("get_global_state")
+        return RET_OK, {}
+
+    def set_handler(self, handler):
+        self.handlers.append(handler)
+        return RET_OK
+
+    def subscribe(self, code_list, subtype_list, is_first_push=True, subscribe_push=True, **kwargs):
+        self._opend.hit("subscribe")
+        keys = {(c, str(t)) for c in code_list for t in subtype_list}
+        if len(self._subs | keys) > self.sub_quota:
+            self._opend.rejected["subscribe"] += 1
+            return RET_ERROR, f"Subscription quota exceeded: {len(self._subs)} of {self.sub_quota} used"
+        self._subs |= keys
+        return RET_OK, None
+
+    def unsubscribe(self, code_list, subtype_list, unsubscribe_all=False):
+        self._opend.hit("unsubscribe")
+        for c in code_list:
+            for t in subtype_list:
+                self._subs.discard((c, str(t)))
+        return RET_OK, None
+
+    def unsubscribe_all(self):
+        self._subs.clear()
+        return RET_OK, None
+
+    def query_subscription(self, is_all_conn=True):
+        self._opend.hit("query_subscription")
+        used = len(self._subs)
+        return RET_OK, {"total_used": used, "own_used": used, "remain": self.sub_quota - used, "sub_list": {}}
+
+    def get_stock_quote(self, code_list):
+        self._opend.hit("get_stock_quote")
+        return RET_OK, pd.DataFrame([_quote_row(c) for c in code_list])
+
+    def get_market_snapshot(self, code_list):
+        err = self._opend.hit("get_market_snapshot")
+        if err:
+            return RET_ERROR, err
+        if len(code_list) > 400:
+            return RET_ERROR, "Too many codes (max 400)"
+        bad = self._opend.bad_codes.intersection(code_list)
+        if bad:
+            return RET_ERROR, f"Unknown stock {sorted(bad)[0]}"
+        return RET_OK, pd.DataFrame([self._snapshot_row(c) for c in code_list])
+
+    def _snapshot_row(self, code: str) -> dict:
+        """Stock rows as get_stock_quote; option rows priced off the smile, bid/ask 1% around the value."""
+        if code not in self._options:
+            return _quote_row(code)
+        underlying, strike, is_call, expiry = self._options[code]
+        spot = _price(underlying)
+        t = ((expiry + timedelta(days=1)) - datetime.now()).total_seconds() / (365 * 86400)
+        value = option_price(spot, strike, t, option_smile(spot, strike), is_call)
+        return {**_quote_row(code), "last_price": value, "bid_price": value * 0.99, "ask_price": value * 1.01,
+                "option_strike_price": strike, "option_open_interest": 1000}
+
+    def history(self, code: str, ktype: str) -> pd.DataFrame:
+        """Full fake history for (code, ktype), generated once."""
+        key = (code, str(ktype))
+        if key not in self._history:
+            minutes = KTYPE_MINUTES.get(str(ktype), 0)
+            self._history[key] = make_klines(code, self.history_bars, minutes=minutes,
+                                             end=datetime.now() if minutes else None)
+        return self._history[key]
+
+    def append_bar(self, code: str, ktype: str, close: float = None):
+        """Closes the newest bar and opens another after it (as a new minute/day would)."""
+        bars = self.history(code, ktype)
+        last = bars.iloc[-1]
+        minutes = KTYPE_MINUTES.get(str(ktype), 0)
+        step = timedelta(minutes=minutes) if minutes else timedelta(days=1)
+        t = datetime.strptime(last["time_key"], "%Y-%m-%d %H:%M:%S") + step
+        close = close if close is not None else last["close"] * (1.001 if len(bars) % 2 else 0.999)
+        row = {"code": code, "time_key": t.strftime("%Y-%m-%d %H:%M:%S"), "open": last["close"], "close": close,
+               "high": max(last["close"], close) * 1.002, "low": min(last["close"], close) * 0.998,
+               "volume": 5_000 + len(bars) % 1000, "turnover": close * 5_000}
+        self._history[(code, str(ktype))] = pd.concat([bars, pd.DataFrame([row])], ignore_index=True)
+        self._history.pop(("times", code, str(ktype)), None)
+
+    def _times(self, code: str, ktype: str):
+        key = ("times", code, str(ktype))
+        if key not in self._history:
+            self._history[key] = self.history(code, ktype)["time_key"].to_numpy(dtype=object)
+        return self._history[key]
+
+    def request_history_kline(self, code, start=None, end=None, ktype="K_DAY", autype="qfq",
+                              fields=None, max_count=1000, page_req_key=None, **kwargs):
+        err = self._opend.hit("request_history_kline")
+        if err:
+            return RET_ERROR, err, None
+        bars = self.history(code, ktype)
+        max_count = max_count or 1000
+        if start is None and end is None and page_req_key is None:
+            return RET_OK, bars.tail(max_count).reset_index(drop=True), None
+        # time_key strings sort chronologically, so the range is two binary searches
+        times = self._times(code, ktype)
+        lo = times.searchsorted(start) if start else 0
+        hi = times.searchsorted(end if len(end) > 10 else end + " 23:59:59", "right") if end else len(times)
+        offset = lo + (page_req_key or 0)
+        page = bars.iloc[offset:min(offset + max_count, hi)]
+        next_key = offset + max_count - lo if offset + max_count < hi else None
+        return RET_OK, page.reset_index(drop=True), next_key
+
+    def get_plate_stock(self, plate_code, sort_field=None, ascend=True):
+        """Every plate has 500 constituents in the plate's market."""
+        self._opend.hit("get_plate_stock")
+        market = plate_code.split(".")[0]
+        return RET_OK, pd.DataFrame({"code": [f"{market}.{i:05d}" for i in range(1, 501)]})
+
+    def get_order_book(self, code, num=10, order_book_type=None):
+        self._opend.hit("get_order_book")
+        p = _price(code)
+        return RET_OK, {
+            "code": code,
+            "svr_recv_time_bid": "", "svr_recv_time_ask": "",
+            "Bid": [(round(p - 0.01 * (i + 1), 3), 100 * (i + 1), i + 1, {}) for i in range(num)],
+            "Ask": [(round(p + 0.01 * (i + 1), 3), 100 * (i + 1), i + 1, {}) for i in range(num)],
+        }
+
+    def get_option_chain(self, code, index_option_type=None, start=None, end=None, **kwargs):
+        self._opend.hit("get_option_chain")
+        p = _price(code)
+        n = self.option_strikes
+        step = min(0.02, 0.8 / n)  # strikes stay positive however wide the chain
+        last = datetime.strptime(end or "2025-03-28", "%Y-%m-%d")
+        rows = []
+        for k in range(self.option_expiries):
+            expiry = last - timedelta(days=7 * k)
+            tag = expiry.strftime("%y%m%d") if self.option_expiries > 1 else ""
+            for i in range(-n, n + 1):
+                strike = round(p * (1 + step * i), 2)
+                for kind in ("CALL", "PUT"):
+                    option = f"{code}{tag}{kind[0]}{i + n:02d}"
+                    self._options[option] = (code, strike, kind == "CALL", expiry)
+                    rows.append({
+                        "code": option, "name": f"{code} {strike} {kind}",
+                        "lot_size": 100, "stock_owner": code, "option_type": kind,
+                        "strike_time": expiry.strftime("%Y-%m-%d"), "strike_price": strike,
+                    })
+        return RET_OK, pd.DataFrame(rows)
+
+    def close(self):
+        pass
+
+
+class FakeTradeContext:
+    def __init__(self, opend: FakeOpenD):
+        self._opend = opend
+        self._orders = {}
+        self._deals = []
+        self._next_id = 1
+        self.handlers = []
+        self._positions = {
+            "HK.00700": {"code": "HK.00700", "stock_name": "TENCENT", "qty": 200, "can_sell_qty": 200,
+                         "cost_price": 300.0, "nominal_price": 320.0, "market_val": 64000.0, "pl_val": 4000.0},
+        }
+        self._cash = 50000.0
+
+    def _push(self, base, row):
+        """Delivers a push row to handlers exposing apply(DataFrame), as OpenD's callback would."""
+        for h in self.handlers:
+            if isinstance(h, base) and hasattr(h, "apply"):
+                h.apply(pd.DataFrame([row]))
+
+    def fill(self, order_id, qty=None):
+        """Simulates an execution: updates order, position and cash, then pushes the order and the deal."""
+        order = self._orders[order_id]
+        qty = qty or order["qty"] - order["dealt_qty"]
+        order["dealt_qty"] += qty
+        order["order_status"] = "FILLED_ALL" if order["dealt_qty"] >= order["qty"] else "FILLED_PART"
+        sign = 1 if "BUY" in order["trd_side"] else -1
+        pos = self._positions.setdefault(order["code"], {
+            "code": order["code"], "stock_name": order["code"], "qty": 0, "can_sell_qty": 0,
+            "cost_price": order["price"], "nominal_price": order["price"], "market_val": 0.0, "pl_val": 0.0,
+        })
+        pos["qty"] += sign * qty
+        pos["can_sell_qty"] += sign * qty
+        pos["market_val"] = pos["qty"] * pos["nominal_price"]
+        self._cash -= sign * qty * order["price"]
+        deal = {"code": order["code"], "deal_id": str(len(self._deals) + 1), "order_id": order_id,
+                "qty": qty, "price": order["price"], "trd_side": order["trd_side"],
+                "create_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        self._deals.append(deal)
+        self._push(TradeOrderHandlerBase, dict(order))
+        self._push(TradeDealHandlerBase, deal)
+
+    def set_handler(self, handler):
+        self.handlers.append(handler)
+        return RET_OK
+
+    def unlock_trade(self, pwd):
+        return RET_OK, None
+
+    def position_list_query(self, code="", trd_env=None, **kwargs):
+        self._opend.hit("position_list_query")
+        return RET_OK, pd.DataFrame([dict(p) for p in self._positions.values()])
+
+    def accinfo_query(self, trd_env=None, **kwargs):
+        self._opend.hit("accinfo_query")
+        market_val = sum(p["market_val"] for p in self._positions.values())
+        return RET_OK, pd.DataFrame([
+            {"power": 2 * self._cash, "cash": self._cash, "total_assets": self._cash + market_val,
+             "market_val": market_val, "net_cash_power": self._cash, "risk_status": "LEVEL3",
+             "margin_call_margin": 0.0},
+        ])
+
+    def order_list_query(self, order_id="", status_filter_list=[], code="", trd_env=None, **kwargs):
+        self._opend.hit("order_list_query")
+        statuses = {str(s).rsplit(".", 1)[-1] for s in status_filter_list}
+        rows = [o for o in self._orders.values()
+                if (not code or o["code"] == code) and (not statuses or o["order_status"] in statuses)]
+        return RET_OK, pd.DataFrame(rows)
+
+    def deal_list_query(self, code="", trd_env=None, **kwargs):
+        self._opend.hit("deal_list_query")
+        return RET_OK, pd.DataFrame([d for d in self._deals if not code or d["code"] == code])
+
+    def acctradinginfo_query(self, order_type=None, code="", price=0.0, trd_env=None, **kwargs):
+        self._opend.hit("acctradinginfo_query")
+        return RET_OK, pd.DataFrame([{"max_cash_buy": 1000, "max_buy_qty": 1000}])
+
+    def place_order(self, price, qty, code, trd_side, trd_env=None, order_type=None, **kwargs):
+        err = self._opend.hit("place_order")
+        if err:
+            return RET_ERROR, err
+        order_id = str(self._next_id)
+        self._next_id += 1
+        self._orders[order_id] = {
+            "order_id": order_id, "code": code, "trd_side": str(trd_side), "order_type": str(order_type),
+            "order_status": "SUBMITTED", "qty": qty, "price": price, "dealt_qty": 0,
+            "create_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._push(TradeOrderHandlerBase, dict(self._orders[order_id]))
+        return RET_OK, pd.DataFrame([self._orders[order_id]])
+
+    def modify_order(self, modify_order_op, order_id, qty, price, trd_env=None, **kwargs):
+        err = self._opend.hit("modify_order")
+        if err:
+            return RET_ERROR, err
+        order = self._orders.get(order_id)
+        if order is None:
+            return RET_ERROR, f"Order {order_id} not found"
+        if order["order_status"] in ("FILLED_ALL", "CANCELLED_ALL"):
+            return RET_ERROR, f"Order {order_id} is {order['order_status']}"
+        if str(modify_order_op).upper().endswith("CANCEL"):
+            order["order_status"] = "CANCELLED_ALL"
+        else:
+            order["qty"], order["price"] = qty, price
+        self._push(TradeOrderHandlerBase, dict(order))
+        return RET_OK, pd.DataFrame([{"trd_env": trd_env, "order_id": order_id}])
+
+    def cancel_all_order(self, trd_env=None, **kwargs):
+        self._opend.hit("cancel_all_order")
+        if str(trd_env).rsplit(".", 1)[-1] != "REAL":
+            return RET_ERROR, "Simulated trading does not support cancel all orders"
+        for order in self._orders.values():
+            if order["order_status"] not in ("SUBMITTED", "FILLED_PART"):
+                continue
+            order["order_status"] = "CANCELLED_ALL"
+            self._push(TradeOrderHandlerBase, dict(order))
+        return RET_OK, None
+
+    def close(self):
+        pass
+
+
+def install(latency: float = 0.02, client: MoomooClient = None) -> FakeOpenD:
+    """Points the shared MoomooClient at a fresh fake OpenD and returns it."""
+    opend = FakeOpenD(latency)
+    client = client or get_client()
+    client._quote_ctx = FakeQuoteContext(opend)
+    client._trade_ctx = FakeTradeContext(opend)
+    client._connected = True
+    return opend
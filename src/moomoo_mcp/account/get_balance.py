@@ -1,9 +1,12 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from ..opend.client import get_client
 
-def get_balance() -> Dict[str, Any]:
+def get_balance(fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get account balance information (cash, market value, max power).
+
+    Args:
+        fields: Optional column names to return, or presets: "price", "fundamentals", "risk".
     """
     client = get_client()
-    return client.get_balance()
+    return client.get_balance(fields=fields)
@@ -1,10 +1,13 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from ..opend.client import get_client
 
-def get_positions() -> List[Dict[str, Any]]:
+def get_positions(fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Get current stock positions in the account.
     Returns list of holdings (symbol, qty, cost, market value).
+
+    Args:
+        fields: Optional column names to return, or presets: "price", "fundamentals", "risk".
     """
     client = get_client()
-    return client.get_positions()
+    return client.get_positions(fields=fields)
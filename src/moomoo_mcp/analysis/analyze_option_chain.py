@@ -0,0 +1,104 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from ..opend.client import get_client
+from ..utils.encoding import encode_frame, validate_format
+from .black_scholes import greeks, implied_vol, mid_price
+
+# Snapshot columns the pricing needs (missing ones are skipped)
+QUOTE_FIELDS = ["code", "last_price", "bid_price", "ask_price", "volume", "option_open_interest"]
+
+SECONDS_PER_YEAR = 365.0 * 86400.0
+
+def _column(quotes: Dict[str, Dict[str, Any]], codes: pd.Series, name: str) -> np.ndarray:
+    return np.array([quotes.get(c, {}).get(name, np.nan) for c in codes], dtype=np.float64)
+
+def analyze_option_chain(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    rate: float = 0.04,
+    dividend_yield: float = 0.0,
+    option_type: Optional[str] = None,
+    format: str = "records",
+    precision: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Implied volatility and greeks for a whole option chain in one call.
+    The chain is cached per expiry range; quotes for all contracts come from one chunked
+    snapshot, and IV/greeks are solved for every contract in a single array pass.
+    Uses European Black-Scholes-Merton, an approximation for American-style contracts.
+
+    Args:
+        symbol: Underlying stock symbol (e.g., "HK.00700", "US.AAPL").
+        start_date: Start expiry date (YYYY-MM-DD).
+        end_date: End expiry date (YYYY-MM-DD).
+        rate: Annual risk-free rate (continuous, e.g. 0.04).
+        dividend_yield: Annual dividend yield of the underlying (continuous).
+        option_type: "CALL" or "PUT" to analyse one side only (default both).
+        format: "records" (list of row objects, default) or "columns" (column name -> array).
+        precision: Float decimals in "columns" format (default: server setting).
+
+    Returns contracts with mid price, iv, delta, gamma, vega (per vol point) and theta
+    (per calendar day); iv and greeks are null where the mid is missing or outside
+    no-arbitrage bounds.
+    """
+    validate_format(format)
+    if option_type and option_type.upper() not in ("CALL", "PUT"):
+        raise ValueError(f"Invalid option_type: {option_type}. Allowed: ['CALL', 'PUT']")
+    t0 = time.perf_counter()
+    client = get_client()
+    data = client.get_option_chain_quotes(symbol, start_date, end_date, option_type, QUOTE_FIELDS)
+    chain, quotes = data["chain"], data["quotes"]
+    spot = (data["underlying"] or {}).get("last_price")
+    if not spot or not spot > 0:
+        return {"error": "No price for the underlying", "symbol": symbol}
+    if chain.empty:
+        return {"error": "No option contracts found", "symbol": symbol}
+    t1 = time.perf_counter()
+
+    codes = chain["code"]
+    bid = _column(quotes, codes, "bid_price")
+    ask = _column(quotes, codes, "ask_price")
+    price = mid_price(bid, ask, _column(quotes, codes, "last_price"))
+    strike = chain["strike_price"].to_numpy(dtype=np.float64)
+    is_call = (chain["option_type"].astype(str).str.upper() == "CALL").to_numpy()
+    # Contracts are valued to the end of the expiry day
+    expiry = pd.to_datetime(chain["strike_time"]) + pd.Timedelta(days=1)
+    t = (expiry - pd.Timestamp(datetime.now())).dt.total_seconds().to_numpy() / SECONDS_PER_YEAR
+
+    iv = implied_vol(price, spot, strike, t, rate, dividend_yield, is_call)
+    g = greeks(spot, strike, t, rate, dividend_yield, iv, is_call)
+    t2 = time.perf_counter()
+
+    out = pd.DataFrame({
+        "code": codes,
+        "option_type": chain["option_type"],
+        "strike_time": chain["strike_time"],
+        "strike_price": strike,
+        "days": np.round(t * 365.0, 2),
+        "bid": bid,
+        "ask": ask,
+        "mid": price,
+        "iv": iv,
+        **{name: g[name] for name in ("delta", "gamma", "vega", "theta")},
+    })
+    if format == "records":
+        # Records carry no rounding of their own; NaN would not survive JSON either
+        out = out.round(6).astype(object).where(out.notna(), None)
+
+    return {
+        "symbol": data["underlying"].get("code", symbol),
+        "underlying_price": spot,
+        "contracts": encode_frame(out, format, precision),
+        "count": len(out),
+        "unpriced": int(np.isnan(iv).sum()),
+        "failures": [f.to_dict() for f in data["failures"]],
+        "snapshot_chunks": data["chunks"],
+        "timing": {
+            "fetch_s": round(t1 - t0, 4),
+            "compute_s": round(t2 - t1, 4),
+        },
+    }
@@ -0,0 +1,103 @@
+import time
+from typing import List, Dict, Any, Optional
+import numpy as np
+from ..opend.client import get_client
+from ..utils.symbols import normalize_symbol
+from .backtester import equity_curve, expand, sweep
+from .downsample import downsample_indices
+from .get_technical_indicators import PERIOD_KTYPES
+from .resample import KTYPE_MINUTES, session_minutes
+from .screener import pool
+
+SORT_KEYS = ("sharpe", "total_return", "cagr", "max_drawdown")
+
+def backtest(
+    symbol: str,
+    entry: List[str],
+    exit: List[str] = [],
+    params: Dict[str, List[float]] = {},
+    period: str = "1d",
+    limit: int = 2520,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    fee_bps: float = 5.0,
+    slippage_bps: float = 5.0,
+    sort_by: str = "sharpe",
+    top: int = 10,
+    equity_points: int = 200,
+) -> Dict[str, Any]:
+    """
+    Backtests a long/flat strategy built from indicator rules, optionally sweeping parameters.
+    Bars come from the kline store when enabled (otherwise paged from OpenD); large sweeps run
+    across a process pool.
+
+    Args:
+        symbol: Stock symbol (e.g., "HK.00700", "US.AAPL").
+        entry: Rules that must all hold to go long, e.g. ["SMA_{fast} crosses_above SMA_{slow}"] or
+               ["RSI_14 < 30"]. Operands as in scan_indicators (SMA_x, EMA_x, WMA_x, RSI_x, MACD_LINE,
+               MACD_SIGNAL, MACD_HIST, BOLL_UPPER/MID/LOWER, ATR, VOL_SMA_x, close, high, low, volume,
+               numbers); operators <, <=, >, >=, ==, !=, crosses_above, crosses_below.
+        exit: Rules that must all hold to go flat. Empty: flat as soon as the entry rules stop holding.
+        params: Values substituted into "{name}" placeholders; every combination is tested
+                (e.g. {"fast": [5, 10, 20], "slow": [50, 100, 200]}, max 10000 combinations).
+        period: Timeframe: "1m", "5m", "15m", "30m", "60m", "1d", "1w".
+        limit: Newest bars tested (default 2520, about 10 years of daily bars), within start/end if given.
+        start: Start date "YYYY-MM-DD" (optional).
+        end: End date "YYYY-MM-DD" (optional).
+        fee_bps: Commission per trade, in basis points of traded value.
+        slippage_bps: Slippage per trade, in basis points of traded value.
+        sort_by: Ranking of a sweep: "sharpe", "total_return", "cagr" or "max_drawdown".
+        top: Number of ranked parameter sets returned.
+        equity_points: Points in the returned equity curve of the best set (LTTB-downsampled; 0 = all bars).
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Invalid sort_by: {sort_by}. Allowed: {list(SORT_KEYS)}")
+    t0 = time.perf_counter()
+    client = get_client()
+    symbol = normalize_symbol(symbol)
+    ktype = PERIOD_KTYPES.get(period.lower(), "K_DAY")
+    combos = expand(entry, exit, params)
+
+    columns = client.get_kline(symbol, ktype=ktype, limit=limit, start=start, end=end,
+                               format="columns", precision=-1)
+    if not columns or not columns.get("close"):
+        return {"error": "No K-Line data found", "symbol": symbol}
+    col = lambda name: np.asarray(columns.get(name) or [np.nan] * len(columns["close"]), dtype=np.float64)
+    arrays = (col("close"), col("high"), col("low"), col("volume"))
+    t1 = time.perf_counter()
+
+    if ktype in KTYPE_MINUTES:
+        bars_per_year = 252 * session_minutes(symbol) / KTYPE_MINUTES[ktype]
+    else:
+        bars_per_year = {"K_WEEK": 52}.get(ktype, 252)
+    cost = (fee_bps + slippage_bps) / 1e4
+    stats = sweep(arrays, combos, cost, bars_per_year, pool)
+    t2 = time.perf_counter()
+
+    # Higher is better for every key (drawdowns are negative: the shallowest ranks first)
+    ranked = sorted(range(len(combos)), key=lambda i: stats[i][sort_by], reverse=True)
+    best = ranked[0]
+    equity = equity_curve(*arrays, combos[best], cost)
+    idx = downsample_indices(equity, equity_points, "lttb")
+    close = arrays[0]
+
+    return {
+        "symbol": symbol,
+        "period": period,
+        "bars": len(close),
+        "from": columns["time_key"][0],
+        "to": columns["time_key"][-1],
+        "combinations": len(combos),
+        "buy_and_hold_return": round(float(close[-1] / close[0] - 1.0), 4),
+        "results": [{"params": combos[i].params, **stats[i]} for i in ranked[:top]],
+        "equity_curve": {
+            "params": combos[best].params,
+            "time_key": [columns["time_key"][i] for i in idx],
+            "equity": np.round(equity[idx], 4).tolist(),
+        },
+        "timing": {
+            "fetch_s": round(t1 - t0, 4),
+            "backtest_s": round(t2 - t1, 4),
+            "workers": pool.workers,
+        },
+    }
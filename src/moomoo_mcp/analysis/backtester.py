@@ -0,0 +1,187 @@
+import itertools
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .indicators import IndicatorEngine
+from .screener import BAR_FIELDS, COMPOSITE_KEYS, OPERATORS, Filter
+
+# Largest parameter grid a single backtest call may expand to
+MAX_COMBOS = 10000
+
+# Below this many combinations the pool's pickling overhead outweighs the parallelism
+MIN_PARALLEL = 64
+
+_CROSS_RE = re.compile(r"\s+(crosses_above|crosses_below)\s+", re.IGNORECASE)
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One signal condition over whole series: a filter comparison ("RSI_14 < 30")
+    or a crossover ("SMA_20 crosses_above SMA_50", true only on the bar it happens).
+    """
+    filter: Filter
+    cross: bool = False
+
+    @classmethod
+    def parse(cls, expr: str) -> "Rule":
+        m = _CROSS_RE.search(expr)
+        if m is None:
+            return cls(Filter.parse(expr))
+        op = ">" if m.group(1).lower() == "crosses_above" else "<"
+        return cls(Filter.parse(expr[:m.start()] + f" {op} " + expr[m.end():]), cross=True)
+
+    def evaluate(self, engine: IndicatorEngine, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        a = _series(self.filter.lhs, engine, bars)
+        b = _series(self.filter.rhs, engine, bars)
+        with np.errstate(invalid="ignore"):
+            hit = OPERATORS[self.filter.op](a, b) & ~np.isnan(a) & ~np.isnan(b)
+        hit = np.broadcast_to(hit, bars["close"].shape)
+        if self.cross:
+            return hit & ~np.concatenate(([True], hit[:-1]))
+        return hit
+
+def _series(operand: Any, engine: IndicatorEngine, bars: Dict[str, np.ndarray]) -> np.ndarray:
+    if isinstance(operand, float):
+        return np.float64(operand)
+    if operand in BAR_FIELDS:
+        return bars[BAR_FIELDS[operand]]
+    key = operand.split(".")[-1]
+    if key in COMPOSITE_KEYS:
+        return engine.series(COMPOSITE_KEYS[key])[key]
+    series = engine.series(operand)
+    if series is None:
+        raise ValueError(f"Unknown indicator: {operand}")
+    if isinstance(series, dict):
+        raise ValueError(f"{operand} has several outputs; use one of {sorted(series)}")
+    return series
+
+@dataclass(frozen=True)
+class Combo:
+    """One parameter set with its rules (placeholders already filled in)."""
+    params: Dict[str, Any]
+    entry: Tuple[Rule, ...]
+    exit: Tuple[Rule, ...]
+
+def expand(entry: Sequence[str], exit: Sequence[str], params: Dict[str, Sequence[Any]]) -> List[Combo]:
+    """
+    Cartesian product of `params` substituted into the rule templates, e.g.
+    "SMA_{fast} crosses_above SMA_{slow}" with {"fast": [5, 10], "slow": [50, 100]}.
+    Raises ValueError for a malformed rule or a grid above MAX_COMBOS.
+    """
+    names = list(params or {})
+    grid = [list(params[n]) for n in names]
+    total = math.prod(len(values) for values in grid)
+    if total > MAX_COMBOS:
+        raise ValueError(f"Parameter grid has {total} combinations (max {MAX_COMBOS})")
+    combos = []
+    for values in itertools.product(*grid):
+        # JSON numbers may arrive as 20.0; windows must read "SMA_20"
+        combo = {n: int(v) if isinstance(v, float) and v.is_integer() else v for n, v in zip(names, values)}
+        try:
+            fill = lambda exprs: tuple(Rule.parse(e.format(**combo)) for e in exprs)
+            combos.append(Combo(combo, fill(entry), fill(exit or [])))
+        except KeyError as e:
+            raise ValueError(f"Rule placeholder {e} has no values in params")
+    return combos
+
+def positions(engine: IndicatorEngine, bars: Dict[str, np.ndarray], combo: Combo) -> np.ndarray:
+    """
+    Long (1) / flat (0) per bar. Entry when every entry rule holds; exit when
+    every exit rule holds (exit wins a tie), or without exit rules as soon as
+    the entry condition stops holding.
+    """
+    n = len(bars["close"])
+    enter = np.ones(n, dtype=bool)
+    for rule in combo.entry:
+        enter &= rule.evaluate(engine, bars)
+    if not combo.exit:
+        return enter.astype(np.float64)
+    leave = np.ones(n, dtype=bool)
+    for rule in combo.exit:
+        leave &= rule.evaluate(engine, bars)
+    state = np.where(leave, 0.0, np.where(enter, 1.0, np.nan))
+    # Forward-fill the last decision: index of the latest non-NaN bar at each position
+    last = np.maximum.accumulate(np.where(np.isnan(state), -1, np.arange(n)))
+    return np.where(last >= 0, state[np.maximum(last, 0)], 0.0)
+
+def simulate(close: np.ndarray, pos: np.ndarray, cost: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Equity curves for a (combos x bars) position matrix.
+
+    A position decided on bar t's close is filled at that close and earns from
+    bar t+1, so there is no lookahead. Fees and slippage (`cost`, a fraction of
+    traded value) are charged on every change of position.
+    """
+    ret = np.zeros_like(close)
+    ret[1:] = close[1:] / close[:-1] - 1.0
+    held = np.zeros_like(pos)
+    held[:, 1:] = pos[:, :-1]
+    turnover = np.abs(np.diff(pos, axis=1, prepend=0.0))
+    # Costs are paid on the value traded at the close, after that bar's return
+    strat = (1.0 + held * ret) * (1.0 - turnover * cost) - 1.0
+    return np.cumprod(1.0 + strat, axis=1), strat
+
+def statistics(close: np.ndarray, pos: np.ndarray, equity: np.ndarray, strat: np.ndarray,
+               bars_per_year: float) -> List[Dict[str, Any]]:
+    """Per-combo return, CAGR, Sharpe, max drawdown, trades, win rate and exposure."""
+    n = close.shape[0]
+    years = max(n / bars_per_year, 1e-9)
+    total = equity[:, -1] - 1.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cagr = np.where(equity[:, -1] > 0, equity[:, -1] ** (1.0 / years) - 1.0, -1.0)
+        std = strat.std(axis=1)
+        sharpe = np.where(std > 0, strat.mean(axis=1) / std * math.sqrt(bars_per_year), 0.0)
+    drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1.0).min(axis=1)
+    change = np.diff(pos, axis=1, prepend=0.0)
+    exposure = pos.mean(axis=1)
+
+    out = []
+    for i in range(pos.shape[0]):
+        entries = np.flatnonzero(change[i] > 0)
+        exits = np.flatnonzero(change[i] < 0)
+        exits = np.concatenate((exits, [n - 1]))[:len(entries)]  # an open trade is marked at the last bar
+        before = np.where(entries > 0, equity[i, np.maximum(entries - 1, 0)], 1.0)
+        trade_returns = equity[i, exits] / before - 1.0
+        out.append({
+            "total_return": round(float(total[i]), 4),
+            "cagr": round(float(cagr[i]), 4),
+            "sharpe": round(float(sharpe[i]), 3),
+            "max_drawdown": round(float(drawdown[i]), 4),
+            "trades": int(len(entries)),
+            "win_rate": round(float((trade_returns > 0).mean()), 3) if len(entries) else None,
+            "exposure": round(float(exposure[i]), 3),
+        })
+    return out
+
+def run_combos(close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray, combos: List[Combo],
+               cost: float, bars_per_year: float) -> List[Dict[str, Any]]:
+    """
+    Backtests combos over one bar series; runs in pool workers, so it only
+    touches its (picklable) arguments. One engine per call, so combos sharing
+    an indicator window compute it once.
+    """
+    engine = IndicatorEngine(close, high, low, volume)
+    bars = {"close": close, "high": high, "low": low, "volume": volume}
+    pos = np.vstack([positions(engine, bars, c) for c in combos])
+    equity, strat = simulate(close, pos, cost)
+    return statistics(close, pos, equity, strat, bars_per_year)
+
+def equity_curve(close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray, combo: Combo,
+                 cost: float) -> np.ndarray:
+    engine = IndicatorEngine(close, high, low, volume)
+    bars = {"close": close, "high": high, "low": low, "volume": volume}
+    equity, _ = simulate(close, positions(engine, bars, combo)[None, :], cost)
+    return equity[0]
+
+def sweep(arrays: Tuple[np.ndarray, ...], combos: List[Combo], cost: float, bars_per_year: float,
+          pool: Any, parallel: Optional[bool] = None) -> List[Dict[str, Any]]:
+    """Stats per combo, in combo order; spread over the pool for large grids unless `parallel` says otherwise."""
+    if parallel is None:
+        parallel = pool.workers > 1 and len(combos) >= MIN_PARALLEL
+    if not parallel:
+        return run_combos(*arrays, combos, cost, bars_per_year)
+    size = max(1, math.ceil(len(combos) / (pool.workers * 4)))
+    batches = [(*arrays, combos[i:i + size], cost, bars_per_year) for i in range(0, len(combos), size)]
+    return [row for rows in pool.map(run_combos, batches) for row in rows]
@@ -0,0 +1,131 @@
+from typing import Dict, Optional
+import numpy as np
+
+# Vol bracket of the implied volatility solver (annualized)
+IV_MIN, IV_MAX = 1e-4, 5.0
+IV_TOL = 1e-10  # price tolerance, as a fraction of the (out-of-the-money) price
+IV_STEP_TOL = 1e-9  # or stop once a Newton step moves vol less than this
+IV_MAX_ITER = 100
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF to double precision (Hart 1968, as given by West 2005); no scipy needed."""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+    n = ((((((3.52624965998911e-02 * z + 0.700383064443688) * z + 6.37396220353165) * z + 33.912866078383) * z
+           + 112.079291497871) * z + 221.213596169931) * z + 220.206867912376)
+    d = (((((((8.83883476483184e-02 * z + 1.75566716318264) * z + 16.064177579207) * z + 86.7807322029461) * z
+            + 296.564248779674) * z + 637.333633378831) * z + 793.826512519948) * z + 440.413735824752)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail = z + 1.0 / (z + 2.0 / (z + 3.0 / (z + 4.0 / (z + 0.65))))
+        c = np.where(z < 7.07106781186547, e * n / d, np.where(z < 37.0, e / (tail * 2.506628274631), 0.0))
+    return np.where(x > 0, 1.0 - c, c)
+
+def _d1_d2(spot, strike, t, rate, div, vol):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(spot / strike) + (rate - div + 0.5 * vol * vol) * t) / (vol * sqrt_t)
+    return d1, d1 - vol * sqrt_t, sqrt_t
+
+def bs_price(spot, strike, t, rate, div, vol, is_call) -> np.ndarray:
+    """European Black-Scholes(-Merton) prices; every argument broadcasts."""
+    d1, d2, _ = _d1_d2(spot, strike, t, rate, div, vol)
+    df_q, df_r = np.exp(-div * t), np.exp(-rate * t)
+    call = spot * df_q * norm_cdf(d1) - strike * df_r * norm_cdf(d2)
+    put = strike * df_r * norm_cdf(-d2) - spot * df_q * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+def _vega(spot, strike, t, rate, div, vol) -> np.ndarray:
+    d1, _, sqrt_t = _d1_d2(spot, strike, t, rate, div, vol)
+    return spot * np.exp(-div * t) * norm_pdf(d1) * sqrt_t
+
+def implied_vol(price, spot, strike, t, rate, div, is_call) -> np.ndarray:
+    """
+    Implied volatility of a whole chain at once: safeguarded Newton steps
+    inside a shrinking [lo, hi] bracket, falling back to bisection where a
+    step leaves the bracket or vega is too small. In-the-money contracts are
+    solved as their out-of-the-money counterpart via put-call parity, whose
+    price is all time value. Every contract iterates in the same array pass;
+    converged ones are frozen. NaN where the price is outside the
+    no-arbitrage bounds or inputs are missing.
+    """
+    price, spot, strike, t, is_call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (price, spot, strike, t)), np.asarray(is_call, dtype=bool))
+    shape = price.shape
+    price, spot, strike, t, is_call = (a.ravel() for a in (price, spot, strike, t, is_call))
+    df_q, df_r = np.exp(-div * t), np.exp(-rate * t)
+    lower = np.where(is_call, np.maximum(spot * df_q - strike * df_r, 0.0), np.maximum(strike * df_r - spot * df_q, 0.0))
+    upper = np.where(is_call, spot * df_q, strike * df_r)
+    valid = (t > 0) & (price > lower) & (price < upper) & np.isfinite(price) & (spot > 0) & (strike > 0)
+    # C - P = S e^-qt - K e^-rt: swap ITM contracts for the OTM side
+    forward_gap = spot * df_q - strike * df_r
+    itm = np.where(is_call, forward_gap > 0, forward_gap < 0)
+    price = np.where(itm, price - np.where(is_call, forward_gap, -forward_gap), price)
+    is_call = is_call ^ itm
+
+    # Manaster-Koehler start: the vol that makes d1 + d2 = 0 at the money-forward point
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = np.sqrt(np.abs(np.log(spot / strike) + (rate - div) * t) * 2.0 / t)
+    vol = np.clip(np.where(np.isfinite(vol), vol, 0.3), 0.05, 1.0)
+    lo = np.full(price.shape, IV_MIN)
+    hi = np.full(price.shape, IV_MAX)
+    active = valid.copy()
+    tol = IV_TOL * price
+
+    for _ in range(IV_MAX_ITER):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        s, k, tt, c, v = spot[idx], strike[idx], t[idx], is_call[idx], vol[idx]
+        diff = bs_price(s, k, tt, rate, div, v, c) - price[idx]
+        done = np.abs(diff) < tol[idx]
+        lo[idx] = np.where(diff < 0, v, lo[idx])
+        hi[idx] = np.where(diff > 0, v, hi[idx])
+        vega = _vega(s, k, tt, rate, div, v)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = v - diff / vega
+        bisect = 0.5 * (lo[idx] + hi[idx])
+        newton_ok = (vega > 1e-12) & (step > lo[idx]) & (step < hi[idx])
+        vol[idx] = np.where(done, v, np.where(newton_ok, step, bisect))
+        done |= newton_ok & (np.abs(step - v) < IV_STEP_TOL)
+        active[idx] = ~done & (hi[idx] - lo[idx] > 1e-12)
+
+    return np.where(valid, vol, np.nan).reshape(shape)
+
+def greeks(spot, strike, t, rate, div, vol, is_call) -> Dict[str, np.ndarray]:
+    """
+    Delta, gamma, vega (per 1 vol point) and theta (per calendar day) for a
+    whole chain; NaN where vol is NaN.
+    """
+    d1, d2, sqrt_t = _d1_d2(spot, strike, t, rate, div, vol)
+    df_q, df_r = np.exp(-div * t), np.exp(-rate * t)
+    pdf = norm_pdf(d1)
+    cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = df_q * pdf / (spot * vol * sqrt_t)
+        decay = -spot * df_q * pdf * vol / (2.0 * sqrt_t)
+    call_theta = decay - rate * strike * df_r * cdf_d2 + div * spot * df_q * cdf_d1
+    put_theta = decay + rate * strike * df_r * (1.0 - cdf_d2) - div * spot * df_q * (1.0 - cdf_d1)
+    out = {
+        "delta": np.where(is_call, df_q * cdf_d1, df_q * (cdf_d1 - 1.0)),
+        "gamma": gamma,
+        "vega": spot * df_q * pdf * sqrt_t / 100.0,
+        "theta": np.where(is_call, call_theta, put_theta) / 365.0,
+    }
+    # norm_cdf maps NaN to a finite value, so mask explicitly
+    unpriced = np.isnan(d1)
+    return {name: np.where(unpriced, np.nan, value) for name, value in out.items()}
+
+def mid_price(bid: np.ndarray, ask: np.ndarray, last: Optional[np.ndarray] = None) -> np.ndarray:
+    """Bid/ask midpoint where both sides quote, else the last price (NaN if neither)."""
+    bid, ask = np.asarray(bid, dtype=np.float64), np.asarray(ask, dtype=np.float64)
+    mid = np.where((bid > 0) & (ask > 0) & (ask >= bid), 0.5 * (bid + ask), np.nan)
+    if last is not None:
+        last = np.asarray(last, dtype=np.float64)
+        mid = np.where(np.isnan(mid) & (last > 0), last, mid)
+    return mid
@@ -0,0 +1,56 @@
+import math
+import numpy as np
+
+METHODS = ("lttb", "every_k")
+
+def validate_method(method: str) -> str:
+    if method not in METHODS:
+        raise ValueError(f"Invalid downsample method: {method}. Allowed: {list(METHODS)}")
+    return method
+
+def downsample_indices(y: np.ndarray, target: int, method: str = "lttb") -> np.ndarray:
+    """
+    Indices of at most `target` points of `y` (first and last always kept);
+    all indices when target is 0 or not below len(y).
+    """
+    n = len(y)
+    if target <= 0 or target >= n:
+        return np.arange(n)
+    if method == "every_k" or target < 3:
+        return every_k_indices(n, target)
+    return lttb_indices(y, target)
+
+def every_k_indices(n: int, target: int) -> np.ndarray:
+    """Every k-th point with k = ceil(n / target), ending on the last point."""
+    idx = np.arange(0, n, math.ceil(n / max(target, 1)))
+    if idx[-1] != n - 1:
+        if len(idx) < target:
+            idx = np.append(idx, n - 1)
+        else:
+            idx[-1] = n - 1
+    return idx
+
+def lttb_indices(y: np.ndarray, target: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: one point per bucket, the one forming the
+    largest triangle with the previous pick and the next bucket's mean, which
+    keeps peaks and troughs that every-k sampling would skip.
+    """
+    n = len(y)
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64)
+    # target - 2 buckets over the interior points [1, n - 1)
+    edges = np.floor(np.linspace(1, n - 1, target - 1)).astype(np.intp)
+    out = np.empty(target, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = np.nanmean(y[nlo:nhi]) if np.isfinite(y[nlo:nhi]).any() else y[a]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        out[i + 1] = a
+    return out
@@ -0,0 +1,109 @@
+import math
+from typing import List, Dict, Any
+from ..opend.client import KLINE_PAGE_SIZE, get_client
+from .get_technical_indicators import PERIOD_KTYPES, fetch_bars
+from .indicators import TechnicalAnalysis, compile_plan
+from .resample import KTYPE_MINUTES, resample_bars
+from ..utils.symbols import normalize_symbol
+
+# Cap on base bars fetched for one call (paged 1000 at a time, or read from the kline store)
+MAX_BASE_BARS = 20000
+
+def _pages(bars: int) -> int:
+    return max(1, math.ceil(bars / KLINE_PAGE_SIZE))
+
+def get_multi_timeframe_indicators(
+    symbol: str,
+    indicators: List[str] = ["RSI_14", "SMA_20", "EMA_50", "MACD"],
+    timeframes: List[str] = ["5m", "15m", "60m", "1d"],
+    base: str = "1m",
+    limit: int = 200,
+) -> Dict[str, Any]:
+    """
+    Calculates the same technical indicators on several timeframes in one call.
+    Intraday timeframes are built locally from one `base` fetch without crossing
+    market sessions, instead of one history request per timeframe. A timeframe is
+    fetched natively instead when resampling it would cost more requests than that
+    (e.g. 60m from 1m bars), as are daily bars and anything past 20000 base bars.
+
+    Args:
+        symbol: Stock symbol (e.g., "HK.00700", "US.AAPL").
+        indicators: Same names as get_technical_indicators (e.g. ["RSI_14", "SMA_20", "MACD"]).
+        timeframes: Any of "1m", "5m", "15m", "30m", "60m", "1d", each a multiple of `base`.
+        base: Finest timeframe fetched from OpenD (default "1m").
+        limit: Bars per timeframe. A timeframe with fewer bars available is marked
+               "truncated" and listed in "warnings".
+    """
+    client = get_client()
+    symbol = normalize_symbol(symbol)
+    base_ktype = PERIOD_KTYPES.get(base.lower())
+    if base_ktype not in KTYPE_MINUTES:
+        raise ValueError(f"Invalid base: {base}. Must be an intraday timeframe ('1m' ... '60m')")
+    base_minutes = KTYPE_MINUTES[base_ktype]
+
+    targets: Dict[str, str] = {}
+    for tf in dict.fromkeys(timeframes):
+        ktype = PERIOD_KTYPES.get(tf.lower())
+        if ktype != "K_DAY" and (ktype not in KTYPE_MINUTES or KTYPE_MINUTES[ktype] % base_minutes):
+            raise ValueError(f"Invalid timeframe: {tf}. Must be a multiple of base '{base}' up to '1d'")
+        targets[tf] = ktype
+
+    # Base bars each timeframe needs for `limit` bars, plus one bucket that may start mid-window.
+    # Daily bars, and timeframes the capped base window cannot cover, are fetched natively.
+    needs: Dict[str, int] = {}
+    native: List[str] = []
+    for tf, ktype in targets.items():
+        need = limit if ktype == base_ktype else (limit + 1) * KTYPE_MINUTES.get(ktype, 0) // base_minutes
+        if ktype == "K_DAY" or need > MAX_BASE_BARS:
+            native.append(tf)
+        else:
+            needs[tf] = need
+    # Resample the k cheapest timeframes from one base fetch and fetch the rest natively,
+    # with k chosen for the fewest history requests (ties go to native: fewer bars moved)
+    ranked = sorted(needs, key=needs.get)
+    native_pages = _pages(limit)
+    cost = [(_pages(needs[ranked[k - 1]]) if k else 0) + (len(ranked) - k) * native_pages
+            for k in range(len(ranked) + 1)]
+    k = cost.index(min(cost))
+    local = {tf: needs[tf] for tf in ranked[:k]}
+    native += ranked[k:]
+    count = max(local.values(), default=0)
+    df = fetch_bars(client, symbol, base_ktype, count) if local else None
+    if local and df.empty:
+        return {"error": "No K-Line data found", "symbol": symbol}
+
+    plan = compile_plan(indicators)
+    results: Dict[str, Any] = {}
+    warnings: List[str] = []
+    for tf, ktype in targets.items():
+        if tf in native:
+            bars = fetch_bars(client, symbol, ktype, limit)
+            if bars.empty:
+                warnings.append(f"{tf}: no bars")
+                continue
+        elif ktype == base_ktype:
+            bars = df
+        else:
+            bars = resample_bars(df, ktype, symbol)
+            if len(df) == count and len(bars) > 1:
+                bars = bars.iloc[1:]  # the oldest bucket is likely cut off by the fetch window
+        bars = bars.tail(limit).reset_index(drop=True)
+        last = bars.iloc[-1]
+        results[tf] = {
+            "bars": len(bars),
+            "source": "fetched" if tf in native else "resampled",
+            "last_price": float(last["close"]),
+            "timestamp": last["time_key"],
+            "indicators": TechnicalAnalysis.compute(bars, plan),
+        }
+        if len(bars) < limit:
+            results[tf]["truncated"] = True
+            warnings.append(f"{tf}: {len(bars)} bars available, fewer than limit={limit}")
+
+    return {
+        "symbol": symbol,
+        "base": base,
+        "base_bars": 0 if df is None else len(df),
+        "timeframes": results,
+        "warnings": warnings,
+    }
@@ -1,19 +1,41 @@
+import math
+import time
 from typing import List, Dict, Any, Optional
 import pandas as pd
 from ..opend.client import get_client
-from .indicators import TechnicalAnalysis
+from .indicators import IndicatorPlan, TechnicalAnalysis, compile_plan
+from .result_cache import bar_key, results
+from .downsample import validate_method
+from .streaming import streams
+from ..storage.kline_store import KTYPE_SECONDS
 from ..utils.symbols import normalize_symbol
 
+# Friendly period strings -> client ktype constants
+PERIOD_KTYPES = {
+    "1d": "K_DAY",
+    "1w": "K_WEEK",
+    "1m": "K_1M",
+    "5m": "K_5M",
+    "15m": "K_15M",
+    "30m": "K_30M",
+    "60m": "K_60M",
+    "1h": "K_60M"
+}
+
 def get_technical_indicators(
     symbol: str, 
     indicators: List[str] = ["RSI_14", "SMA_20", "EMA_50", "MACD"], 
     period: str = "1d", 
-    limit: int = 200
+    limit: int = 200,
+    incremental: bool = False,
+    series: bool = False,
+    series_bars: int = 0,
+    max_points: int = 0,
+    downsample: str = "lttb",
 ) -> Dict[str, Any]:
     """
     Calculates technical indicators for a stock.
     
-    Args:
     Args:
         symbol: Stock symbol (e.g., "HK.00700", "US.AAPL").
         indicators: List of technical indicators to calculate. 
@@ -23,44 +45,101 @@ def get_technical_indicators(
                     - Volume: "VOL_SMA_20".
         period: Timeframe of the chart. Options: "1m", "5m", "15m", "30m", "60m" (Hourly), "1d" (Daily), "1w" (Weekly).
         limit: Number of bars to fetch (default 200). Increase this if calculating long-period MAs (e.g. use 300 for SMA_200).
+        incremental: Keep indicator state between calls and only feed it the bars since the last call
+                     (default False: recompute from `limit` bars). Values can differ slightly from a recompute,
+                     since streamed EMA/Wilder state reaches further back than `limit` bars.
+        series: Also return each indicator as an array aligned with "time_key"/"close" (default False),
+                instead of calling get_kline and recomputing for trend context.
+        series_bars: Bars covered by the series (0 = all `limit` bars; the rest only warm up the windows).
+        max_points: Downsample the series server-side to at most this many points (0 = no downsampling).
+        downsample: "lttb" (keeps the close's peaks and troughs) or "every_k".
     """
     client = get_client()
     symbol = normalize_symbol(symbol)
     
     # 1. Fetch Historical Data (K-Line)
-    # Map '1d' string to K_DAY etc if needed, but get_kline wrapper handles basic strings?
-    # Let's check client.get_kline signature. It expects "K_DAY", "K_1M" usually.
-    # We should map friendly strings to client constants here for ease of use.
-    
-    ktype_map = {
-        "1d": "K_DAY",
-        "1w": "K_WEEK",
-        "1m": "K_1M",
-        "5m": "K_5M",
-        "15m": "K_15M",
-        "30m": "K_30M",
-        "60m": "K_60M",
-        "1h": "K_60M"
-    }
-    ktype = ktype_map.get(period.lower(), "K_DAY")
-    
-    # Fetch data as list of dicts
-    klines = client.get_kline(symbol, ktype=ktype, limit=limit)
-    
-    if not klines:
+    ktype = PERIOD_KTYPES.get(period.lower(), "K_DAY")
+    plan = compile_plan(indicators)
+
+    if series:
+        return _with_series(client, symbol, ktype, period, plan, limit, series_bars, max_points,
+                            validate_method(downsample))
+
+    if incremental:
+        df, stream = _incremental(client, symbol, ktype, plan, limit)
+    else:
+        df, stream = fetch_bars(client, symbol, ktype, limit), None
+
+    if df.empty:
         return {"error": "No K-Line data found", "symbol": symbol}
-        
-    # 2. Key Data to DataFrame
-    df = pd.DataFrame(klines)
-    
-    # 3. Compute
-    tech_data = TechnicalAnalysis.compute(df, indicators)
-    
-    # 4. Result
+    last = df.iloc[-1].to_dict()
+
+    # 2. Compute, unless this exact request was answered on the same newest bar
+    # Streamed and recomputed values can differ, so each mode caches its own results
+    key = (symbol, ktype, limit, bar_key(last), plan.key, "incremental" if incremental else "batch")
+    tech_data = results.get(key)
+    if stream is not None and (tech_data is None or not stream.seeded):
+        tech_data = stream.advance(df)
+        results.put(key, tech_data)
+    elif tech_data is None:
+        tech_data = TechnicalAnalysis.compute(df, plan)
+        if "error" not in tech_data:
+            results.put(key, tech_data)
+
+    # 3. Result
     return {
         "symbol": symbol,
         "period": period,
-        "last_price": klines[-1].get('close'),
-        "timestamp": klines[-1].get('time_key'),
+        "last_price": last.get("close"),
+        "timestamp": last.get("time_key"),
         "indicators": tech_data
     }
+
+def _with_series(client, symbol: str, ktype: str, period: str, plan: IndicatorPlan, limit: int,
+                 bars: int, max_points: int, method: str) -> Dict[str, Any]:
+    """Series mode: one batch pass over `limit` bars gives the latest values and the arrays."""
+    df = fetch_bars(client, symbol, ktype, limit)
+    if df.empty:
+        return {"error": "No K-Line data found", "symbol": symbol}
+    last = df.iloc[-1].to_dict()
+
+    key = (symbol, ktype, limit, bar_key(last), plan.key, ("series", bars, max_points, method))
+    cached = results.get(key)
+    if cached is None:
+        latest, arrays = TechnicalAnalysis.compute_series(df, plan, bars, max_points, method)
+        cached = {"indicators": latest, "series": arrays}
+        results.put(key, cached)
+
+    return {
+        "symbol": symbol,
+        "period": period,
+        "last_price": last.get("close"),
+        "timestamp": last.get("time_key"),
+        **cached,
+    }
+
+def _incremental(client, symbol: str, ktype: str, plan: IndicatorPlan, limit: int):
+    """
+    Fetches the bars closed since the last call for this request's stream (one
+    small kline fetch), or `limit` bars with a fresh stream on first use or after
+    a gap. Returns (bars, stream); the caller advances the stream unless cached.
+    """
+    key = (symbol, ktype, tuple(plan.names), limit)
+    stream = streams.get(key, plan.names)
+    if stream.seeded:
+        # Bars that can have closed since the last call, plus the one still forming
+        elapsed = time.monotonic() - stream.advanced_at
+        tail = min(limit, math.ceil(elapsed / KTYPE_SECONDS.get(ktype, 86400)) + 2)
+        df = fetch_bars(client, symbol, ktype, tail)
+        if not df.empty and stream.covers(df):
+            streams.count("updates")
+            return df, stream
+
+    df = fetch_bars(client, symbol, ktype, limit)
+    if df.empty:
+        return df, stream
+    return df, streams.reset(key, plan.names)
+
+def fetch_bars(client, symbol: str, ktype: str, limit: int) -> pd.DataFrame:
+    # Columnar and unrounded: far cheaper to rebuild a frame from than row dicts
+    return pd.DataFrame(client.get_kline(symbol, ktype=ktype, limit=limit, format="columns", precision=-1))
@@ -1,112 +1,335 @@
+import hashlib
+import numpy as np
 import pandas as pd
-import ta
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple, Union
 import logging
+from .downsample import downsample_indices
 
 logger = logging.getLogger(__name__)
 
+Series = Union[np.ndarray, Dict[str, np.ndarray]]
+Spec = Tuple[str, int]
+
+# Fixed parameters of the composite indicators (the same defaults `ta` uses)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLL_WINDOW, BOLL_DEV = 20, 2
+ATR_WINDOW = 14
+RSI_WINDOW = 14
+
+def parse_indicator(name: str) -> Optional[Tuple[str, int]]:
+    """
+    Maps a requested name to (kind, window), e.g. "SMA_20" -> ("SMA", 20),
+    "RSI" -> ("RSI", 14), "BBANDS" -> ("BOLL", 20). None if unknown.
+
+    Spellings the original `ta`-based parser took still work: anything after
+    the window is ignored ("SMA_20_X" -> ("SMA", 20)), and a window glued to
+    RSI is read as one ("RSI14" -> ("RSI", 14)). A non-numeric window raises
+    ValueError.
+    """
+    upper = name.upper()
+    parts = upper.split("_")
+    if upper.startswith("VOL_SMA_"):
+        return "VOL_SMA", int(parts[2])
+    if parts[0] in ("SMA", "EMA", "WMA") and len(parts) > 1:
+        return parts[0], int(parts[1])
+    if upper.startswith("RSI"):
+        if len(parts) > 1:
+            return "RSI", int(parts[1])
+        digits = upper[3:]
+        return "RSI", int(digits) if digits.isdigit() else RSI_WINDOW
+    if upper == "MACD":
+        return "MACD", MACD_SLOW
+    if upper in ("BOLL", "BBANDS"):
+        return "BOLL", BOLL_WINDOW
+    if upper == "ATR":
+        return "ATR", ATR_WINDOW
+    return None
+
+@dataclass(frozen=True)
+class IndicatorPlan:
+    """
+    An indicator list compiled once: each distinct name parsed to its spec (or
+    the error it raised), duplicates dropped. `key` is a digest of the entries
+    for result caches.
+    """
+    entries: Tuple[Tuple[str, Optional[Spec], Optional[str]], ...]  # (name, spec, parse error)
+    key: str
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _, _ in self.entries]
+
+    def evaluate(self, engine: "IndicatorEngine") -> Dict[str, Union[Series, str]]:
+        """Full series per name; "Unknown Indicator" / "Error (...)" strings for names that fail."""
+        out: Dict[str, Union[Series, str]] = {}
+        for name, spec, error in self.entries:
+            if error is not None:
+                out[name] = f"Error ({error})"
+            elif spec is None:
+                out[name] = "Unknown Indicator"
+            else:
+                try:
+                    out[name] = engine.compute(spec)
+                except Exception as e:
+                    logger.warning(f"Failed to calc {name}: {e}")
+                    out[name] = f"Error ({e})"
+        return out
+
+def compile_plan(indicators: Iterable[str]) -> IndicatorPlan:
+    """Memoized: repeated requests for the same list reuse one plan."""
+    return _compile(tuple(indicators))
+
+@lru_cache(maxsize=512)
+def _compile(indicators: Tuple[str, ...]) -> IndicatorPlan:
+    entries = []
+    for name in dict.fromkeys(indicators):
+        try:
+            entries.append((name, parse_indicator(name), None))
+        except ValueError as e:  # e.g. "SMA_x"
+            entries.append((name, None, str(e)))
+    key = hashlib.sha1(repr(entries).encode()).hexdigest()[:16]
+    return IndicatorPlan(tuple(entries), key)
+
+class IndicatorEngine:
+    """
+    Vectorized indicators over contiguous float64 arrays.
+
+    Intermediates (rolling means, EMAs, true range) are memoized per engine,
+    so SMA_20 and BOLL share one rolling mean and MACD reuses EMA_12/EMA_26 if
+    they were requested too. Results match `ta` (fillna=False) to float
+    rounding: NaN until a window is full, and ATR is 0 before its first value.
+    """
+
+    def __init__(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+                 low: Optional[np.ndarray] = None, volume: Optional[np.ndarray] = None):
+        self._src = {
+            "close": np.ascontiguousarray(close, dtype=np.float64),
+            "high": None if high is None else np.ascontiguousarray(high, dtype=np.float64),
+            "low": None if low is None else np.ascontiguousarray(low, dtype=np.float64),
+            "volume": None if volume is None else np.ascontiguousarray(volume, dtype=np.float64),
+        }
+        self._memo: Dict[Tuple, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorEngine":
+        col = lambda name: df[name].to_numpy(dtype=np.float64) if name in df.columns else None
+        return cls(col("close"), col("high"), col("low"), col("volume"))
+
+    def __len__(self) -> int:
+        return len(self._src["close"])
+
+    def _source(self, name: str) -> np.ndarray:
+        arr = self._src[name]
+        if arr is None:
+            raise ValueError(f"'{name}' column is required")
+        return arr
+
+    def _cached(self, key: Tuple, fn: Callable[[], np.ndarray]) -> np.ndarray:
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = fn()
+        return value
+
+    # --- shared intermediates -------------------------------------------------
+
+    def sma(self, src: str, n: int) -> np.ndarray:
+        return self._cached(("sma", src, n), lambda: _rolling_mean(self._source(src), n))
+
+    def std(self, src: str, n: int) -> np.ndarray:
+        """Rolling population std (ddof=0, as BollingerBands)."""
+        return self._cached(("std", src, n), lambda: _rolling_std(self._source(src), n, self.sma(src, n)))
+
+    def ema(self, src: str, n: int) -> np.ndarray:
+        return self._cached(("ema", src, n), lambda: _ewm(self._source(src), 2.0 / (n + 1), n))
+
+    def true_range(self) -> np.ndarray:
+        def compute():
+            high, low, close = self._source("high"), self._source("low"), self._source("close")
+            tr = high - low
+            if len(tr) > 1:
+                prev = close[:-1]
+                tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+            return tr
+        return self._cached(("tr",), compute)
+
+    # --- indicators -----------------------------------------------------------
+
+    def wma(self, n: int) -> np.ndarray:
+        def compute():
+            close = self._source("close")
+            out = np.full(len(close), np.nan)
+            if len(close) >= n:
+                weights = np.arange(1, n + 1, dtype=np.float64) * 2 / (n * (n + 1))
+                out[n - 1:] = sliding_window_view(close, n) @ weights
+            return out
+        return self._cached(("wma", n), compute)
+
+    def rsi(self, n: int) -> np.ndarray:
+        def compute():
+            close = self._source("close")
+            diff = np.diff(close, prepend=np.nan)
+            up = np.where(diff > 0, diff, 0.0)
+            down = np.where(diff < 0, -diff, 0.0)
+            emaup = _ewm(up, 1.0 / n, n)
+            emadn = _ewm(down, 1.0 / n, n)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(emadn == 0, 100.0, 100.0 - 100.0 / (1.0 + emaup / emadn))
+        return self._cached(("rsi", n), compute)
+
+    def macd(self) -> Dict[str, np.ndarray]:
+        line = self._cached(("macd",), lambda: self.ema("close", MACD_FAST) - self.ema("close", MACD_SLOW))
+        signal = self._cached(("macd_signal",), lambda: _ewm(line, 2.0 / (MACD_SIGNAL + 1), MACD_SIGNAL))
+        return {"MACD_LINE": line, "MACD_SIGNAL": signal, "MACD_HIST": line - signal}
+
+    def boll(self) -> Dict[str, np.ndarray]:
+        mid = self.sma("close", BOLL_WINDOW)
+        band = BOLL_DEV * self.std("close", BOLL_WINDOW)
+        return {"BOLL_UPPER": mid + band, "BOLL_MID": mid, "BOLL_LOWER": mid - band}
+
+    def atr(self, n: int = ATR_WINDOW) -> np.ndarray:
+        def compute():
+            tr = self.true_range()
+            if len(tr) < n:
+                raise ValueError(f"ATR needs at least {n} bars, got {len(tr)}")
+            out = np.zeros(len(tr))
+            # Wilder smoothing seeded with the mean of the first n true ranges
+            seeded = np.concatenate(([tr[:n].mean()], tr[n:]))
+            out[n - 1:] = _ewm(seeded, 1.0 / n, 1)
+            return out
+        return self._cached(("atr", n), compute)
+
+    def series(self, name: str) -> Optional[Series]:
+        """Full series for one requested name (dict of series for MACD/BOLL); None if unknown."""
+        spec = parse_indicator(name)
+        return None if spec is None else self.compute(spec)
+
+    def compute(self, spec: Spec) -> Series:
+        """Full series for a parsed (kind, window) spec."""
+        kind, n = spec
+        if kind == "SMA":
+            return self.sma("close", n)
+        if kind == "EMA":
+            return self.ema("close", n)
+        if kind == "WMA":
+            return self.wma(n)
+        if kind == "RSI":
+            return self.rsi(n)
+        if kind == "MACD":
+            return self.macd()
+        if kind == "BOLL":
+            return self.boll()
+        if kind == "ATR":
+            return self.atr(n)
+        return self.sma("volume", n)
+
+def _rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if n <= 0 or len(x) < n:
+        return out
+    # Cumulative sums around a reference level keep the differences well conditioned
+    ref = x[0]
+    csum = np.cumsum(np.concatenate(([0.0], x - ref)))
+    out[n - 1:] = (csum[n:] - csum[:-n]) / n + ref
+    return out
+
+def _rolling_std(x: np.ndarray, n: int, mean: np.ndarray) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if n <= 0 or len(x) < n:
+        return out
+    windows = sliding_window_view(x, n)
+    dev = windows - mean[n - 1:, None]
+    out[n - 1:] = np.sqrt(np.einsum("ij,ij->i", dev, dev) / n)
+    return out
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """Recursive EMA (adjust=False) via pandas' compiled ewm; leading NaNs are skipped like `ta`."""
+    return pd.Series(x).ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean().to_numpy()
+
+def _values(arr: np.ndarray) -> List[Optional[float]]:
+    """Rounded list with NaN as null (JSON has no NaN)."""
+    values = np.round(arr, 3).tolist()
+    return [None if v != v else v for v in values]
+
+def _last(value: Series) -> Union[float, Dict[str, float]]:
+    if isinstance(value, dict):
+        return {k: round(float(v[-1]), 3) for k, v in value.items()}
+    return round(float(value[-1]), 3)
+
 class TechnicalAnalysis:
     """
-    Computes technical indicators on market data using 'ta' library.
+    Computes technical indicators on market data with the vectorized IndicatorEngine.
     """
-    
+
     @staticmethod
-    def compute(df: pd.DataFrame, indicators: List[str]) -> Dict[str, Any]:
+    def compute(df: pd.DataFrame, indicators: Union[List[str], IndicatorPlan]) -> Dict[str, Any]:
         """
         Computes requested indicators and returns the latest values.
-        
+
         Args:
             df: DataFrame containing 'close', 'high', 'low', 'volume' columns.
-            indicators: List of indicator strings (e.g. ["RSI", "SMA_20"])
-            
+            indicators: List of indicator strings (e.g. ["RSI", "SMA_20"]) or a compiled plan.
+
         Returns:
             Dict of indicator names and their latest values.
         """
         if df.empty:
             return {}
-            
-        # Ensure column names match what 'ta' expects (it expects lowercase usually, but let's standardize)
-        # Futu DF usually has 'close', 'high', etc.
-        # ta lib works on Series.
-        
+
         results = {}
-        
+
         try:
-            close = df['close']
-            high = df['high']
-            low = df['low']
-            volume = df['volume']
-            
-            for ind in indicators:
-                ind_upper = ind.upper()
-                val = None
-                
-                try:
-                    # Generic Moving Averages
-                    if ind_upper.startswith("SMA_"):
-                        # Format: SMA_20
-                        period = int(ind_upper.split("_")[1])
-                        val = ta.trend.SMAIndicator(close=close, window=period).sma_indicator().iloc[-1]
-                        
-                    elif ind_upper.startswith("EMA_"):
-                        # Format: EMA_50
-                        period = int(ind_upper.split("_")[1])
-                        val = ta.trend.EMAIndicator(close=close, window=period).ema_indicator().iloc[-1]
-                        
-                    elif ind_upper.startswith("WMA_"):
-                        period = int(ind_upper.split("_")[1])
-                        val = ta.trend.WMAIndicator(close=close, window=period).wma().iloc[-1]
-
-                    # Momentum
-                    elif ind_upper.startswith("RSI"):
-                        # Format: RSI or RSI_14
-                        period = 14
-                        if "_" in ind_upper:
-                            period = int(ind_upper.split("_")[1])
-                        val = ta.momentum.RSIIndicator(close=close, window=period).rsi().iloc[-1]
-                        
-                    elif ind_upper == "MACD":
-                        macd = ta.trend.MACD(close=close)
-                        val = {
-                            "MACD_LINE": macd.macd().iloc[-1],
-                            "MACD_SIGNAL": macd.macd_signal().iloc[-1],
-                            "MACD_HIST": macd.macd_diff().iloc[-1]
-                        }
-
-                    # Volatility
-                    elif ind_upper == "BOLL" or ind_upper == "BBANDS":
-                        boll = ta.volatility.BollingerBands(close=close, window=20, window_dev=2)
-                        val = {
-                            "BOLL_UPPER": boll.bollinger_hband().iloc[-1],
-                            "BOLL_MID": boll.bollinger_mavg().iloc[-1],
-                            "BOLL_LOWER": boll.bollinger_lband().iloc[-1]
-                        }
-                    
-                    elif ind_upper == "ATR":
-                         val = ta.volatility.AverageTrueRange(high=high, low=low, close=close).average_true_range().iloc[-1]
-
-                    # Volume
-                    elif ind_upper.startswith("VOL_SMA_"):
-                         period = int(ind_upper.split("_")[2])
-                         val = ta.trend.SMAIndicator(close=volume, window=period).sma_indicator().iloc[-1]
-
-                    if val is not None:
-                        # Round floats for cleanliness
-                        if isinstance(val, float):
-                             results[ind] = round(val, 3)
-                        elif isinstance(val, dict):
-                             results[ind] = {k: round(v, 3) for k, v in val.items()}
-                        else:
-                             results[ind] = val
-                    else:
-                        results[ind] = "Unknown Indicator"
+            plan = indicators if isinstance(indicators, IndicatorPlan) else compile_plan(indicators)
+            # One engine for the whole request: shared intermediates are computed once
+            engine = IndicatorEngine.from_frame(df)
+
+            for ind, val in plan.evaluate(engine).items():
+                results[ind] = val if isinstance(val, str) else _last(val)
 
-                except Exception as e:
-                    logger.warning(f"Failed to calc {ind}: {e}")
-                    results[ind] = f"Error ({e})"
-                    
         except Exception as e:
              logger.error(f"Error in technical analysis: {e}")
              return {"error": str(e)}
 
         return results
+
+    @staticmethod
+    def compute_series(df: pd.DataFrame, indicators: Union[List[str], IndicatorPlan], bars: int = 0,
+                       max_points: int = 0, method: str = "lttb") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Latest values plus full series from one pass over df.
+
+        Args:
+            df: DataFrame containing 'time_key', 'close', 'high', 'low', 'volume' columns.
+            indicators: List of indicator strings or a compiled plan.
+            bars: Series cover the last `bars` bars (0 = all of df; earlier bars only warm up windows).
+            max_points: Downsample the series to at most this many points (0 = off).
+            method: "lttb" (picks points by the close's shape) or "every_k".
+
+        Returns:
+            (latest values as compute() returns them, series aligned on "time_key"/"close").
+        """
+        if df.empty:
+            return {}, {}
+        plan = indicators if isinstance(indicators, IndicatorPlan) else compile_plan(indicators)
+        engine = IndicatorEngine.from_frame(df)
+        evaluated = plan.evaluate(engine)
+
+        start = max(len(df) - bars, 0) if bars > 0 else 0
+        close = engine._source("close")[start:]
+        idx = start + downsample_indices(close, max_points, method)
+        pick = lambda arr: _values(arr[idx])
+
+        latest: Dict[str, Any] = {}
+        series: Dict[str, Any] = {
+            "time_key": [str(t) for t in df["time_key"].to_numpy()[idx]],
+            "close": pick(engine._source("close")),
+        }
+        for name, val in evaluated.items():
+            if isinstance(val, str):
+                latest[name] = series[name] = val
+            else:
+                latest[name] = _last(val)
+                series[name] = {k: pick(v) for k, v in val.items()} if isinstance(val, dict) else pick(val)
+        return latest, series
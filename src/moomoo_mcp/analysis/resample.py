@@ -0,0 +1,71 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Regular trading sessions per market, in minutes after midnight (exchange local time)
+SESSIONS: Dict[str, List[Tuple[int, int]]] = {
+    "HK": [(9 * 60 + 30, 12 * 60), (13 * 60, 16 * 60)],
+    "US": [(9 * 60 + 30, 16 * 60)],
+    "SH": [(9 * 60 + 30, 11 * 60 + 30), (13 * 60, 15 * 60)],
+    "SZ": [(9 * 60 + 30, 11 * 60 + 30), (13 * 60, 15 * 60)],
+}
+DEFAULT_SESSIONS = SESSIONS["HK"]
+
+# Minutes per bar of the intraday ktypes that can be derived from finer bars
+KTYPE_MINUTES = {"K_1M": 1, "K_3M": 3, "K_5M": 5, "K_15M": 15, "K_30M": 30, "K_60M": 60}
+
+def sessions_for(symbol: str) -> List[Tuple[int, int]]:
+    return SESSIONS.get(symbol.split(".")[0].upper(), DEFAULT_SESSIONS)
+
+def session_minutes(symbol: str) -> int:
+    """Trading minutes in one regular day."""
+    return sum(close - open_ for open_, close in sessions_for(symbol))
+
+def resample_bars(df: pd.DataFrame, ktype: str, symbol: str) -> pd.DataFrame:
+    """
+    Aggregates finer bars into `ktype` bars (intraday ktypes or K_DAY) without
+    crossing session boundaries.
+
+    Bars are labelled by their end time, as OpenD does. Intraday buckets are
+    anchored at each session open and the last bucket of a session is cut at
+    its close (HK 60m: 10:30, 11:30, 12:00, 14:00, 15:00, 16:00). Auction bars
+    at or outside the session edges fold into the nearest bucket. K_DAY groups
+    by trading date with a "YYYY-MM-DD 00:00:00" label.
+    """
+    if df.empty:
+        return df.copy()
+    times = pd.to_datetime(df["time_key"]).to_numpy()
+    days = times.astype("datetime64[D]")
+    if ktype == "K_DAY":
+        labels = days.astype("datetime64[m]")
+    else:
+        n = KTYPE_MINUTES[ktype]
+        sessions = np.array(sessions_for(symbol))
+        opens, closes = sessions[:, 0], sessions[:, 1]
+        minute = ((times - days) // np.timedelta64(1, "m")).astype(np.int64)
+        # The session a bar belongs to: the last one opening strictly before its end time
+        idx = np.clip(np.searchsorted(opens, minute, side="left") - 1, 0, len(opens) - 1)
+        open_, close = opens[idx], closes[idx]
+        elapsed = np.clip(minute - open_, 0, close - open_)
+        bucket = np.maximum(-(-elapsed // n) - 1, 0)  # ceil(elapsed / n) - 1
+        end = np.minimum(open_ + (bucket + 1) * n, close)
+        labels = days.astype("datetime64[m]") + end.astype("timedelta64[m]")
+
+    # Bars are sorted, so each label is one contiguous run
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.concatenate((starts[1:], [len(labels)])) - 1
+    col = lambda name: df[name].to_numpy(dtype=np.float64)
+    out = {
+        "time_key": pd.DatetimeIndex(labels[starts]).strftime("%Y-%m-%d %H:%M:%S"),
+        "open": col("open")[starts],
+        "close": col("close")[ends],
+        "high": np.maximum.reduceat(col("high"), starts),
+        "low": np.minimum.reduceat(col("low"), starts),
+        "volume": np.add.reduceat(col("volume"), starts),
+    }
+    if "turnover" in df.columns:
+        out["turnover"] = np.add.reduceat(col("turnover"), starts)
+    resampled = pd.DataFrame(out)
+    if "code" in df.columns:
+        resampled.insert(0, "code", df["code"].iloc[0])
+    return resampled
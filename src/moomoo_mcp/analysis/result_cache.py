@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from ..config import config
+
+def bar_key(bar: Dict[str, Any]) -> Tuple:
+    """
+    Identity of the newest bar: its time_key plus OHLCV, so a still-forming bar
+    that ticked since the last call is a miss rather than a stale hit.
+    """
+    return tuple(bar.get(k) for k in ("time_key", "open", "high", "low", "close", "volume"))
+
+def _copy(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-caller copy so one caller's edits don't leak into the cache."""
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in values.items()}
+
+class IndicatorResultCache:
+    """
+    LRU of indicator results keyed by (symbol, ktype, limit, newest bar, plan key).
+
+    Agents repeat the same request many times between bar closes; while the
+    newest bar is unchanged those repeats skip indicator computation entirely.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            values = self._entries.get(key)
+            if values is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return _copy(values)
+
+    def put(self, key: Hashable, values: Dict[str, Any]):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = _copy(values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, **self._counters}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+results = IndicatorResultCache(config.indicator_cache_size)
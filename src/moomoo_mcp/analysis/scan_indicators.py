@@ -0,0 +1,61 @@
+import time
+from typing import List, Dict, Any, Optional
+from ..opend.client import get_client
+from .get_technical_indicators import PERIOD_KTYPES
+from .screener import parse_filters, pool, scan
+
+def scan_indicators(
+    symbols: Optional[List[str]] = None,
+    universe: Optional[str] = None,
+    indicators: List[str] = ["RSI_14"],
+    filters: List[str] = [],
+    period: str = "1d",
+    limit: int = 200,
+    max_results: int = 100,
+) -> Dict[str, Any]:
+    """
+    Screens many symbols by technical indicators in one call, e.g. RSI_14 < 30 across an index.
+    Klines are fetched in parallel batches (through the kline store if enabled) and indicators
+    are computed across a process pool. Returns only matching symbols, plus per-stage timing.
+
+    Args:
+        symbols: Symbols to scan (e.g. ["HK.00700", "HK.00005"]).
+        universe: Plate/index code whose constituents are scanned instead (e.g. "HK.800000").
+        indicators: Indicators to compute and return, same names as get_technical_indicators.
+        filters: Predicates that must all hold, "<operand> <op> <operand>" with <, <=, >, >=, ==, !=.
+                 Operands: indicator names ("RSI_14", "SMA_50", "MACD_HIST", "BOLL_LOWER"),
+                 bar fields ("close", "volume") or numbers. E.g. ["RSI_14 < 30", "close > SMA_200"].
+        period: Timeframe: "1m", "5m", "15m", "30m", "60m", "1d", "1w".
+        limit: Bars per symbol (enough for the longest window).
+        max_results: Max matches returned.
+    """
+    t0 = time.perf_counter()
+    client = get_client()
+    parsed = parse_filters(filters)
+    ktype = PERIOD_KTYPES.get(period.lower(), "K_DAY")
+
+    universe_symbols = client.get_plate_stock(universe) if universe else []
+    requested = list(dict.fromkeys(list(symbols or []) + universe_symbols))
+    if not requested:
+        return {"error": "Provide symbols or a universe"}
+    t1 = time.perf_counter()
+
+    frames, errors = client.get_kline_frames(requested, ktype=ktype, limit=limit)
+    t2 = time.perf_counter()
+
+    matches, stages = scan(frames, list(frames), indicators, parsed, pool)
+    t3 = time.perf_counter()
+
+    return {
+        "matches": matches[:max_results],
+        "count": len(matches),
+        "scanned": len(frames),
+        "errors": [{"symbol": s, "error": e} for s, e in errors.items()],
+        "timing": {
+            "resolve_s": round(t1 - t0, 4),
+            "fetch_s": round(t2 - t1, 4),
+            **stages,
+            "total_s": round(t3 - t0, 4),
+            "workers": pool.workers,
+        },
+    }
@@ -0,0 +1,192 @@
+import logging
+import math
+import multiprocessing
+import operator
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..config import config
+from .indicators import IndicatorEngine, compile_plan, parse_indicator
+
+logger = logging.getLogger(__name__)
+
+# Below this many symbols the pool's pickling overhead outweighs the parallelism
+MIN_PARALLEL = 64
+
+OPERATORS = {
+    "<=": operator.le, ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, ">": operator.gt,
+}
+_FILTER_RE = re.compile(r"^\s*(\S+)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$")
+
+# Bar columns usable in filters (last bar's value)
+BAR_FIELDS = {"close": "close", "price": "close", "last_price": "close", "high": "high",
+              "low": "low", "volume": "volume"}
+
+# Output keys of the composite indicators, for filters such as "MACD_HIST > 0"
+COMPOSITE_KEYS = {
+    "MACD_LINE": "MACD", "MACD_SIGNAL": "MACD", "MACD_HIST": "MACD",
+    "BOLL_UPPER": "BOLL", "BOLL_MID": "BOLL", "BOLL_LOWER": "BOLL",
+}
+
+Operand = Union[float, str]
+
+@dataclass(frozen=True)
+class Filter:
+    """One predicate, e.g. "RSI_14 < 30" or "close > SMA_50"."""
+    lhs: Operand
+    op: str
+    rhs: Operand
+
+    @classmethod
+    def parse(cls, expr: str) -> "Filter":
+        m = _FILTER_RE.match(expr)
+        if not m:
+            raise ValueError(f"Invalid filter: {expr!r}. Expected '<operand> <op> <operand>', e.g. 'RSI_14 < 30'")
+        return cls(_operand(m.group(1)), m.group(2), _operand(m.group(3)))
+
+    def indicators(self) -> List[str]:
+        """Indicator names this filter needs computed."""
+        names = []
+        for side in (self.lhs, self.rhs):
+            if isinstance(side, str) and side.lower() not in BAR_FIELDS:
+                names.append(COMPOSITE_KEYS.get(side.split(".")[-1], side.split(".")[0]))
+        return names
+
+    def __call__(self, values: Dict[str, Any], bar: Dict[str, float]) -> bool:
+        a, b = _resolve(self.lhs, values, bar), _resolve(self.rhs, values, bar)
+        if a is None or b is None or a != a or b != b:
+            return False  # NaN / warm-up values never match
+        return OPERATORS[self.op](a, b)
+
+def _operand(token: str) -> Operand:
+    try:
+        return float(token)
+    except ValueError:
+        pass
+    name = token.upper()
+    if token.lower() in BAR_FIELDS:
+        return token.lower()
+    if parse_indicator(name.split(".")[0]) is None and name.split(".")[-1] not in COMPOSITE_KEYS:
+        raise ValueError(f"Unknown filter operand: {token!r}")
+    return name
+
+def _resolve(operand: Operand, values: Dict[str, Any], bar: Dict[str, float]) -> Optional[float]:
+    if isinstance(operand, float):
+        return operand
+    if operand in BAR_FIELDS:
+        return bar.get(BAR_FIELDS[operand])
+    key = operand.split(".")[-1]
+    if key in COMPOSITE_KEYS:
+        return (values.get(COMPOSITE_KEYS[key]) or {}).get(key)
+    value = values.get(operand)
+    return value if isinstance(value, float) else None
+
+def parse_filters(exprs: Sequence[str]) -> List[Filter]:
+    return [Filter.parse(e) for e in exprs or []]
+
+# A job is one symbol's bars: (symbol, time_key of the last bar, close, high, low, volume)
+Job = Tuple[str, str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+def frame_job(symbol: str, df: pd.DataFrame) -> Job:
+    col = lambda c: df[c].to_numpy(dtype=np.float64) if c in df.columns else np.full(len(df), np.nan)
+    return symbol, str(df["time_key"].iloc[-1]), col("close"), col("high"), col("low"), col("volume")
+
+def scan_jobs(jobs: List[Job], indicators: List[str], filters: List[Filter]) -> List[Dict[str, Any]]:
+    """
+    Computes the indicators for each job and keeps those passing every filter.
+    Runs in pool workers, so it only touches the (picklable) arguments.
+    """
+    out = []
+    plan = compile_plan(indicators)
+    for symbol, time_key, close, high, low, volume in jobs:
+        if len(close) == 0:
+            continue
+        values: Dict[str, Any] = {}
+        for name, series in plan.evaluate(IndicatorEngine(close, high, low, volume)).items():
+            if isinstance(series, str):
+                values[name] = series
+            elif isinstance(series, dict):
+                values[name] = {k: float(v[-1]) for k, v in series.items()}
+            else:
+                values[name] = float(series[-1])
+        bar = {"close": close[-1], "high": high[-1], "low": low[-1], "volume": volume[-1]}
+        if all(f(values, bar) for f in filters):
+            out.append({
+                "symbol": symbol,
+                "last_price": round(float(close[-1]), 3),
+                "timestamp": time_key,
+                "indicators": {k: _rounded(v) for k, v in values.items()},
+            })
+    return out
+
+def _rounded(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: round(v, 3) for k, v in value.items()}
+    return round(value, 3) if isinstance(value, float) else value
+
+class ScanPool:
+    """
+    Lazily started process pool for indicator scans (spawned workers: the
+    server process holds OpenD threads that must not be forked).
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def run(self, jobs: List[Job], indicators: List[str], filters: List[Filter],
+            parallel: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Matches in job order; inline for small scans or a single worker unless `parallel` forces it."""
+        if parallel is None:
+            parallel = self.workers > 1 and len(jobs) >= MIN_PARALLEL
+        if not parallel:
+            return scan_jobs(jobs, indicators, filters)
+        # A few batches per worker keeps pickling cheap and the load balanced
+        size = max(1, math.ceil(len(jobs) / (self.workers * 4)))
+        batches = [(jobs[i:i + size], indicators, filters) for i in range(0, len(jobs), size)]
+        return [row for rows in self.map(scan_jobs, batches) for row in rows]
+
+    def map(self, fn, batches: List[tuple]) -> List[Any]:
+        """fn(*batch) for every batch across the workers; results in batch order. fn must be top-level."""
+        futures = [self.executor().submit(fn, *batch) for batch in batches]
+        return [f.result() for f in futures]
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+# Shared by scan_indicators and backtest sweeps; workers start on first use
+pool = ScanPool(config.scan_workers)
+
+def scan(frames: Dict[str, pd.DataFrame], symbols: List[str], indicators: List[str], filters: List[Filter],
+         pool: "ScanPool", parallel: Optional[bool] = None) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """Builds jobs in symbol order and runs them; returns (matches, stage timings)."""
+    t0 = time.perf_counter()
+    # Computed under upper-case names (as filters refer to them), reported under the requested ones
+    requested = {name.upper(): name for name in indicators}
+    needed = list(dict.fromkeys(list(requested) + [n for f in filters for n in f.indicators()]))
+    jobs = [frame_job(s, frames[s]) for s in dict.fromkeys(symbols) if s in frames and not frames[s].empty]
+    t1 = time.perf_counter()
+    rows = pool.run(jobs, needed, filters, parallel)
+    t2 = time.perf_counter()
+    for row in rows:
+        row["indicators"] = {requested[k]: v for k, v in row["indicators"].items() if k in requested}
+    return rows, {"prepare_s": round(t1 - t0, 4), "compute_s": round(t2 - t1, 4)}
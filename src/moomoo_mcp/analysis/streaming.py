@@ -0,0 +1,325 @@
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple, Union
+import pandas as pd
+from .indicators import (
+    Spec, compile_plan, MACD_FAST, MACD_SLOW, MACD_SIGNAL, BOLL_WINDOW, BOLL_DEV,
+)
+
+NAN = float("nan")
+
+# Bar fields consumed by the states: (close, high, low, volume)
+Bar = Tuple[float, float, float, float]
+Value = Union[float, Dict[str, float]]
+
+# Running sums are re-added from their window this often to shed float drift
+RESUM_EVERY = 1024
+
+MAX_STREAMS = 1024
+
+class _Ema:
+    """adjust=False EMA with pandas' min_periods; NaN inputs are skipped."""
+    __slots__ = ("alpha", "min_periods", "value", "count")
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.count = 0
+
+    def step(self, x: float, commit: bool) -> float:
+        if x != x:
+            return self.value if self.count >= self.min_periods else NAN
+        value = x if self.count == 0 else self.value + self.alpha * (x - self.value)
+        count = self.count + 1
+        if commit:
+            self.value, self.count = value, count
+        return value if count >= self.min_periods else NAN
+
+class _Window:
+    """Ring buffer of the last n values with a running sum."""
+    __slots__ = ("n", "buf", "total", "steps")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.buf: deque = deque(maxlen=n)
+        self.total = 0.0
+        self.steps = 0
+
+    def step(self, x: float, commit: bool) -> Tuple[float, bool]:
+        """(sum of the window ending at x, window full)."""
+        full = len(self.buf) == self.n
+        total = self.total + x - (self.buf[0] if full else 0.0)
+        if commit:
+            self.buf.append(x)
+            self.steps += 1
+            total = math.fsum(self.buf) if self.steps % RESUM_EVERY == 0 else total
+            self.total = total
+            return total, len(self.buf) == self.n
+        return total, full or len(self.buf) + 1 == self.n
+
+    def values(self, x: float) -> List[float]:
+        """Window contents ending at x (x already appended if committed)."""
+        return list(self.buf)[1:] + [x] if len(self.buf) == self.n else list(self.buf) + [x]
+
+class SmaState:
+    def __init__(self, n: int, field: int = 0):
+        self.window = _Window(n)
+        self.field = field
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        total, full = self.window.step(bar[self.field], commit)
+        return total / self.window.n if full else NAN
+
+class EmaState:
+    def __init__(self, n: int):
+        self.ema = _Ema(2.0 / (n + 1), n)
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        return self.ema.step(bar[0], commit)
+
+class WmaState:
+    """Weighted numerator updated in O(1): N' = N - S + n * x_new."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.window = _Window(n)
+        self.numerator = 0.0
+        self.denominator = n * (n + 1) / 2
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        x, n, buf = bar[0], self.n, self.window.buf
+        if len(buf) == n:
+            numerator = self.numerator - self.window.total + n * x
+        else:
+            numerator = self.numerator + (len(buf) + 1) * x
+        full = len(buf) == n or len(buf) + 1 == n
+        self.window.step(x, commit)
+        if commit:
+            if self.window.steps % RESUM_EVERY == 0:
+                numerator = math.fsum((i + 1) * v for i, v in enumerate(buf))
+            self.numerator = numerator
+        return numerator / self.denominator if full else NAN
+
+class RsiState:
+    def __init__(self, n: int):
+        self.up = _Ema(1.0 / n, n)
+        self.down = _Ema(1.0 / n, n)
+        self.prev: Optional[float] = None
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        x = bar[0]
+        diff = x - self.prev if self.prev is not None else NAN
+        up = self.up.step(diff if diff > 0 else 0.0, commit)
+        down = self.down.step(-diff if diff < 0 else 0.0, commit)
+        if commit:
+            self.prev = x
+        if down != down:
+            return NAN
+        return 100.0 if down == 0 else 100.0 - 100.0 / (1.0 + up / down)
+
+class MacdState:
+    def __init__(self):
+        self.fast = _Ema(2.0 / (MACD_FAST + 1), MACD_FAST)
+        self.slow = _Ema(2.0 / (MACD_SLOW + 1), MACD_SLOW)
+        self.signal = _Ema(2.0 / (MACD_SIGNAL + 1), MACD_SIGNAL)
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        line = self.fast.step(bar[0], commit) - self.slow.step(bar[0], commit)
+        signal = self.signal.step(line, commit)
+        return {"MACD_LINE": line, "MACD_SIGNAL": signal, "MACD_HIST": line - signal}
+
+class BollState:
+    """Mean from the running sum; std two-pass over the (short) ring buffer."""
+
+    def __init__(self, n: int = BOLL_WINDOW):
+        self.window = _Window(n)
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        x = bar[0]
+        values = self.window.values(x)
+        total, full = self.window.step(x, commit)
+        if not full:
+            return {"BOLL_UPPER": NAN, "BOLL_MID": NAN, "BOLL_LOWER": NAN}
+        mid = total / self.window.n
+        std = math.sqrt(sum((v - mid) ** 2 for v in values) / self.window.n)
+        return {"BOLL_UPPER": mid + BOLL_DEV * std, "BOLL_MID": mid, "BOLL_LOWER": mid - BOLL_DEV * std}
+
+class AtrState:
+    """Wilder ATR seeded with the mean of the first n true ranges; 0 before that (as `ta`)."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.prev: Optional[float] = None
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = 0.0
+
+    def step(self, bar: Bar, commit: bool) -> Value:
+        close, high, low, _ = bar
+        tr = high - low
+        if self.prev is not None:
+            tr = max(tr, abs(high - self.prev), abs(low - self.prev))
+        count, seed_sum, value = self.count + 1, self.seed_sum, self.value
+        if count < self.n:
+            seed_sum += tr
+        elif count == self.n:
+            value = (seed_sum + tr) / self.n
+        else:
+            value = (value * (self.n - 1) + tr) / self.n
+        if commit:
+            self.prev, self.count, self.seed_sum, self.value = close, count, seed_sum, value
+        return value
+
+    def ready(self, pending: int = 1) -> bool:
+        return self.count + pending >= self.n
+
+def make_state(spec: Spec):
+    """Incremental state for one parsed (kind, window) spec."""
+    kind, n = spec
+    if kind == "SMA":
+        return SmaState(n)
+    if kind == "VOL_SMA":
+        return SmaState(n, field=3)
+    if kind == "EMA":
+        return EmaState(n)
+    if kind == "WMA":
+        return WmaState(n)
+    if kind == "RSI":
+        return RsiState(n)
+    if kind == "MACD":
+        return MacdState()
+    if kind == "BOLL":
+        return BollState(n)
+    return AtrState(n)
+
+def _rounded(value: Value) -> Value:
+    if isinstance(value, dict):
+        return {k: round(v, 3) for k, v in value.items()}
+    return round(value, 3)
+
+class IndicatorStream:
+    """
+    Incremental indicator state for one (symbol, ktype, indicator set).
+
+    Closed bars are committed into the states once; the newest bar (which may
+    still be forming) is only evaluated, so polling the same minute repeatedly
+    never double-counts it. Each new bar costs O(1) per indicator.
+    """
+
+    def __init__(self, indicators: List[str]):
+        plan = compile_plan(indicators)
+        self.indicators = plan.names
+        # Names with the same spec ("RSI", "RSI_14") share one state
+        by_spec: Dict[Spec, Any] = {}
+        self.states: Dict[str, Any] = {}
+        for name, spec, error in plan.entries:
+            if error is not None:
+                self.states[name] = f"Error ({error})"  # e.g. "SMA_x"; reported like the batch path
+            elif spec is None:
+                self.states[name] = None
+            else:
+                if spec not in by_spec:
+                    by_spec[spec] = make_state(spec)
+                self.states[name] = by_spec[spec]
+        self._unique = list(by_spec.values())
+        self.committed_time: Optional[str] = None  # time_key of the last committed bar
+        self.latest: Optional[Tuple[str, Bar]] = None  # newest bar, evaluated but not committed
+        self.bars = 0
+        self.advanced_at = 0.0  # monotonic time of the last advance()
+        self._lock = threading.Lock()
+
+    @property
+    def seeded(self) -> bool:
+        return self.latest is not None
+
+    def covers(self, df: pd.DataFrame) -> bool:
+        """True if df starts at or before the first bar this stream still needs (no gap)."""
+        return self.seeded and (df.empty or str(df["time_key"].iloc[0]) <= self.latest[0])
+
+    def advance(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Feeds bars (oldest first); bars at or before the last committed one are
+        ignored. Returns the latest value of every indicator.
+        """
+        with self._lock:
+            times = [str(t) for t in df["time_key"].tolist()]
+            # Usually only a bar or two are new; slice before touching the value columns
+            start = 0
+            while self.committed_time and start < len(times) and times[start] <= self.committed_time:
+                start += 1
+            if start < len(times):
+                times = times[start:]
+                cols = [df[c].to_numpy(dtype=float)[start:].tolist() if c in df.columns else [NAN] * len(times)
+                        for c in ("close", "high", "low", "volume")]
+                rows = list(zip(*cols))
+                for t, bar in zip(times[:-1], rows[:-1]):
+                    for state in self._unique:
+                        state.step(bar, True)
+                    self.committed_time = t
+                    self.bars += 1
+                self.latest = (times[-1], rows[-1])
+            self.advanced_at = time.monotonic()
+            return self._evaluate()
+
+    def _evaluate(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        if self.latest is None:
+            return results
+        bar = self.latest[1]
+        values: Dict[int, Value] = {}
+        for name, state in self.states.items():
+            if state is None:
+                results[name] = "Unknown Indicator"
+            elif isinstance(state, str):
+                results[name] = state
+            elif isinstance(state, AtrState) and not state.ready():
+                results[name] = f"Error (ATR needs at least {state.n} bars, got {self.bars + 1})"
+            else:
+                if id(state) not in values:
+                    values[id(state)] = _rounded(state.step(bar, False))
+                results[name] = values[id(state)]
+        return results
+
+class IndicatorStreams:
+    """LRU registry of IndicatorStream by (symbol, ktype, indicators, limit)."""
+
+    def __init__(self, max_streams: int = MAX_STREAMS):
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[Tuple, IndicatorStream]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"seeds": 0, "updates": 0, "evictions": 0}
+
+    def get(self, key: Tuple, indicators: List[str]) -> IndicatorStream:
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = IndicatorStream(indicators)
+                if len(self._streams) > self.max_streams:
+                    self._streams.popitem(last=False)
+                    self._counters["evictions"] += 1
+            else:
+                self._streams.move_to_end(key)
+            return stream
+
+    def reset(self, key: Tuple, indicators: List[str]) -> IndicatorStream:
+        with self._lock:
+            stream = self._streams[key] = IndicatorStream(indicators)
+            self._counters["seeds"] += 1
+            return stream
+
+    def count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"streams": len(self._streams), "max_streams": self.max_streams, **self._counters}
+
+    def clear(self):
+        with self._lock:
+            self._streams.clear()
+
+streams = IndicatorStreams()
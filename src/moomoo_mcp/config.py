@@ -11,6 +11,28 @@ class OpenDConfig(BaseModel):
     env: str = Field(default="paper", description="Environment: paper or live")
     default_market: str = Field(default="HK", description="Default market for symbols (HK, US, CN)")
     max_order_value: float = Field(default=2000.0, description="Max allowed value per order")
+    max_basket_value: float = Field(default=20000.0, description="Max allowed gross value of one basket")
+    max_position_value: float = Field(default=0.0, description="Max value held plus on order per symbol (0 = off)")
+    max_gross_exposure: float = Field(default=0.0, description="Max gross portfolio exposure incl. open orders (0 = off)")
+    max_net_exposure: float = Field(default=0.0, description="Max absolute net portfolio exposure incl. open orders (0 = off)")
+    max_daily_turnover: float = Field(default=0.0, description="Max value of orders sent per day (0 = off)")
+    max_orders_per_minute: int = Field(default=0, description="Max orders sent per rolling minute (0 = off)")
+    order_concurrency: int = Field(default=4, description="Basket legs submitted in parallel")
+    executor_workers: int = Field(default=8, description="Max worker threads for blocking OpenD calls")
+    trading_executor_workers: int = Field(default=2, description="Worker threads reserved for order placement/modification")
+    subscription_quota: int = Field(default=100, description="OpenD subscription quota of the account")
+    quote_push: bool = Field(default=False, description="Serve quotes from a push-fed in-memory cache")
+    quote_max_age: float = Field(default=3.0, description="Max age (seconds) of a cached quote before re-fetching")
+    order_book_push: bool = Field(default=False, description="Maintain local L2 books from ORDER_BOOK pushes")
+    batch_window_ms: float = Field(default=0.0, description="Micro-batching window for quote/financials calls (0 = off)")
+    account_push: bool = Field(default=False, description="Serve positions/funds/orders from a push-maintained cache")
+    account_reconcile_seconds: float = Field(default=30.0, description="Max age (seconds) of cached account state before re-querying")
+    snapshot_concurrency: int = Field(default=4, description="Snapshot chunks (of 400 codes) fetched in parallel")
+    float_precision: int = Field(default=6, description="Float decimals in columnar tool output (-1 = unrounded)")
+    scan_workers: int = Field(default=0, description="Processes for scan_indicators and backtest sweeps (0 = CPU count)")
+    indicator_cache_size: int = Field(default=4096, description="Cached get_technical_indicators results (0 = off)")
+    option_chain_ttl: float = Field(default=300.0, description="Seconds an option chain (contract list) is reused (0 = off)")
+    kline_store_dir: str = Field(default="", description="Directory of the on-disk kline store (empty = off)")
 
     @classmethod
     def from_env(cls) -> "OpenDConfig":
@@ -21,6 +43,28 @@ class OpenDConfig(BaseModel):
             env=os.getenv("MOOMOO_ENV", "paper"),
             default_market=os.getenv("MOOMOO_DEFAULT_MARKET", "HK"),
             max_order_value=float(os.getenv("MAX_ORDER_VALUE", "2000.0")),
+            max_basket_value=float(os.getenv("MAX_BASKET_VALUE", "20000.0")),
+            max_position_value=float(os.getenv("MAX_POSITION_VALUE", "0")),
+            max_gross_exposure=float(os.getenv("MAX_GROSS_EXPOSURE", "0")),
+            max_net_exposure=float(os.getenv("MAX_NET_EXPOSURE", "0")),
+            max_daily_turnover=float(os.getenv("MAX_DAILY_TURNOVER", "0")),
+            max_orders_per_minute=int(os.getenv("MAX_ORDERS_PER_MINUTE", "0")),
+            order_concurrency=int(os.getenv("OPEND_ORDER_CONCURRENCY", "4")),
+            executor_workers=int(os.getenv("OPEND_EXECUTOR_WORKERS", "8")),
+            trading_executor_workers=int(os.getenv("OPEND_TRADING_WORKERS", "2")),
+            subscription_quota=int(os.getenv("OPEND_SUB_QUOTA", "100")),
+            quote_push=os.getenv("MOOMOO_QUOTE_PUSH", "false").lower() in ("1", "true", "yes"),
+            quote_max_age=float(os.getenv("QUOTE_MAX_AGE", "3.0")),
+            order_book_push=os.getenv("MOOMOO_ORDER_BOOK_PUSH", "false").lower() in ("1", "true", "yes"),
+            batch_window_ms=float(os.getenv("QUOTE_BATCH_WINDOW_MS", "0")),
+            account_push=os.getenv("MOOMOO_ACCOUNT_PUSH", "false").lower() in ("1", "true", "yes"),
+            account_reconcile_seconds=float(os.getenv("ACCOUNT_RECONCILE_SECONDS", "30")),
+            snapshot_concurrency=int(os.getenv("OPEND_SNAPSHOT_CONCURRENCY", "4")),
+            float_precision=int(os.getenv("OUTPUT_FLOAT_PRECISION", "6")),
+            scan_workers=int(os.getenv("SCAN_WORKERS", "0")),
+            indicator_cache_size=int(os.getenv("INDICATOR_CACHE_SIZE", "4096")),
+            option_chain_ttl=float(os.getenv("OPTION_CHAIN_TTL", "300")),
+            kline_store_dir=os.getenv("KLINE_STORE_DIR", ""),
         )
 
 config = OpenDConfig.from_env()
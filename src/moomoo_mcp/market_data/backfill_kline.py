@@ -0,0 +1,21 @@
+from typing import Any, Dict, Optional
+from ..opend.client import get_client
+from .get_kline import PERIOD_MAP
+
+def backfill_kline(symbol: str, period: str = "1m", start: str = "", end: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Download a long kline history into the local kline store (requires KLINE_STORE_DIR).
+    Pages of 1000 bars are streamed to disk, so multi-year minute data fits in memory.
+    Later get_kline / get_technical_indicators calls are served from the store.
+
+    Args:
+        symbol: Security code, e.g. "HK.00700".
+        period: Timeframe. Allowed: 1m, 3m, 5m, 15m, 30m, 60m, 1d, 1w, 1M, 1y. Default: 1m.
+        start: Start date "YYYY-MM-DD" (default: about 1000 bars back).
+        end: Optional end date "YYYY-MM-DD" (default: today).
+    """
+    if period not in PERIOD_MAP:
+        raise ValueError(f"Invalid period: {period}. Allowed: {list(PERIOD_MAP.keys())}")
+
+    client = get_client()
+    return client.backfill_kline(symbol, ktype=PERIOD_MAP[period], start=start or None, end=end)
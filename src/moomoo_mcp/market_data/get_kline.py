@@ -1,6 +1,7 @@
-from typing import Any, Dict, List
+from typing import Optional
 from futu import KLType
 from ..opend.client import get_client
+from ..utils.encoding import Encoded, validate_format
 
 # Map easy strings to Futu KLType
 PERIOD_MAP = {
@@ -16,25 +17,41 @@ PERIOD_MAP = {
     "1y": KLType.K_YEAR,
 }
 
-def get_kline(symbol: str, period: str = "1d", limit: int = 100) -> List[Dict[str, Any]]:
+# Bars beyond one 1000-bar page are fetched page by page; this only bounds the response size
+MAX_LIMIT = 100_000
+
+def get_kline(
+    symbol: str,
+    period: str = "1d",
+    limit: int = 100,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    format: str = "records",
+    precision: Optional[int] = None,
+) -> Encoded:
     """
     Get historical candlestick (k-line) data.
     
     Args:
         symbol: Security code, e.g. "US.AAPL".
         period: Timeframe. Allowed: 1m, 3m, 5m, 15m, 30m, 60m, 1d, 1w, 1M, 1y. Default: 1d.
-        limit: Number of candles to return. Max 1000. Default 100.
+        limit: Number of candles to return (the newest ones). Max 100000. Default 100.
+        start: Optional start date "YYYY-MM-DD".
+        end: Optional end date "YYYY-MM-DD" (default: today).
+        format: "records" (list of row objects, default) or "columns" (column name -> array; smaller, for bulk data).
+        precision: Float decimals in "columns" format (default: server setting).
     """
     # Validation
     if period not in PERIOD_MAP:
         raise ValueError(f"Invalid period: {period}. Allowed: {list(PERIOD_MAP.keys())}")
     
     ktype = PERIOD_MAP[period]
+    validate_format(format)
     
     # Cap limit
-    if limit > 1000:
-        limit = 1000
+    if limit > MAX_LIMIT:
+        limit = MAX_LIMIT
         
     client = get_client()
-    data = client.get_kline(symbol, ktype=ktype, limit=limit)
+    data = client.get_kline(symbol, ktype=ktype, limit=limit, start=start, end=end, format=format, precision=precision)
     return data
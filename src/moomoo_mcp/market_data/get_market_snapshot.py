@@ -1,13 +1,25 @@
-from typing import Any, List, Dict
+from typing import List, Optional
 from ..opend.client import get_client
+from ..utils.encoding import Encoded, validate_format
 
-def get_market_snapshot(symbols: List[str]) -> List[Dict[str, Any]]:
+def get_market_snapshot(
+    symbols: List[str],
+    max_age: Optional[float] = None,
+    format: str = "records",
+    precision: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Encoded:
     """
     Efficiently fetch snapshot data for a list of stocks.
     Faster than get_quote for multiple symbols.
     
     Args:
         symbols: List of stock symbols (e.g. ["HK.00700", "US.AAPL"])
+        max_age: Push mode only. Max age in seconds of cached rows (default: server setting).
+        format: "records" (list of row objects, default) or "columns" (column name -> array; smaller, for bulk data).
+        precision: Float decimals in "columns" format (default: server setting).
+        fields: Optional column names to return, or presets: "price", "fundamentals", "risk".
     """
+    validate_format(format)
     client = get_client()
-    return client.get_market_snapshot(symbols)
+    return client.get_market_snapshot(symbols, max_age=max_age, format=format, precision=precision, fields=fields)
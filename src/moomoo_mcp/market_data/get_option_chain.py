@@ -1,7 +1,14 @@
-from typing import Any, Dict, List
+from typing import Optional
 from ..opend.client import get_client
+from ..utils.encoding import Encoded, validate_format
 
-def get_option_chain(symbol: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+def get_option_chain(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    format: str = "records",
+    precision: Optional[int] = None,
+) -> Encoded:
     """
     Get option chain for a stock.
     
@@ -9,6 +16,9 @@ def get_option_chain(symbol: str, start_date: str, end_date: str) -> List[Dict[s
         symbol: Underlying stock symbol (e.g., "HK.00700")
         start_date: Start expiry date (YYYY-MM-DD)
         end_date: End expiry date (YYYY-MM-DD)
+        format: "records" (list of row objects, default) or "columns" (column name -> array; smaller, for bulk data).
+        precision: Float decimals in "columns" format (default: server setting).
     """
+    validate_format(format)
     client = get_client()
-    return client.get_option_chain(symbol, start_date, end_date)
+    return client.get_option_chain(symbol, start_date, end_date, format=format, precision=precision)
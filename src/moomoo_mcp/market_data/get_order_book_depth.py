@@ -0,0 +1,17 @@
+from typing import Any, Dict
+from ..opend.client import get_client
+
+def get_order_book_depth(symbol: str, levels: int = 5) -> Dict[str, Any]:
+    """
+    Get order book depth metrics: best bid/ask, spread, mid and cumulative volume.
+    In push mode this is served from the locally maintained L2 book (no OpenD call).
+    
+    Args:
+        symbol: Stock symbol (e.g., "HK.00700").
+        levels: Number of price levels per side (default 5, max 40).
+    """
+    if levels < 1:
+        raise ValueError("levels must be >= 1")
+    levels = min(levels, 40)
+    client = get_client()
+    return client.get_order_book_depth(symbol, levels=levels)
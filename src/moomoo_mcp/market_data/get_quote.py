@@ -1,14 +1,16 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import Context
 from ..opend.client import get_client
 
-def get_quote(symbol: str) -> Dict[str, Any]:
+def get_quote(symbol: str, max_age: Optional[float] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get a real-time snapshot quote for a security.
     
     Args:
         symbol: Security code, e.g. "US.AAPL", "HK.00700".
+        max_age: Push mode only. Max age in seconds of a cached quote (default: server setting).
+        fields: Optional column names to return (e.g. ["last_price", "volume"]), or presets: "price", "fundamentals", "risk".
     """
     client = get_client()
-    data = client.get_quote(symbol)
+    data = client.get_quote(symbol, max_age=max_age, fields=fields)
     return data
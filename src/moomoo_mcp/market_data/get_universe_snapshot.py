@@ -0,0 +1,20 @@
+from typing import Any, List, Dict, Optional
+from ..opend.client import get_client
+
+def get_universe_snapshot(
+    symbols: List[str],
+    max_age: Optional[float] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Snapshot a large universe (thousands of symbols) in one call.
+    The list is split into 400-code chunks fetched in parallel under the rate limiter.
+    Returns rows in input order, plus `missing` symbols and per-chunk `failures`.
+    
+    Args:
+        symbols: List of stock symbols (e.g. ["HK.00700", "US.AAPL", ...])
+        max_age: Push mode only. Max age in seconds of cached rows (default: server setting).
+        fields: Optional column names to return, or presets: "price", "fundamentals", "risk".
+    """
+    client = get_client()
+    return client.get_universe_snapshot(symbols, max_age=max_age, fields=fields)
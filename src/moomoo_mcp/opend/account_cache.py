@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from futu import RET_OK, RET_ERROR, TradeOrderHandlerBase, TradeDealHandlerBase
+from .order_store import OrderStore
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("positions", "funds")
+
+def _copy(value: Any) -> Any:
+    """Per-caller copy so one caller's edits don't leak into the cache."""
+    if isinstance(value, list):
+        return [dict(r) for r in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+class AccountCache:
+    """
+    Positions and funds of the trading account, kept in memory.
+    (Orders live in an OrderStore fed by the same pushes.)
+
+    Each section is loaded once from OpenD and served from memory until an
+    order or deal push touches it, or until it is older than `max_age`
+    seconds (the periodic reconcile that catches missed pushes). A load that
+    raced with a push is returned to its caller but not cached, so a fill is
+    never masked by a pre-fill response.
+    """
+
+    def __init__(self, max_age: float = 30.0):
+        self.max_age = max_age
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._generation = {name: 0 for name in SECTIONS}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "loads": 0, "order_pushes": 0, "deal_pushes": 0, "invalidations": 0}
+
+    def get(self, section: str, loader: Callable[[], Any]) -> Any:
+        """Cached value of `section`, or the result of `loader()` (cached unless a push raced it)."""
+        with self._lock:
+            entry = self._entries.get(section)
+            if entry is not None and time.monotonic() - entry[1] <= self.max_age:
+                self._counters["hits"] += 1
+                return _copy(entry[0])
+            generation = self._generation[section]
+            self._counters["loads"] += 1
+        value = loader()
+        with self._lock:
+            if self._generation[section] == generation:
+                self._entries[section] = (value, time.monotonic())
+        return _copy(value)
+
+    def invalidate(self, *sections: str):
+        with self._lock:
+            self._invalidate(sections or SECTIONS)
+
+    def _invalidate(self, sections: Iterable[str]):
+        for name in sections:
+            self._generation[name] += 1
+            if self._entries.pop(name, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def on_orders(self, records: List[Dict[str, Any]]):
+        """Order push: frozen cash and sellable quantities change with every order event."""
+        with self._lock:
+            self._counters["order_pushes"] += len(records)
+            self._invalidate(("positions", "funds"))
+
+    def on_deals(self, records: List[Dict[str, Any]]):
+        """Deal push: a fill changes positions and funds."""
+        with self._lock:
+            self._counters["deal_pushes"] += len(records)
+            self._invalidate(("positions", "funds"))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "cached": {name: round(now - at, 1) for name, (_, at) in self._entries.items()},
+                "max_age_s": self.max_age,
+                **self._counters,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._invalidate(SECTIONS)
+
+class AccountOrderPushHandler(TradeOrderHandlerBase):
+    """Feeds order pushes from OpenD into the OrderStore and AccountCache (runs on futu's callback thread)."""
+
+    def __init__(self, cache: AccountCache, orders: OrderStore, risk: Optional[Any] = None):
+        super().__init__()
+        self._cache = cache
+        self._orders = orders
+        self._risk = risk
+
+    def on_recv_rsp(self, rsp_pb):
+        ret, data = super().on_recv_rsp(rsp_pb)
+        if ret != RET_OK:
+            logger.warning(f"Order push error: {data}")
+            return RET_ERROR, data
+        self.apply(data)
+        return RET_OK, data
+
+    def apply(self, data: pd.DataFrame):
+        records = data.to_dict(orient="records")
+        self._orders.upsert(records)
+        self._cache.on_orders(records)
+        if self._risk is not None:
+            self._risk.on_orders(records)
+
+class AccountDealPushHandler(TradeDealHandlerBase):
+    """Feeds deal pushes from OpenD into an AccountCache (runs on futu's callback thread)."""
+
+    def __init__(self, cache: AccountCache, risk: Optional[Any] = None):
+        super().__init__()
+        self._cache = cache
+        self._risk = risk
+
+    def on_recv_rsp(self, rsp_pb):
+        ret, data = super().on_recv_rsp(rsp_pb)
+        if ret != RET_OK:
+            logger.warning(f"Deal push error: {data}")
+            return RET_ERROR, data
+        self.apply(data)
+        return RET_OK, data
+
+    def apply(self, data: pd.DataFrame):
+        records = data.to_dict(orient="records")
+        self._cache.on_deals(records)
+        if self._risk is not None:
+            self._risk.on_deals(records)
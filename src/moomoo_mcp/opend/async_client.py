@@ -0,0 +1,167 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from futu import TrdSide, OrderType
+from ..config import config
+from .client import MoomooClient, get_client
+from ..utils.encoding import Encoded
+from .scheduler import Priority, current_priority, request_priority
+
+logger = logging.getLogger(__name__)
+
+class AsyncMoomooClient:
+    """
+    asyncio facade over MoomooClient.
+    Each call runs the blocking futu round-trip on a bounded thread pool,
+    so concurrent tool calls overlap instead of stalling the event loop.
+    Trading calls get their own small pool so they never queue behind data pulls.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, client: Optional[MoomooClient] = None, max_workers: Optional[int] = None):
+        self._client = client or get_client()
+        self._max_workers = max_workers or config.executor_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="opend",
+        )
+        self._trading_executor = ThreadPoolExecutor(
+            max_workers=config.trading_executor_workers,
+            thread_name_prefix="opend-trade",
+        )
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @property
+    def client(self) -> MoomooClient:
+        return self._client
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs a blocking callable on the OpenD executor and awaits its result."""
+        return await self.run_in_lane(current_priority(), fn, *args, **kwargs)
+
+    async def run_in_lane(self, priority: Priority, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs a blocking callable in a priority lane. The lane picks the executor
+        and is visible to the rate-limit scheduler inside the call.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._trading_executor if priority == Priority.TRADING else self._executor
+        call = functools.partial(fn, *args, **kwargs)
+
+        def task():
+            with request_priority(priority):
+                return call()
+        # run_in_executor does not carry contextvars over, so copy them explicitly
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(executor, ctx.run, task)
+
+    async def connect(self):
+        await self.run(self._client.connect)
+
+    async def get_quote(self, symbol: str, max_age: Optional[float] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self.run(self._client.get_quote, symbol, max_age=max_age, fields=fields)
+
+    async def get_kline(self, symbol: str, ktype: str = "K_DAY", limit: int = 100,
+                        start: Optional[str] = None, end: Optional[str] = None,
+                        format: str = "records", precision: Optional[int] = None) -> Encoded:
+        return await self.run(self._client.get_kline, symbol, ktype=ktype, limit=limit, start=start, end=end,
+                              format=format, precision=precision)
+
+    async def backfill_kline(self, symbol: str, ktype: str = "K_DAY", start: Optional[str] = None,
+                             end: Optional[str] = None) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.BULK, self._client.backfill_kline, symbol, ktype=ktype, start=start, end=end)
+
+    async def get_market_snapshot(self, symbols: List[str], max_age: Optional[float] = None,
+                                  format: str = "records", precision: Optional[int] = None,
+                                  fields: Optional[List[str]] = None) -> Encoded:
+        return await self.run(self._client.get_market_snapshot, symbols, max_age=max_age, format=format,
+                              precision=precision, fields=fields)
+
+    async def get_universe_snapshot(self, symbols: List[str], max_age: Optional[float] = None,
+                                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.BULK, self._client.get_universe_snapshot, symbols, max_age=max_age, fields=fields)
+
+    async def get_financials(self, symbol: str) -> Dict[str, Any]:
+        return await self.run(self._client.get_financials, symbol)
+
+    async def get_order_book(self, symbol: str, limit: int = 10) -> Dict[str, Any]:
+        return await self.run(self._client.get_order_book, symbol, limit=limit)
+
+    async def get_order_book_depth(self, symbol: str, levels: int = 5) -> Dict[str, Any]:
+        return await self.run(self._client.get_order_book_depth, symbol, levels=levels)
+
+    async def get_option_chain(self, symbol: str, start_date: str, end_date: str,
+                               format: str = "records", precision: Optional[int] = None) -> Encoded:
+        return await self.run(self._client.get_option_chain, symbol, start_date, end_date, format=format, precision=precision)
+
+    async def get_positions(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return await self.run(self._client.get_positions, fields=fields)
+
+    async def get_balance(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self.run(self._client.get_balance, fields=fields)
+
+    async def get_funds(self) -> Dict[str, Any]:
+        return await self.run(self._client.get_funds)
+
+    async def get_orders(self, symbol: str = "", status_filter: List[Any] = None,
+                         format: str = "records", precision: Optional[int] = None) -> Encoded:
+        return await self.run(self._client.get_orders, symbol=symbol, status_filter=status_filter,
+                              format=format, precision=precision)
+
+    async def get_deals(self, symbol: str = "", format: str = "records", precision: Optional[int] = None) -> Encoded:
+        return await self.run(self._client.get_deals, symbol=symbol, format=format, precision=precision)
+
+    async def get_max_buyable(self, symbol: str, price: float = 0.0) -> Dict[str, Any]:
+        return await self.run(self._client.get_max_buyable, symbol, price)
+
+    async def place_order(self, symbol: str, quantity: int, price: float, side: TrdSide, order_type: OrderType = OrderType.NORMAL) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.TRADING, self._client.place_order, symbol, quantity, price, side, order_type=order_type)
+
+    async def place_basket(self, legs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.TRADING, self._client.place_basket, legs)
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.TRADING, self._client.cancel_order, order_id)
+
+    async def cancel_orders(self, symbol: str = "", side: Optional[str] = None, statuses: Optional[List[str]] = None,
+                            min_price: Optional[float] = None, max_price: Optional[float] = None,
+                            min_age_seconds: Optional[float] = None) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.TRADING, self._client.cancel_orders, symbol, side, statuses,
+                                      min_price, max_price, min_age_seconds)
+
+    async def modify_order(self, order_id: str, price: float, quantity: int) -> Dict[str, Any]:
+        return await self.run_in_lane(Priority.TRADING, self._client.modify_order, order_id, price, quantity)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._trading_executor.shutdown(wait=False)
+
+# Global async client accessor
+def get_async_client() -> AsyncMoomooClient:
+    return AsyncMoomooClient.get_instance()
+
+def async_tool(fn: Callable[..., Any], priority: Priority = Priority.INTERACTIVE) -> Callable[..., Any]:
+    """
+    Wraps a sync tool function as a coroutine for FastMCP, running in the given lane.
+    The wrapper keeps the original name, docstring and signature so the tool schema is unchanged.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await get_async_client().run_in_lane(priority, fn, *args, **kwargs)
+    return wrapper
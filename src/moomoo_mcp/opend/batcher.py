@@ -0,0 +1,95 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .errors import QuoteError
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Folds single-symbol requests arriving within a short window into one batch call.
+
+    The first caller of a batch becomes its leader: it waits up to `window`
+    seconds (or until `max_batch` symbols are queued), sends one request for
+    every queued symbol and routes each row back to the caller that asked.
+    Callers never share a thread with a background worker.
+
+    Symbols queued while the leader wakes up can overshoot `max_batch`, so a
+    batch is sent in chunks of at most `max_batch` symbols, further capped by
+    `capacity()` when given (e.g. the free subscription quota).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+        window: float = 0.003,
+        max_batch: int = 400,
+        name: str = "batch",
+        capacity: Optional[Callable[[], int]] = None,
+    ):
+        self._fetch = fetch
+        self._capacity = capacity
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self._pending: List[Tuple[str, Future]] = []
+        self._full = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "batches": 0, "chunks": 0, "symbols_fetched": 0}
+
+    def submit(self, symbol: str) -> Dict[str, Any]:
+        """Blocks until the batch containing `symbol` is fetched; returns its row."""
+        fut: Future = Future()
+        with self._lock:
+            self._pending.append((symbol, fut))
+            self._counters["requests"] += 1
+            leader = len(self._pending) == 1
+            if len(self._pending) >= self.max_batch:
+                self._full.set()
+
+        if leader:
+            self._full.wait(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._full.clear()
+            self._dispatch(batch)
+
+        return fut.result()
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]):
+        symbols = list(dict.fromkeys(s for s, _ in batch))
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["symbols_fetched"] += len(symbols)
+        rows: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, Exception] = {}
+        i = 0
+        while i < len(symbols):
+            size = self.max_batch if self._capacity is None else max(1, min(self.max_batch, self._capacity()))
+            chunk = symbols[i:i + size]
+            i += size
+            with self._lock:
+                self._counters["chunks"] += 1
+            try:
+                rows.update(self._fetch(chunk))
+            except Exception as e:
+                # Only this chunk's callers fail
+                errors.update((s, e) for s in chunk)
+        for symbol, fut in batch:
+            row = rows.get(symbol)
+            if symbol in errors:
+                fut.set_exception(errors[symbol])
+            elif row is None:
+                fut.set_exception(QuoteError(f"OpenD Error: no {self.name} data for {symbol}"))
+            else:
+                fut.set_result(dict(row))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            batches = self._counters["batches"]
+            return {
+                **self._counters,
+                "avg_batch_size": round(self._counters["requests"] / batches, 2) if batches else 0.0,
+                "window_ms": round(self.window * 1000, 3),
+            }
@@ -0,0 +1,95 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChunkFailure:
+    """One chunk whose request failed; its symbols are reported, the others still succeed."""
+    index: int
+    symbols: List[str]
+    error: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunk": self.index,
+            "count": len(self.symbols),
+            "first": self.symbols[0] if self.symbols else None,
+            "last": self.symbols[-1] if self.symbols else None,
+            "error": self.error,
+        }
+
+def split_chunks(symbols: List[str], size: int) -> List[List[str]]:
+    """Unique symbols (first occurrence order) in chunks of at most `size`."""
+    unique = list(dict.fromkeys(symbols))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+class ChunkedFetcher:
+    """
+    Fans a multi-symbol request out over max-size chunks.
+
+    Chunks run in parallel on a small dedicated pool (they still pass through
+    the rate-limit scheduler one by one); each worker inherits the caller's
+    contextvars, so the request lane carries over. A failing chunk is recorded
+    instead of failing the whole call.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="opend-chunk")
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "chunks": 0, "failed_chunks": 0}
+
+    def fetch(
+        self,
+        symbols: List[str],
+        fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+        chunk_size: int,
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[ChunkFailure]]:
+        """Returns (rows keyed by code, failures). Rows from all successful chunks are merged."""
+        chunks = split_chunks(symbols, chunk_size)
+        with self._lock:
+            self._counters["calls"] += 1
+            self._counters["chunks"] += len(chunks)
+
+        if len(chunks) <= 1:
+            # Nothing to parallelise; run on the caller's thread
+            outcomes = [self._run(fetch, chunk) for chunk in chunks]
+        else:
+            # One context copy per chunk: a Context cannot be entered by two threads at once
+            futures = [
+                self._executor.submit(contextvars.copy_context().run, self._run, fetch, chunk)
+                for chunk in chunks
+            ]
+            outcomes = [f.result() for f in futures]
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        failures: List[ChunkFailure] = []
+        for i, (chunk, (result, error)) in enumerate(zip(chunks, outcomes)):
+            if error is None:
+                rows.update(result)
+            else:
+                failures.append(ChunkFailure(i, chunk, error))
+        if failures:
+            with self._lock:
+                self._counters["failed_chunks"] += len(failures)
+            logger.warning(f"{len(failures)}/{len(chunks)} chunks failed: {failures[0].error}")
+        return rows, failures
+
+    @staticmethod
+    def _run(fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]], chunk: List[str]):
+        try:
+            return fetch(chunk), None
+        except Exception as e:
+            return None, str(e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "max_workers": self.max_workers}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -1,6 +1,14 @@
+import contextvars
 import logging
 import threading
-from typing import Optional, Dict, List, Any
+import functools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Any, Callable, Iterable, Iterator, Set, Tuple
+import numpy as np
+import pandas as pd
 from futu import (
     OpenQuoteContext,
     OpenSecTradeContext,
@@ -17,11 +25,56 @@ from futu import (
 )
 from ..config import config
 from ..utils.symbols import normalize_symbol
-from .errors import OpenDConnectionError, QuoteError
+from ..utils.encoding import Encoded, encode_frame, encode_records
+from ..utils.fields import resolve_fields, project_frame, project_row
+from .errors import OpenDConnectionError, QuoteError, OrderStateError
+from .subscriptions import SubscriptionManager
+from .quote_cache import QuoteCache, QuotePushHandler
+from .order_book import LocalOrderBook, OrderBookStore, OrderBookPushHandler
+from .singleflight import SingleFlight, coalesce
+from .batcher import MicroBatcher
+from .chunked import ChunkedFetcher, ChunkFailure
+from .account_cache import AccountCache, AccountOrderPushHandler, AccountDealPushHandler
+from .order_store import OrderStore, OPEN_STATUSES, status_name
+from .option_chain_cache import OptionChainCache
+from .scheduler import Priority, RequestScheduler
+from ..storage.kline_store import KlineStore
 from ..risk.manager import RiskManager, RiskError
+from ..risk.engine import RiskEngine, RiskLimits
 
 logger = logging.getLogger(__name__)
 
+# Per-request code limits of OpenD
+SNAPSHOT_MAX_CODES = 400
+QUOTE_MAX_CODES = 200
+KLINE_PAGE_SIZE = 1000
+# Symbols per chunk when many klines are fetched at once (chunks run in parallel)
+KLINE_SCAN_CHUNK = 25
+# Longest the first order waits for the risk engine's initial seed
+RISK_SEED_TIMEOUT = 10.0
+
+# Bars per trading day for each ktype (CN's 4-hour session for intraday, the shortest)
+BARS_PER_DAY = {
+    "K_1M": 240, "K_3M": 80, "K_5M": 48, "K_15M": 16, "K_30M": 8, "K_60M": 4,
+    "K_DAY": 1, "K_WEEK": 1 / 5, "K_MON": 1 / 21, "K_QUARTER": 1 / 63, "K_YEAR": 1 / 252,
+}
+
+def _lookback_start(ktype: str, bars: int) -> str:
+    """A start date far enough back that at least `bars` bars lie between it and today."""
+    trading_days = bars / BARS_PER_DAY.get(str(ktype), 1)
+    # Weekends, plus a margin for holidays
+    days = math.ceil(trading_days * 7 / 5 * 1.1) + 10
+    return (date.today() - timedelta(days=days)).isoformat()
+
+def _tail(pages: Iterable[pd.DataFrame], limit: int) -> pd.DataFrame:
+    """Newest `limit` rows of a page stream, holding at most one page beyond that."""
+    tail = None
+    for page in pages:
+        tail = page if tail is None else pd.concat([tail, page], ignore_index=True)
+        if len(tail) > limit:
+            tail = tail.iloc[-limit:].reset_index(drop=True)
+    return tail if tail is not None else pd.DataFrame()
+
 class MoomooClient:
 # ... (existing init/connect generic methods skipped for brevity in replacement if not needed, but I need to locate insertion point)
 # I will append new methods at the end or logic places.
@@ -52,72 +105,108 @@ class MoomooClient:
              logger.error(f"Error getting max buyable: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
+    @coalesce
     def get_financials(self, symbol: str) -> Dict[str, Any]:
         """
         Fetches fundamentals (PE, PB, MktCap) using get_market_snapshot.
+        With micro-batching enabled, concurrent calls share one snapshot request.
         """
+        symbol = normalize_symbol(symbol)
+        if self._snapshot_batcher is not None:
+            return self._snapshot_batcher.submit(symbol)
+        return list(self._fetch_financials([symbol]).values())[0]
+
+    def _fetch_financials(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One get_market_snapshot for `symbols`, keyed by code."""
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
-        
-        symbol = normalize_symbol(symbol)
-        
-        # Snapshot often requires QUOTE subscription or is push-based for some fields.
-        # But get_market_snapshot documentation says it pulls latest.
-        # However, to be safe and ensure data is recent/available:
-        ret, err = self._quote_ctx.subscribe([symbol], [SubType.QUOTE], subscribe_push=False)
-        if ret != RET_OK:
-             raise QuoteError(f"Subscription failed for {symbol}: {err}")
-
-        # get_market_snapshot takes list
-        ret, data = self._quote_ctx.get_market_snapshot([symbol])
-        
+
+        # get_market_snapshot pulls the latest data without a subscription, so a
+        # batch of up to 400 codes costs no quota
+        self._scheduler.acquire("snapshot")
+        ret, data = self._quote_ctx.get_market_snapshot(symbols)
+
         if ret == RET_OK:
-             return data.to_dict(orient="records")[0]
+             return {r["code"]: r for r in data.to_dict(orient="records")}
         else:
              logger.error(f"Error fetching financials: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
+    @coalesce
     def get_order_book(self, symbol: str, limit: int = 10) -> Dict[str, Any]:
         """
         Fetches Order Book (Level 2).
+        In push mode the book is read from the locally maintained copy while
+        its push subscription is live.
         """
+        symbol = normalize_symbol(symbol)
+
+        local = self._local_order_book(symbol)
+        if local is not None:
+            return local.to_futu(limit)
+
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
         
-        symbol = normalize_symbol(symbol)
-        
-        # 1. Subscribe to ORDER_BOOK data
+        # 1. Subscribe to ORDER_BOOK data (kept open; the registry evicts idle ones near quota)
         # Note: Order Book requires specific subscription
-        ret, err = self._quote_ctx.subscribe([symbol], [SubType.ORDER_BOOK], subscribe_push=False)
-        if ret != RET_OK:
-             raise QuoteError(f"Subscription failed for {symbol}: {err}")
-
-        # get_order_book(code, num=10)
-        ret, data = self._quote_ctx.get_order_book(symbol, num=limit)
-
-        # Unsubscribe to clean up? Or keep it? 
-        # Better to unsubscribe to avoid limit issues in long run, 
-        # though client handles limit. Let's unsubscribe for safety in this tool.
-        # But wait, unsubscribing might be slow.
-        # For now, let's just fetch.
-        
+        with self._subscriptions.hold([symbol], [SubType.ORDER_BOOK], subscribe_push=self._order_book_push):
+            # get_order_book(code, num=10)
+            num = max(limit, 10) if self._order_book_push else limit
+            ret, data = self._quote_ctx.get_order_book(symbol, num=num)
+
         if ret == RET_OK:
              # data is a dict with 'Bid', 'Ask' keys which are DataFrames/List
              # We need to convert them to easy dict
+             if self._order_book_push:
+                 # Seed the local book; pushes keep it current from here on
+                 return self._order_books.apply(data).to_futu(limit)
              return data
         else:
              logger.error(f"Error fetching order book: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
+    def get_order_book_depth(self, symbol: str, levels: int = 5) -> Dict[str, Any]:
+        """
+        Top-N depth, spread, mid and cumulative volume per side.
+        Served from the local book in push mode, otherwise computed from one pull.
+        """
+        symbol = normalize_symbol(symbol)
+        local = self._local_order_book(symbol)
+        if local is None:
+            data = self.get_order_book(symbol, limit=max(levels, 10))
+            local = self._order_books.get(symbol)
+            if local is None:
+                # Pull mode: wrap the pulled book without keeping it
+                local = LocalOrderBook(symbol)
+                local.apply(data)
+        return local.depth(levels)
+
+    def _local_order_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        """Local book for symbol, if it is kept current by an active push subscription."""
+        if not self._order_book_push:
+            return None
+        if not self._subscriptions.is_subscribed(symbol, SubType.ORDER_BOOK, push=True):
+            # Evicted or never subscribed: pushes have stopped, so the copy may be stale
+            self._order_books.discard(symbol)
+            return None
+        local = self._order_books.get(symbol)
+        if local is not None:
+            self._subscriptions.touch(symbol, SubType.ORDER_BOOK)
+        return local
+
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """
         Cancels an order.
+        Orders the local store knows to be filled or cancelled are rejected without an OpenD call.
         """
+        self._check_order_open(order_id, "cancel")
         self.connect()
         trd_env = self._get_trd_env()
         
+        self._scheduler.acquire("modify_order", Priority.TRADING)
         ret, data = self._trade_ctx.modify_order(
             ModifyOrderOp.CANCEL,
             order_id,
@@ -126,15 +215,128 @@ class MoomooClient:
             trd_env=trd_env
         )
         if ret == RET_OK:
+             self._mark_cancelling(order_id)
+             self._account.invalidate("funds", "positions")
              return data.to_dict(orient="records")[0]
         else:
              logger.error(f"Error canceling order: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
+    def _mark_cancelling(self, order_id: str):
+        """
+        Read-your-writes for a sent cancel: the order leaves the open set in the
+        order store and risk engine until a push or reload reports its final state.
+        """
+        order_id = str(order_id)
+        order = self._orders.get(order_id)
+        dealt = float((order or {}).get("dealt_qty") or 0.0)
+        update = {"order_id": order_id, "order_status": "CANCELLING_PART" if dealt > 0 else "CANCELLING_ALL"}
+        if order is not None:
+            self._orders.upsert([update])
+        self._risk.on_orders([{**(order or {}), **update}])
+
+    def cancel_orders(self, symbol: str = "", side: Optional[str] = None, statuses: Optional[List[str]] = None,
+                      min_price: Optional[float] = None, max_price: Optional[float] = None,
+                      min_age_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Cancels every order matching the filters (default: all open orders).
+        Matches are resolved from one order query; with no filters on a real account a
+        single cancel_all_order is sent, otherwise (or if it fails) the cancels run
+        concurrently under the modify_order rate limit. Failures are reported per order.
+        """
+        t0 = time.perf_counter()
+        self.connect()
+        if not self._trade_ctx:
+            raise OpenDConnectionError("Trade context is null")
+
+        symbol = normalize_symbol(symbol) if symbol else ""
+        wanted = [status_name(s) for s in statuses] if statuses else list(OPEN_STATUSES)
+        side = status_name(side) if side else None
+        now = datetime.now()
+
+        def matches(order: Dict[str, Any]) -> bool:
+            if side and status_name(order.get("trd_side", "")) != side:
+                return False
+            price = order.get("price")
+            if min_price is not None and not (price is not None and price >= min_price):
+                return False
+            if max_price is not None and not (price is not None and price <= max_price):
+                return False
+            if min_age_seconds is not None:
+                try:
+                    created = datetime.strptime(str(order.get("create_time"))[:19], "%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    return False
+                if (now - created).total_seconds() < min_age_seconds:
+                    return False
+            return True
+
+        everything = not (symbol or side or statuses or min_price is not None
+                          or max_price is not None or min_age_seconds is not None)
+        # futu rejects cancel_all_order for simulated accounts
+        cancel_all = everything and self._get_trd_env() == TrdEnv.REAL
+        # cancel_all_order reports nothing back, so its path reads the whole day to diff against afterwards
+        day = self.get_orders(symbol, [] if cancel_all else wanted)
+        orders = [o for o in day if status_name(o.get("order_status", "")) in wanted and matches(o)]
+        ids = [str(o["order_id"]) for o in orders]
+        result: Dict[str, Any] = {"matched": len(ids), "cancelled": [], "failures": []}
+
+        if cancel_all and ids:
+            # Nothing to single out: one request cancels all open orders of the account
+            already = {str(o["order_id"]) for o in day if status_name(o.get("order_status", "")).startswith("CANCEL")}
+            self._scheduler.acquire("modify_order", Priority.TRADING)
+            ret, data = self._trade_ctx.cancel_all_order(trd_env=TrdEnv.REAL)
+            if ret == RET_OK:
+                self._account.invalidate("funds", "positions")
+                result.update(self._cancel_all_report(ids, already))
+                result["method"] = "cancel_all_order"
+            else:
+                logger.warning(f"cancel_all_order failed, cancelling per order: {data}")
+                result["fallback_error"] = str(data)
+
+        if "method" not in result:
+            futures = [
+                self._order_pool.submit(contextvars.copy_context().run, self.cancel_order, oid)
+                for oid in ids
+            ]
+            for oid, future in zip(ids, futures):
+                try:
+                    future.result()
+                    result["cancelled"].append(oid)
+                except Exception as e:
+                    result["failures"].append({"order_id": oid, "error": str(e)})
+            result["method"] = "per_order"
+
+        result["elapsed_s"] = round(time.perf_counter() - t0, 3)
+        return result
+
+    def _cancel_all_report(self, ids: List[str], already: Set[str]) -> Dict[str, Any]:
+        """
+        Re-reads the day's orders after cancel_all_order, which acts on whatever is open
+        when OpenD gets it: matched orders that filled meanwhile are reported as not
+        cancelled, and orders placed after the match query are added to the cancelled list.
+        The fresh statuses also update the order store and risk engine.
+        """
+        records = self._query_orders().to_dict(orient="records")
+        self._orders.upsert(records)
+        self._risk.on_orders(records)
+        matched = set(ids)
+        cancelled, not_cancelled = [], []
+        for r in records:
+            oid, status = str(r["order_id"]), status_name(r.get("order_status", ""))
+            if status.startswith("CANCEL"):
+                if oid not in already:
+                    cancelled.append(oid)
+            elif oid in matched:
+                not_cancelled.append({"order_id": oid, "order_status": status})
+        return {"cancelled": cancelled, "not_cancelled": not_cancelled}
+
     def modify_order(self, order_id: str, price: float, quantity: int) -> Dict[str, Any]:
         """
         Modifies an order.
+        Orders the local store knows to be filled or cancelled are rejected without an OpenD call.
         """
+        self._check_order_open(order_id, "modify")
         self.connect()
         trd_env = self._get_trd_env()
         
@@ -142,6 +344,7 @@ class MoomooClient:
         # Ideally check new value. We'll skip stringent check for now or basic:
         # RiskManager.check_order(...)
         
+        self._scheduler.acquire("modify_order", Priority.TRADING)
         ret, data = self._trade_ctx.modify_order(
             ModifyOrderOp.NORMAL,
             order_id,
@@ -150,29 +353,91 @@ class MoomooClient:
             trd_env=trd_env
         )
         if ret == RET_OK:
+             self._account.invalidate("funds", "positions")
              return data.to_dict(orient="records")[0]
         else:
              logger.error(f"Error modifying order: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
-    def get_market_snapshot(self, symbols: List[str]) -> List[Dict[str, Any]]:
+    @coalesce
+    def get_market_snapshot(self, symbols: List[str], max_age: Optional[float] = None,
+                            format: str = "records", precision: Optional[int] = None,
+                            fields: Optional[List[str]] = None) -> Encoded:
         """
         Fetches market snapshot for a list of symbols (Batch).
+        Lists longer than OpenD's per-request limit are split into chunks fetched in parallel.
+        In push mode, symbols with a fresh cached row are served from memory
+        and only the rest are requested from OpenD.
+        `fields` (column names or presets) limits the columns converted and returned.
+        """
+        normalized_symbols = [normalize_symbol(s) for s in symbols]
+        rows, failures = self._snapshot_rows(normalized_symbols, max_age, resolve_fields(fields))
+        if failures:
+            raise QuoteError(failures[0].error)
+        # Preserve input order, including duplicates
+        return encode_records([dict(rows[s]) for s in normalized_symbols if s in rows], format, precision)
+
+    @coalesce
+    def get_universe_snapshot(self, symbols: List[str], max_age: Optional[float] = None,
+                              fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Snapshot of a large universe (thousands of symbols).
+        Rows come back in input order; chunks that fail are reported rather than raised,
+        so one bad chunk does not lose the rest of the scan.
         """
+        t0 = time.perf_counter()
+        normalized_symbols = [normalize_symbol(s) for s in symbols]
+        rows, failures = self._snapshot_rows(normalized_symbols, max_age, resolve_fields(fields))
+        requested = list(dict.fromkeys(normalized_symbols))
+        ordered = [dict(rows[s]) for s in normalized_symbols if s in rows]
+        return {
+            "rows": ordered,
+            "count": len(ordered),
+            "missing": [s for s in requested if s not in rows],
+            "failures": [f.to_dict() for f in failures],
+            "chunks": math.ceil(len(requested) / SNAPSHOT_MAX_CODES),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+
+    def _snapshot_rows(self, symbols: List[str], max_age: Optional[float] = None,
+                       fields: Optional[List[str]] = None) -> Tuple[Dict[str, Dict[str, Any]], List[ChunkFailure]]:
+        """Snapshot rows keyed by code for normalized symbols (cache first in push mode), plus failed chunks."""
+        cached: Dict[str, Dict[str, Any]] = {}
+        if self._quote_push:
+            for s in symbols:
+                row = self._quote_cache.get_snapshot(s, max_age)
+                if row is not None:
+                    cached[s] = project_row(row, fields)
+            if len(cached) == len(set(symbols)):
+                return cached, []
+
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
-        
-        normalized_symbols = [normalize_symbol(s) for s in symbols]
-        
-        ret, data = self._quote_ctx.get_market_snapshot(normalized_symbols)
+
+        to_fetch = [s for s in dict.fromkeys(symbols) if s not in cached]
+        fetch = functools.partial(self._fetch_snapshots, fields=fields)
+        fetched, failures = self._chunked.fetch(to_fetch, fetch, SNAPSHOT_MAX_CODES)
+        cached.update(fetched)
+        return cached, failures
+
+    def _fetch_snapshots(self, symbols: List[str], fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """One get_market_snapshot for at most SNAPSHOT_MAX_CODES symbols, keyed by code."""
+        self._scheduler.acquire("snapshot")
+        ret, data = self._quote_ctx.get_market_snapshot(symbols)
         if ret == RET_OK:
-             return data.to_dict(orient="records")
+             if self._quote_push:
+                 # The cache keeps full rows; project afterwards
+                 rows = data.to_dict(orient="records")
+                 self._quote_cache.put_snapshots(rows)
+                 return {r["code"]: project_row(r, fields) for r in rows}
+             return dict(zip(data["code"].tolist(), project_frame(data, fields).to_dict(orient="records")))
         else:
              logger.error(f"Error fetching snapshot: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
-    def get_deals(self, symbol: str = "", start_date: str = "", end_date: str = "") -> List[Dict[str, Any]]:
+    def get_deals(self, symbol: str = "", start_date: str = "", end_date: str = "",
+                  format: str = "records", precision: Optional[int] = None) -> Encoded:
         """
         Fetches executed deals (fills).
         """
@@ -186,7 +451,7 @@ class MoomooClient:
             trd_env=trd_env,
         )
         if ret == RET_OK:
-             return data.to_dict(orient="records")
+             return encode_frame(data, format, precision)
         else:
              logger.error(f"Error fetching deals: {data}")
              raise QuoteError(f"OpenD Error: {data}")
@@ -198,8 +463,19 @@ class MoomooClient:
         self.connect()
         if not self._trade_ctx:
              raise OpenDConnectionError("Trade context is null")
+        return self._account_section("funds", self._load_funds)
+
+    def _account_section(self, section: str, loader: Callable[[], Any]) -> Any:
+        """Account cache read in push mode, a direct OpenD query otherwise."""
+        if self._account_push:
+            return self._account.get(section, loader)
+        return loader()
+
+    def _load_funds(self) -> Dict[str, Any]:
+        """One accinfo_query; also backs get_balance."""
         trd_env = self._get_trd_env()
         
+        # Note: accinfo_query(trd_env=TrdEnv.REAL, acc_id=0, acc_index=0, refresh_cache=False)
         ret, data = self._trade_ctx.accinfo_query(trd_env=trd_env)
         if ret == RET_OK:
              return data.to_dict(orient="records")[0]
@@ -211,6 +487,14 @@ class MoomooClient:
         if self._quote_ctx:
             try:
                 self._quote_ctx.unsubscribe_all()
+                self._subscriptions.reset()
+                self._quote_cache.clear()
+                self._order_books.clear()
+                self._account.clear()
+                self._orders.clear()
+                self._stop_risk_reconcile()
+                self._risk.clear()
+                self._option_chains.clear()
             except Exception as e:
                 logger.warning(f"Error unsubscribing all: {e}")
             self._quote_ctx.close()
@@ -226,6 +510,53 @@ class MoomooClient:
         self._quote_ctx: Optional[OpenQuoteContext] = None
         self._trade_ctx: Optional[OpenSecTradeContext] = None
         self._connected = False
+        # Guards connect() when tools run concurrently on executor threads
+        self._connect_lock = threading.Lock()
+        # Refcounted (symbol, SubType) registry; repeat requests skip the subscribe round-trip
+        self._subscriptions = SubscriptionManager(
+            lambda: self._quote_ctx,
+            quota=config.subscription_quota,
+        )
+        # Opt-in push mode: QUOTE pushes keep a per-symbol latest-quote store fresh
+        self._quote_push = config.quote_push
+        self._quote_cache = QuoteCache(max_age=config.quote_max_age)
+        # Opt-in push mode: ORDER_BOOK pushes update local L2 books in place
+        self._order_book_push = config.order_book_push
+        self._order_books = OrderBookStore()
+        # Per-endpoint token buckets: requests wait for OpenD's rate budget instead of failing,
+        # and trading calls jump ahead of queued data pulls
+        self._scheduler = RequestScheduler()
+        # Identical concurrent market-data calls share one in-flight OpenD request
+        self._singleflight = SingleFlight()
+        # Optional micro-batching: single-symbol quote/financials calls arriving
+        # within the window are folded into one OpenD request
+        self._quote_batcher: Optional[MicroBatcher] = None
+        self._snapshot_batcher: Optional[MicroBatcher] = None
+        if config.batch_window_ms > 0:
+            self.enable_batching(config.batch_window_ms / 1000.0)
+        # Snapshot lists beyond one request's code limit are fetched as parallel chunks
+        self._chunked = ChunkedFetcher(max_workers=config.snapshot_concurrency)
+        # Basket legs are submitted in parallel; the place_order bucket still paces them
+        self._order_pool = ThreadPoolExecutor(max_workers=config.order_concurrency, thread_name_prefix="opend-order")
+        # Opt-in push mode: order/deal pushes keep positions, funds and orders in memory
+        self._account_push = config.account_push
+        self._account = AccountCache(max_age=config.account_reconcile_seconds)
+        # The day's orders indexed by id/symbol/status; also lets cancel/modify reject terminal orders locally
+        self._orders = OrderStore()
+        # Stateful pre-trade limits (exposure, turnover, order rate) checked against running counters
+        self._risk = RiskEngine(RiskLimits.from_config())
+        # Trade context the order/deal handlers are registered on (account push or risk limits)
+        self._trade_handlers_ctx: Optional[OpenSecTradeContext] = None
+        # Positions/open orders are re-seeded on a background thread, never on the order path
+        self._risk_reconciler: Optional[threading.Thread] = None
+        self._risk_stop = threading.Event()
+        self._risk_seeded = threading.Event()
+        # Option chains (contract lists) per underlying and expiry range, reused for a TTL
+        self._option_chains = OptionChainCache(ttl=config.option_chain_ttl)
+        # Optional on-disk kline history; only bars newer than the stored tail are fetched
+        self._kline_store: Optional[KlineStore] = (
+            KlineStore(config.kline_store_dir) if config.kline_store_dir else None
+        )
         
         # Configure futu global settings if needed
         SysConfig.enable_proto_encrypt(True if config.pwd else False)
@@ -237,6 +568,82 @@ class MoomooClient:
                 cls._instance = cls()
             return cls._instance
 
+    def enable_quote_push(self):
+        """Registers the QUOTE push handler so get_quote can serve from memory."""
+        if not self._quote_ctx:
+            raise OpenDConnectionError("Quote context is null")
+        self._quote_ctx.set_handler(QuotePushHandler(self._quote_cache))
+        self._quote_push = True
+
+    def enable_order_book_push(self):
+        """Registers the ORDER_BOOK push handler so depth reads are served locally."""
+        if not self._quote_ctx:
+            raise OpenDConnectionError("Quote context is null")
+        self._quote_ctx.set_handler(OrderBookPushHandler(self._order_books))
+        self._order_book_push = True
+
+    def enable_account_push(self):
+        """Registers order/deal push handlers so account reads are served from memory."""
+        self._set_trade_handlers()
+        self._account_push = True
+
+    def enable_risk_push(self):
+        """Registers order/deal push handlers so risk limits follow fills and cancels between reseeds."""
+        self._set_trade_handlers()
+
+    def _set_trade_handlers(self):
+        """One order and one deal handler per trade context feed the order store, account cache and risk engine."""
+        if not self._trade_ctx:
+            raise OpenDConnectionError("Trade context is null")
+        if self._trade_handlers_ctx is self._trade_ctx:
+            return
+        self._trade_ctx.set_handler(AccountOrderPushHandler(self._account, self._orders, self._risk))
+        self._trade_ctx.set_handler(AccountDealPushHandler(self._account, self._risk))
+        self._trade_handlers_ctx = self._trade_ctx
+
+    def account_cache_stats(self) -> Dict[str, Any]:
+        return {"enabled": self._account_push, **self._account.stats(), "orders": self._orders.stats()}
+
+    def order_book_stats(self) -> Dict[str, Any]:
+        return self._order_books.stats()
+
+    def quote_cache_stats(self) -> Dict[str, Any]:
+        return self._quote_cache.stats()
+
+    def option_chain_stats(self) -> Dict[str, Any]:
+        return self._option_chains.stats()
+
+    def enable_batching(self, window: float = 0.003):
+        """Folds get_quote / get_financials calls arriving within `window` seconds into batch requests."""
+        self._quote_batcher = MicroBatcher(self._fetch_quotes, window=window, max_batch=QUOTE_MAX_CODES, name="quote",
+                                           capacity=self._subscriptions.capacity)
+        self._snapshot_batcher = MicroBatcher(self._fetch_financials, window=window, max_batch=SNAPSHOT_MAX_CODES, name="snapshot")
+
+    def batching_stats(self) -> Dict[str, Any]:
+        if self._quote_batcher is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "quote": self._quote_batcher.stats(),
+            "snapshot": self._snapshot_batcher.stats(),
+        }
+
+    def scheduler_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and throttle counts per rate-limited endpoint."""
+        return self._scheduler.stats()
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Executed vs coalesced counts of the single-flight layer."""
+        return self._singleflight.stats()
+
+    def chunking_stats(self) -> Dict[str, Any]:
+        """Chunk and failure counts of multi-chunk snapshot requests."""
+        return self._chunked.stats()
+
+    def subscription_stats(self) -> Dict[str, Any]:
+        """Quota usage and hit counters of the subscription registry."""
+        return self._subscriptions.stats()
+
     def _get_trd_env(self):
         if config.env.lower() == "live":
             return TrdEnv.REAL
@@ -247,6 +654,12 @@ class MoomooClient:
         if self._connected:
             return
 
+        with self._connect_lock:
+            if self._connected:
+                return
+            self._connect()
+
+    def _connect(self):
         logger.info(f"Connecting to OpenD at {config.host}:{config.port}...")
         try:
             # Initialize Quote Context
@@ -260,6 +673,15 @@ class MoomooClient:
             if ret != RET_OK:
                 raise OpenDConnectionError("Failed to get global state after connect.")
 
+            if self._quote_push:
+                self.enable_quote_push()
+            if self._order_book_push:
+                self.enable_order_book_push()
+            if self._account_push:
+                self.enable_account_push()
+            elif self._risk.enabled:
+                self.enable_risk_push()
+
             # Unlock if password provided
             if config.pwd:
                 logger.info("Unlocking trade context...")
@@ -276,103 +698,350 @@ class MoomooClient:
             self._connected = False
             raise OpenDConnectionError(f"Connection failed: {e}")
 
-    def get_quote(self, symbol: str) -> Dict[str, Any]:
+    @coalesce
+    def get_quote(self, symbol: str, max_age: Optional[float] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Fetches a snapshot quote for a given symbol.
-        Returns a dictionary.
+        Returns a dictionary, limited to `fields` (column names or presets) if given.
+
+        In push mode the quote is served from memory when the cached entry is
+        younger than `max_age` seconds (default: config.quote_max_age).
         """
+        symbol = normalize_symbol(symbol)
+        fields = resolve_fields(fields)
+
+        if self._quote_push:
+            cached = self._quote_cache.get_quote(symbol, max_age)
+            if cached is not None:
+                self._subscriptions.touch(symbol, SubType.QUOTE)
+                return project_row(cached, fields)
+
+        if self._quote_batcher is not None:
+            # Batched rows are shared by callers with different fields; project per caller
+            return project_row(self._quote_batcher.submit(symbol), fields)
+        return list(self._fetch_quotes([symbol], fields).values())[0]
+
+    def _fetch_quotes(self, symbols: List[str], fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """One get_stock_quote for `symbols`, keyed by code."""
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
 
+        # 1. Subscribe to QUOTE data (no-op if already subscribed)
+        # In push mode the subscription also starts pushes that keep the cache fresh.
+        with self._subscriptions.hold(symbols, [SubType.QUOTE], subscribe_push=self._quote_push):
+            # 2. Get stock quote
+            ret, data = self._quote_ctx.get_stock_quote(symbols)
+        if ret == RET_OK:
+            if not self._quote_push:
+                return dict(zip(data["code"].tolist(), project_frame(data, fields).to_dict(orient="records")))
+            # The cache keeps full rows; project afterwards
+            records = {r["code"]: r for r in data.to_dict(orient="records")}
+            for code, record in records.items():
+                self._quote_cache.put_quote(code, dict(record))
+            return {code: project_row(r, fields) for code, r in records.items()}
+        else:
+            logger.error(f"Error fetching quote for {', '.join(symbols)}: {data}")
+            raise QuoteError(f"OpenD Error: {data}")
+
+    @coalesce
+    def get_kline(self, symbol: str, ktype: str = "K_DAY", limit: int = 100, autype: AuType = AuType.QFQ,
+                  start: Optional[str] = None, end: Optional[str] = None,
+                  format: str = "records", precision: Optional[int] = None) -> Encoded:
+        """
+        Fetches historical kline data using request_history_kline.
+        Returns the newest `limit` bars, optionally within start/end ("YYYY-MM-DD").
+        Ranges and limits beyond one page are fetched page by page.
+        format="columns" returns column name -> array instead of row dicts.
+
+        With the kline store enabled, bars are served from disk and only the
+        range after the last stored bar is requested.
+        """
+        return encode_frame(self._kline_frame(symbol, ktype, limit, autype, start, end), format, precision)
+
+    def _kline_frame(self, symbol: str, ktype: str = "K_DAY", limit: int = 100, autype: AuType = AuType.QFQ,
+                     start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """get_kline before encoding: the newest `limit` bars as a DataFrame."""
+        self.connect()
+        if not self._quote_ctx:
+             raise OpenDConnectionError("Quote context is null")
+        
         symbol = normalize_symbol(symbol)
 
-        # 1. Subscribe to QUOTE data
-        ret, err = self._quote_ctx.subscribe([symbol], [SubType.QUOTE], subscribe_push=False)
-        if ret != RET_OK:
-            raise QuoteError(f"Subscription failed for {symbol}: {err}")
+        if self._kline_store is not None:
+            return self._stored_kline(symbol, ktype, limit, autype, start, end)
+        if start or end:
+            pages = self.iter_kline_pages(symbol, ktype, start or _lookback_start(ktype, limit), end, autype)
+            return _tail(pages, limit)
+        if limit > KLINE_PAGE_SIZE:
+            return self._kline_tail(symbol, ktype, limit, autype)
+        data, _ = self._fetch_kline(symbol, ktype, autype, max_count=limit)
+        return data
+
+    def _kline_tail(self, symbol: str, ktype: str, limit: int, autype: AuType) -> pd.DataFrame:
+        """
+        The newest `limit` bars in close to ceil(limit / page) requests. The newest page
+        comes first; older bars are then requested from a start date sized by the bars
+        per trading day seen in that page, rather than by a worst-case lookback.
+        """
+        newest, _ = self._fetch_kline(symbol, ktype, autype, max_count=KLINE_PAGE_SIZE)
+        if len(newest) < KLINE_PAGE_SIZE:
+            return newest  # the listing's whole history fits in one page
+        days = newest["time_key"].astype(str).str[:10]
+        # Full days only: the oldest day of the newest page is usually cut off
+        full = days[days != days.iloc[0]]
+        weekdays = np.busday_count(full.iloc[0], date.fromisoformat(days.iloc[-1]) + timedelta(days=1)) if len(full) else 0
+        per_day = len(full) / weekdays if weekdays else BARS_PER_DAY.get(str(ktype), 1)
+
+        frames, have = [newest], len(newest)
+        while have < limit:
+            first = str(frames[0]["time_key"].iloc[0])
+            head = date.fromisoformat(first[:10])
+            start = np.busday_offset(head, -math.ceil((limit - have) / per_day), roll="backward")
+            # The range ends on the head day, whose earlier bars the newest page may lack
+            pages = list(self.iter_kline_pages(symbol, ktype, str(start), head.isoformat(), autype))
+            older = pd.concat(pages, ignore_index=True)
+            older = older[older["time_key"].astype(str) < first] if len(older) else older
+            if older.empty:
+                break  # nothing before the head: the listing's whole history is loaded
+            frames.insert(0, older)
+            have += len(older)
+        data = pd.concat(frames, ignore_index=True)
+        return data.tail(limit).reset_index(drop=True)
+
+    def get_kline_frames(self, symbols: List[str], ktype: str = "K_DAY", limit: int = 100,
+                         autype: AuType = AuType.QFQ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """
+        Klines for many symbols, fetched by chunks in parallel (through the kline
+        store when enabled). Returns (frames by symbol, errors by symbol).
+        """
+        def fetch(chunk: List[str]) -> Dict[str, Any]:
+            out: Dict[str, Any] = {}
+            for s in chunk:
+                try:
+                    out[s] = self._kline_frame(s, ktype, limit, autype)
+                except Exception as e:
+                    out[s] = e
+            return out
+
+        normalized = [normalize_symbol(s) for s in symbols]
+        chunk_size = max(1, math.ceil(len(set(normalized)) / self._chunked.max_workers))
+        results, failures = self._chunked.fetch(normalized, fetch, min(chunk_size, KLINE_SCAN_CHUNK))
+        frames = {s: v for s, v in results.items() if isinstance(v, pd.DataFrame)}
+        errors = {s: str(v) for s, v in results.items() if not isinstance(v, pd.DataFrame)}
+        for f in failures:
+            errors.update({s: f.error for s in f.symbols})
+        return frames, errors
 
-        # 2. Get stock quote
-        ret, data = self._quote_ctx.get_stock_quote([symbol])
+    def get_plate_stock(self, plate_code: str) -> List[str]:
+        """Constituent codes of a plate/index (e.g. "HK.800000")."""
+        self.connect()
+        if not self._quote_ctx:
+             raise OpenDConnectionError("Quote context is null")
+
+        self._scheduler.acquire("plate_stock")
+        ret, data = self._quote_ctx.get_plate_stock(plate_code)
         if ret == RET_OK:
-            return data.to_dict(orient="records")[0]
+            return data["code"].tolist()
         else:
-            logger.error(f"Error fetching quote for {symbol}: {data}")
+            logger.error(f"Error fetching plate {plate_code}: {data}")
             raise QuoteError(f"OpenD Error: {data}")
 
-    def get_kline(self, symbol: str, ktype: str = "K_DAY", limit: int = 100) -> List[Dict[str, Any]]:
+    def iter_kline_pages(self, symbol: str, ktype: str = "K_DAY", start: Optional[str] = None,
+                         end: Optional[str] = None, autype: AuType = AuType.QFQ, page_size: int = KLINE_PAGE_SIZE,
+                         progress: Optional[Callable[[int, int], None]] = None) -> Iterator[pd.DataFrame]:
         """
-        Fetches historical kline data using request_history_kline.
+        Streams the bars between start and end (default: today) page by page, oldest first,
+        following request_history_kline's page_req_key. Only the current page is held;
+        `progress(pages, bars)` is called after each one.
         """
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
-        
+
         symbol = normalize_symbol(symbol)
+        end = end or date.today().isoformat()
+        page_key = None
+        pages = bars = 0
+        while True:
+            data, page_key = self._fetch_kline(symbol, ktype, autype, start, end, page_size, page_key)
+            pages += 1
+            bars += len(data)
+            logger.debug(f"Kline {symbol} {ktype} {start}..{end}: page {pages}, {bars} bars")
+            if progress:
+                progress(pages, bars)
+            yield data
+            if page_key is None:
+                break
+
+    def backfill_kline(self, symbol: str, ktype: str = "K_DAY", start: Optional[str] = None, end: Optional[str] = None,
+                       autype: AuType = AuType.QFQ, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Streams the history between start and end into the kline store without
+        materialising it; returns a summary of what was fetched and stored.
+        """
+        if self._kline_store is None:
+            raise ValueError("Kline store is disabled; set KLINE_STORE_DIR to backfill history")
+        symbol = normalize_symbol(symbol)
+        key = (symbol, str(ktype), str(autype))
+        start = start or _lookback_start(ktype, KLINE_PAGE_SIZE)
+        meta = self._kline_store.meta(key)
+        if meta:
+            # Widen the range to touch the stored series so it stays free of holes
+            start = min(start, meta["last_time"][:10])
+            if end and end < meta["first_time"][:10]:
+                end = meta["first_time"][:10]
+        counts = {"pages": 0, "bars": 0}
+
+        def report(pages: int, bars: int):
+            counts.update(pages=pages, bars=bars)
+            logger.info(f"Backfill {symbol} {ktype}: page {pages}, {bars} bars")
+            if progress:
+                progress(pages, bars)
+
+        t0 = time.perf_counter()
+        pages = self.iter_kline_pages(symbol, ktype, start, end, autype, progress=report)
+        self._kline_store.merge_pages(key, pages, covered_from=start, fresh=end is None)
+        meta = self._kline_store.meta(key) or {}
+        return {
+            "symbol": symbol,
+            "ktype": str(ktype),
+            "start": start,
+            "end": end or date.today().isoformat(),
+            **counts,
+            "stored_rows": meta.get("rows", 0),
+            "first_time": meta.get("first_time"),
+            "last_time": meta.get("last_time"),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+
+    def _fetch_kline(self, symbol: str, ktype: str, autype: AuType, start: Optional[str] = None,
+                     end: Optional[str] = None, max_count: int = KLINE_PAGE_SIZE, page_req_key: Any = None):
+        """
+        One request_history_kline page; returns (DataFrame, next page_req_key).
+        History needs no KLine subscription, so a universe scan or backfill never
+        touches the subscription quota (only the history_kline rate limit).
+        """
+        self._scheduler.acquire("history_kline")
+        ret, data, page_key = self._quote_ctx.request_history_kline(
+            symbol, start=start, end=end, ktype=ktype, autype=autype,
+            max_count=max_count, page_req_key=page_req_key,
+        )
 
-        # 1. Subscribe (ensure we have rights/data)
-        ret, err = self._quote_ctx.subscribe([symbol], [ktype], subscribe_push=False)
-        if ret != RET_OK:
-            raise QuoteError(f"Subscription failed for {symbol} {ktype}: {err}")
-            
-        # 2. Get data using request_history_kline
-        ret, data, _ = self._quote_ctx.request_history_kline(symbol, ktype=ktype, max_count=limit)
-        
-        # 3. Unsubscribe
-        self._quote_ctx.unsubscribe([symbol], [ktype])
-        
         if ret == RET_OK:
-             return data.to_dict(orient="records")
+             return data, page_key
         else:
              logger.error(f"Error fetching kline for {symbol}: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
-    def get_positions(self, market: str = "HK") -> List[Dict[str, Any]]:
+    def _stored_kline(self, symbol: str, ktype: str, limit: int, autype: AuType,
+                      start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """Serves get_kline from the on-disk store, fetching only the ranges it lacks."""
+        store = self._kline_store
+        key = (symbol, str(ktype), str(autype))
+        meta = store.meta(key)
+
+        if start and not store.covers(key, start):
+            # Older history requested: stream it in up to the stored head (or today when cold)
+            head = meta["first_time"][:10] if meta else None
+            pages = self.iter_kline_pages(symbol, ktype, start, head, autype)
+            store.merge_pages(key, pages, covered_from=start, fresh=meta is None)
+        elif not start and (meta is None or (meta["rows"] < limit and not meta["exhausted"])):
+            if limit <= KLINE_PAGE_SIZE:
+                # Cold (or too short): one full request, as without the store
+                data, _ = self._fetch_kline(symbol, ktype, autype, max_count=limit)
+                store.merge(key, data, exhausted=len(data) < limit)
+            else:
+                lookback = _lookback_start(ktype, limit)
+                pages = self.iter_kline_pages(symbol, ktype, lookback, None, autype)
+                store.merge_pages(key, pages, covered_from=lookback, fresh=True)
+                # The lookback overshoots, so a shorter series is the listing's whole history
+                if store.length(key) < limit:
+                    store.merge(key, None, exhausted=True, fresh=False)
+
+        meta = store.meta(key)
+        if meta and not store.is_fresh(key):
+            # Warm: request only from the last stored bar's day (it may still be forming)
+            pages = self.iter_kline_pages(symbol, ktype, meta["last_time"][:10], None, autype)
+            store.merge_pages(key, pages, fresh=True)
+
+        data = store.read(key, limit, start, end)
+        return pd.DataFrame() if data is None else data
+
+    def get_positions(self, market: str = "HK", fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Fetches current stock positions.
+        Fetches current stock positions, limited to `fields` (column names or presets) if given.
+        With the account cache enabled, served from memory until a push invalidates it.
         """
         self.connect()
         if not self._trade_ctx:
             raise OpenDConnectionError("Trade context is null")
-            
+
+        fields = resolve_fields(fields)
+        if self._account_push:
+            return [project_row(r, fields) for r in self._account_section("positions", self._load_positions)]
+        return project_frame(self._query_positions(), fields).to_dict(orient="records")
+
+    def _load_positions(self) -> List[Dict[str, Any]]:
+        return self._query_positions().to_dict(orient="records")
+
+    def _query_positions(self):
         trd_env = self._get_trd_env()
         # Note: position_list_query(code='', pl_ratio_min=None, pl_ratio_max=None, trd_env=TrdEnv.REAL, acc_id=0, acc_index=0, refresh_cache=False)
         ret, data = self._trade_ctx.position_list_query(trd_env=trd_env)
         
         if ret == RET_OK:
-            return data.to_dict(orient="records")
+            return data
         else:
             logger.error(f"Error fetching positions: {data}")
             raise QuoteError(f"OpenD Error: {data}")
 
-    def get_balance(self, market: str = "HK") -> Dict[str, Any]:
+    def get_balance(self, market: str = "HK", fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Fetches account balance details.
+        Fetches account balance details, limited to `fields` (column names or presets) if given.
         """
         self.connect()
         if not self._trade_ctx:
             raise OpenDConnectionError("Trade context is null")
-            
-        trd_env = self._get_trd_env()
-        # Note: accinfo_query(trd_env=TrdEnv.REAL, acc_id=0, acc_index=0, refresh_cache=False)
-        trd_env = self._get_trd_env()
-        # Note: accinfo_query(trd_env=TrdEnv.REAL, acc_id=0, acc_index=0, refresh_cache=False)
-        ret, data = self._trade_ctx.accinfo_query(trd_env=trd_env)
-        
-        if ret == RET_OK:
-            return data.to_dict(orient="records")[0]
-        else:
-            logger.error(f"Error fetching balance: {data}")
-            raise QuoteError(f"OpenD Error: {data}")
 
-    def get_orders(self, symbol: str = "", status_filter: List[Any] = None) -> List[Dict[str, Any]]:
+        return project_row(self._account_section("funds", self._load_funds), resolve_fields(fields))
+
+    def get_orders(self, symbol: str = "", status_filter: List[Any] = None,
+                   format: str = "records", precision: Optional[int] = None) -> Encoded:
         """
         Fetches orders.
+        With the account cache enabled, orders are answered from the local order
+        store (symbol/status index lookups), kept current by order pushes.
         """
         self.connect()
         if not self._trade_ctx:
             raise OpenDConnectionError("Trade context is null")
-            
+
+        if self._account_push:
+            self._sync_orders()
+            rows = self._orders.query(normalize_symbol(symbol) if symbol else "", status_filter or [])
+            return encode_records(rows, format, precision)
+
+        data = self._query_orders(symbol, status_filter)
+        records = data.to_dict(orient="records")
+        # Terminal states seen here let cancel/modify skip doomed requests
+        self._orders.upsert(records)
+        return records if format != "columns" else encode_frame(data, format, precision)
+
+    def _sync_orders(self):
+        """Full order_list_query load when the store is empty or older than the reconcile interval."""
+        if self._orders.age() <= config.account_reconcile_seconds:
+            return
+        since = self._orders.begin_load()
+        self._orders.load(self._query_orders().to_dict(orient="records"), since)
+
+    def _check_order_open(self, order_id: str, action: str):
+        status = self._orders.terminal_status(order_id)
+        if status is not None:
+            logger.warning(f"Refusing to {action} order {order_id}: already {status}")
+            raise OrderStateError(f"Order {order_id} is already {status}; {action} not sent to OpenD")
+
+    def _query_orders(self, symbol: str = "", status_filter: List[Any] = None):
         trd_env = self._get_trd_env()
         
         # Determine status filter (default to all if None)
@@ -385,37 +1054,67 @@ class MoomooClient:
         )
         
         if ret == RET_OK:
-            return data.to_dict(orient="records")
+            return data
         else:
             logger.error(f"Error fetching orders: {data}")
             raise QuoteError(f"OpenD Error: {data}")
 
-    def get_option_chain(self, symbol: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    @coalesce
+    def get_option_chain(self, symbol: str, start_date: str, end_date: str,
+                         format: str = "records", precision: Optional[int] = None) -> Encoded:
         """
         Fetches option chain.
+        Chains are reused for OPTION_CHAIN_TTL seconds per (underlying, expiry range).
         """
+        return encode_frame(self._option_chain_frame(symbol, start_date, end_date), format, precision)
+
+    def _option_chain_frame(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        # If symbol is the underlying stock, this returns options FOR that stock.
+        symbol = normalize_symbol(symbol)
+        key = (symbol, start_date or "", end_date or "")
+        chain = self._option_chains.get(key)
+        if chain is not None:
+            return chain
+
         self.connect()
         if not self._quote_ctx:
              raise OpenDConnectionError("Quote context is null")
-             
-        # Normalize symbol (for options, usually underlying is needed, but API takes 'code')
-        # If symbol is the underlying stock, this returns options FOR that stock.
-        symbol = normalize_symbol(symbol)
-        
-        # request_history_kline is NOT for option chains.
-        # Use get_option_chain
-        
-        # Note: get_option_chain(code, begin_time, end_time, data_filter=None) -> actually (code, index_option_type, start, end, ...)
-        # We must use kwargs to avoid passing date to index_option_type
-        # Assuming index_option_type defaults to something valid or is ignored for stocks if skipped
+
+        # get_option_chain(code, index_option_type, start, end, ...): pass dates by keyword
+        # so they do not land in index_option_type
+        self._scheduler.acquire("option_chain")
         ret, data = self._quote_ctx.get_option_chain(symbol, start=start_date, end=end_date)
-        
+
         if ret == RET_OK:
-             return data.to_dict(orient="records")
+             self._option_chains.put(key, data)
+             return data
         else:
              logger.error(f"Error fetching option chain: {data}")
              raise QuoteError(f"OpenD Error: {data}")
 
+    def get_option_chain_quotes(self, symbol: str, start_date: str, end_date: str,
+                                option_type: Optional[str] = None,
+                                fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Option chain of `symbol` with snapshot rows of the underlying and every contract.
+        All codes go out as one chunked snapshot (400 codes per request, chunks in
+        parallel) instead of one request per contract; failed chunks are reported.
+        `option_type` ("CALL"/"PUT") filters the chain before quoting.
+        """
+        symbol = normalize_symbol(symbol)
+        chain = self._option_chain_frame(symbol, start_date, end_date)
+        if option_type and not chain.empty:
+            chain = chain[chain["option_type"].astype(str).str.upper() == option_type.upper()]
+        codes = [symbol] + (chain["code"].tolist() if not chain.empty else [])
+        rows, failures = self._snapshot_rows(codes, None, resolve_fields(fields))
+        return {
+            "chain": chain.reset_index(drop=True),
+            "underlying": rows.get(symbol),
+            "quotes": rows,
+            "failures": failures,
+            "chunks": math.ceil(len(set(codes)) / SNAPSHOT_MAX_CODES),
+        }
+
     def place_order(self, symbol: str, quantity: int, price: float, side: TrdSide, order_type: OrderType = OrderType.NORMAL) -> Dict[str, Any]:
         """
         Places an order after passing risk checks.
@@ -441,30 +1140,199 @@ class MoomooClient:
                 logger.warning(f"Could not fetch quote for market order risk check: {e}")
         
         RiskManager.check_order(symbol, quantity, check_price)
+        token = self._risk_check(symbol, side, quantity, check_price)
 
         # 2. Place Order
+        return self._submit_order(symbol, quantity, price, side, order_type, token)
+
+    def _risk_check(self, symbol: str, side: TrdSide, quantity: int, price: float) -> Optional[int]:
+        """
+        Stateful limits (no-op unless one is configured); returns a reservation token.
+        Reconciles run on a background thread; only the first order waits for the initial seed.
+        """
+        if not self._risk.enabled:
+            return None
+        self._start_risk_reconcile()
+        if not self._risk_seeded.wait(RISK_SEED_TIMEOUT):
+            logger.warning("Risk engine not seeded yet; checking against event state only")
+        return self._risk.check(symbol, side, quantity, price)
+
+    def _start_risk_reconcile(self):
+        """
+        Starts the thread re-seeding the risk engine every ACCOUNT_RECONCILE_SECONDS (once).
+        Between reseeds the engine follows order and deal pushes, with or without account push.
+        """
+        if self._risk_reconciler is not None:
+            return
+        with self._connect_lock:
+            if self._risk_reconciler is not None:
+                return
+            self.enable_risk_push()
+            stop = self._risk_stop = threading.Event()
+
+            def run():
+                while not stop.is_set():
+                    try:
+                        self._seed_risk()
+                        self._risk_seeded.set()
+                    except Exception as e:
+                        logger.warning(f"Risk reconcile failed: {e}")
+                    stop.wait(config.account_reconcile_seconds)
+
+            self._risk_reconciler = threading.Thread(target=run, name="opend-risk-reconcile", daemon=True)
+            self._risk_reconciler.start()
+
+    def _stop_risk_reconcile(self):
+        if self._risk_reconciler is not None:
+            self._risk_stop.set()
+            self._risk_reconciler = None
+        self._risk_seeded.clear()
+
+    def _seed_risk(self):
+        """Loads positions and open orders into the risk engine (from the caches in push mode)."""
+        since = self._risk.begin_seed()
+        if self._account_push:
+            positions = self._account_section("positions", self._load_positions)
+            self._sync_orders()
+            open_orders = self._orders.query(statuses=OPEN_STATUSES)
+        else:
+            positions = self._load_positions()
+            open_orders = self._query_orders(status_filter=list(OPEN_STATUSES)).to_dict(orient="records")
+        self._risk.seed(positions, open_orders, since)
+
+    def risk_stats(self) -> Dict[str, Any]:
+        return self._risk.stats()
+
+    def _submit_order(self, symbol: str, quantity: int, price: float, side: TrdSide, order_type: OrderType,
+                      risk_token: Optional[int] = None) -> Dict[str, Any]:
+        """Sends one risk-checked order to OpenD under the place_order rate limit."""
         trd_env = self._get_trd_env()
         logger.info(f"Placing order: {side} {quantity} {symbol} @ {price} (Type: {order_type})")
         
-        ret, data = self._trade_ctx.place_order(
-            price=price,
-            qty=quantity,
-            code=symbol,
-            trd_side=side,
-            trd_env=trd_env,
-            order_type=order_type, 
-        )
+        try:
+            self._scheduler.acquire("place_order", Priority.TRADING)
+            ret, data = self._trade_ctx.place_order(
+                price=price,
+                qty=quantity,
+                code=symbol,
+                trd_side=side,
+                trd_env=trd_env,
+                order_type=order_type, 
+            )
+        except Exception:
+            self._risk.release(risk_token)
+            raise
 
         if ret == RET_OK:
-            return data.to_dict(orient="records")[0]
+            # Read-your-writes: don't wait for the push to drop the pre-order state
+            order = data.to_dict(orient="records")[0]
+            self._orders.upsert([order])
+            self._risk.confirm(risk_token, order)
+            self._account.invalidate("funds", "positions")
+            return order
         else:
+            self._risk.release(risk_token)
             logger.error(f"Order failed: {data}")
             raise QuoteError(f"Order Placement Error: {data}")
 
+    def place_basket(self, legs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Places a list of orders as one basket.
+        Market legs are priced from a single batched snapshot, the whole basket
+        is risk-checked in one vectorized pass, and the passing legs are
+        submitted concurrently (still under the place_order rate limit).
+        Each leg: {"symbol", "quantity", "side": "BUY"|"SELL", "price"?, "order_type"?: "LIMIT"|"MARKET"}.
+        """
+        t0 = time.perf_counter()
+        self.connect()
+        if not self._trade_ctx:
+             raise OpenDConnectionError("Trade context is null")
+
+        orders = []
+        for leg in legs:
+            side = str(leg.get("side", "")).upper()
+            if side not in ("BUY", "SELL"):
+                raise ValueError(f"Invalid side: {leg.get('side')}. Allowed: ['BUY', 'SELL']")
+            market = str(leg.get("order_type", "LIMIT")).upper() == "MARKET"
+            orders.append({
+                "symbol": normalize_symbol(leg["symbol"]),
+                "quantity": leg.get("quantity", 0),
+                "price": float(leg.get("price") or 0.0),
+                "side": TrdSide.BUY if side == "BUY" else TrdSide.SELL,
+                "order_type": OrderType.MARKET if market else OrderType.NORMAL,
+            })
+
+        # 1. One snapshot request prices every market leg
+        check_prices = [o["price"] for o in orders]
+        unpriced = [o["symbol"] for o in orders if o["order_type"] == OrderType.MARKET]
+        if unpriced:
+            rows, failures = self._snapshot_rows(unpriced, fields=["code", "last_price"])
+            if failures:
+                logger.warning(f"Basket pricing: {failures[0].error}")
+            for i, o in enumerate(orders):
+                if o["order_type"] == OrderType.MARKET:
+                    check_prices[i] = float(rows.get(o["symbol"], {}).get("last_price") or 0.0)
+
+        # 2. Risk: per-leg rejects, whole-basket reject on the gross limit
+        reasons = RiskManager.check_basket(
+            [o["symbol"] for o in orders], [o["quantity"] for o in orders], check_prices
+        )
+
+        # Stateful limits leg by leg, so each leg sees the exposure reserved by the ones before it
+        tokens: Dict[int, Optional[int]] = {}
+        for i, o in enumerate(orders):
+            if reasons[i] is None:
+                try:
+                    tokens[i] = self._risk_check(o["symbol"], o["side"], o["quantity"], check_prices[i])
+                except RiskError as e:
+                    reasons[i] = str(e)
+
+        # 3. Concurrent submission of the legs that passed
+        futures = {
+            i: self._order_pool.submit(
+                contextvars.copy_context().run, self._submit_order,
+                o["symbol"], o["quantity"], o["price"], o["side"], o["order_type"], tokens[i],
+            )
+            for i, o in enumerate(orders) if reasons[i] is None
+        }
+        results = []
+        for i, o in enumerate(orders):
+            result = {
+                "index": i, "symbol": o["symbol"], "side": legs[i].get("side"),
+                "quantity": o["quantity"], "price": o["price"], "check_price": check_prices[i],
+            }
+            if reasons[i] is not None:
+                result.update(status="rejected", error=reasons[i])
+            else:
+                try:
+                    order = futures[i].result()
+                    result.update(status="placed", order_id=order.get("order_id"), order=order)
+                except Exception as e:
+                    result.update(status="failed", error=str(e))
+            results.append(result)
+
+        placed = [r for r in results if r["status"] == "placed"]
+        return {
+            "legs": results,
+            "placed": len(placed),
+            "rejected": sum(r["status"] == "rejected" for r in results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "gross_value": round(sum(r["quantity"] * r["check_price"] for r in placed), 2),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+
     def close(self):
         if self._quote_ctx:
             try:
                 self._quote_ctx.unsubscribe_all()
+                self._subscriptions.reset()
+                self._quote_cache.clear()
+                self._order_books.clear()
+                self._account.clear()
+                self._orders.clear()
+                self._stop_risk_reconcile()
+                self._risk.clear()
+                self._option_chains.clear()
             except Exception as e:
                 logger.warning(f"Error unsubscribing all: {e}")
             self._quote_ctx.close()
@@ -10,6 +10,10 @@ class QuoteError(MooMcpError):
     """Raised when fetching a quote fails."""
     pass
 
+class OrderStateError(MooMcpError):
+    """Raised when an order request is rejected locally (e.g. the order is already filled or cancelled)."""
+    pass
+
 def map_futu_error(err: Exception) -> MooMcpError:
     """Map futu-api exceptions to our local error types."""
     return MooMcpError(str(err))
@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import pandas as pd
+
+# Chains kept at once (one per underlying and expiry range)
+MAX_CHAINS = 256
+
+ChainKey = Tuple[str, str, str]
+
+class OptionChainCache:
+    """
+    Option chain frames keyed by (underlying, start, end), served from memory
+    until they are `ttl` seconds old. Contract lists only change when series
+    are listed or expire, so repeated analysis of one chain costs no
+    get_option_chain request (which OpenD limits to 10 per 30 s).
+    """
+
+    def __init__(self, ttl: float = 300.0, max_chains: int = MAX_CHAINS):
+        self.ttl = ttl
+        self.max_chains = max_chains
+        self._chains: "OrderedDict[ChainKey, Tuple[pd.DataFrame, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: ChainKey) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._chains.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                self._counters["misses"] += 1
+                return None
+            self._chains.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[0].copy()
+
+    def put(self, key: ChainKey, chain: pd.DataFrame):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._chains[key] = (chain.copy(), time.monotonic())
+            self._chains.move_to_end(key)
+            while len(self._chains) > self.max_chains:
+                self._chains.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"chains": len(self._chains), "ttl_s": self.ttl, **self._counters}
+
+    def clear(self):
+        with self._lock:
+            self._chains.clear()
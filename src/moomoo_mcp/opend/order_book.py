@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from futu import RET_OK, RET_ERROR, OrderBookHandlerBase
+
+logger = logging.getLogger(__name__)
+
+# SF-level accounts get up to 40 levels per side; LV2 gets 10
+MAX_LEVELS = 40
+
+def _volume(v: float):
+    # Whole-share volumes come back as int, like the pulled book
+    return int(v) if float(v).is_integer() else float(v)
+
+class LocalOrderBook:
+    """
+    L2 book for one symbol held in preallocated price/volume/count arrays.
+
+    OpenD pushes the full top-of-book on every change, so apply() overwrites
+    the arrays in place instead of building new containers per update.
+    """
+
+    def __init__(self, symbol: str, capacity: int = MAX_LEVELS):
+        self.symbol = symbol
+        self.capacity = capacity
+        self.bid_px = np.zeros(capacity, dtype=np.float64)
+        self.bid_vol = np.zeros(capacity, dtype=np.float64)
+        self.bid_cnt = np.zeros(capacity, dtype=np.int64)
+        self.ask_px = np.zeros(capacity, dtype=np.float64)
+        self.ask_vol = np.zeros(capacity, dtype=np.float64)
+        self.ask_cnt = np.zeros(capacity, dtype=np.int64)
+        self.n_bid = 0
+        self.n_ask = 0
+        self.seq = 0
+        self.svr_recv_time_bid = ""
+        self.svr_recv_time_ask = ""
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def apply(self, book: Dict[str, Any]):
+        """Writes a futu order book dict ({'Bid': [(price, vol, count, ...)], 'Ask': [...]}) in place."""
+        bids = book.get("Bid") or []
+        asks = book.get("Ask") or []
+        with self._lock:
+            self.n_bid = self._fill(bids, self.bid_px, self.bid_vol, self.bid_cnt)
+            self.n_ask = self._fill(asks, self.ask_px, self.ask_vol, self.ask_cnt)
+            self.svr_recv_time_bid = book.get("svr_recv_time_bid", "")
+            self.svr_recv_time_ask = book.get("svr_recv_time_ask", "")
+            self.seq += 1
+            self.updated_at = time.monotonic()
+
+    def _fill(self, levels: List[Any], px: np.ndarray, vol: np.ndarray, cnt: np.ndarray) -> int:
+        n = min(len(levels), self.capacity)
+        for i in range(n):
+            level = levels[i]
+            px[i] = level[0]
+            vol[i] = level[1]
+            cnt[i] = level[2] if len(level) > 2 else 0
+        return n
+
+    def to_futu(self, num: int = 10) -> Dict[str, Any]:
+        """Same shape as OpenQuoteContext.get_order_book, for existing callers."""
+        with self._lock:
+            nb, na = min(num, self.n_bid), min(num, self.n_ask)
+            return {
+                "code": self.symbol,
+                "svr_recv_time_bid": self.svr_recv_time_bid,
+                "svr_recv_time_ask": self.svr_recv_time_ask,
+                "Bid": [(float(self.bid_px[i]), _volume(self.bid_vol[i]), int(self.bid_cnt[i]), {}) for i in range(nb)],
+                "Ask": [(float(self.ask_px[i]), _volume(self.ask_vol[i]), int(self.ask_cnt[i]), {}) for i in range(na)],
+            }
+
+    def depth(self, levels: int = 5) -> Dict[str, Any]:
+        """Top-N levels, spread, mid and cumulative depth per side."""
+        with self._lock:
+            nb, na = min(levels, self.n_bid), min(levels, self.n_ask)
+            best_bid = float(self.bid_px[0]) if self.n_bid else None
+            best_ask = float(self.ask_px[0]) if self.n_ask else None
+            bid_cum = np.cumsum(self.bid_vol[:nb])
+            ask_cum = np.cumsum(self.ask_vol[:na])
+            result = {
+                "symbol": self.symbol,
+                "seq": self.seq,
+                "best_bid": best_bid,
+                "best_ask": best_ask,
+                "spread": None,
+                "mid": None,
+                "bids": [[float(p), float(v)] for p, v in zip(self.bid_px[:nb], self.bid_vol[:nb])],
+                "asks": [[float(p), float(v)] for p, v in zip(self.ask_px[:na], self.ask_vol[:na])],
+                "bid_cum_volume": bid_cum.tolist(),
+                "ask_cum_volume": ask_cum.tolist(),
+                "svr_recv_time_bid": self.svr_recv_time_bid,
+                "svr_recv_time_ask": self.svr_recv_time_ask,
+            }
+        if best_bid is not None and best_ask is not None:
+            result["spread"] = round(best_ask - best_bid, 6)
+            result["mid"] = round((best_ask + best_bid) / 2, 6)
+        return result
+
+class OrderBookStore:
+    """Local books per symbol, fed by ORDER_BOOK pushes and pulled snapshots."""
+
+    def __init__(self):
+        self._books: Dict[str, LocalOrderBook] = {}
+        self._lock = threading.Lock()
+        self._counters = {"pushes": 0, "local_reads": 0}
+
+    def apply(self, book: Dict[str, Any]) -> LocalOrderBook:
+        symbol = book.get("code")
+        with self._lock:
+            local = self._books.get(symbol)
+            if local is None:
+                local = self._books[symbol] = LocalOrderBook(symbol)
+        local.apply(book)
+        return local
+
+    def on_push(self, book: Dict[str, Any]):
+        self.apply(book)
+        with self._lock:
+            self._counters["pushes"] += 1
+
+    def get(self, symbol: str) -> Optional[LocalOrderBook]:
+        with self._lock:
+            local = self._books.get(symbol)
+            if local is not None and local.seq:
+                self._counters["local_reads"] += 1
+                return local
+            return None
+
+    def discard(self, symbol: str):
+        with self._lock:
+            self._books.pop(symbol, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"books": len(self._books), **self._counters}
+
+    def clear(self):
+        with self._lock:
+            self._books.clear()
+
+class OrderBookPushHandler(OrderBookHandlerBase):
+    """Applies ORDER_BOOK pushes to an OrderBookStore (runs on futu's callback thread)."""
+
+    def __init__(self, store: OrderBookStore):
+        super().__init__()
+        self._store = store
+
+    def on_recv_rsp(self, rsp_pb):
+        ret, data = super().on_recv_rsp(rsp_pb)
+        if ret != RET_OK:
+            logger.warning(f"Order book push error: {data}")
+            return RET_ERROR, data
+        self._store.on_push(data)
+        return RET_OK, data
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Order states that never change again; cancel/modify against them is pointless
+TERMINAL_STATUSES = frozenset({
+    "FILLED_ALL", "CANCELLED_ALL", "CANCELLED_PART", "FAILED", "SUBMIT_FAILED",
+    "DISABLED", "DELETED", "FILL_CANCELLED",
+})
+
+# Order states that can still be cancelled
+OPEN_STATUSES = ("WAITING_SUBMIT", "SUBMITTING", "SUBMITTED", "FILLED_PART")
+
+def status_name(value: Any) -> str:
+    """futu enums (statuses, sides) arrive as plain strings; tolerate enum-like values too."""
+    return str(value).rsplit(".", 1)[-1].upper()
+
+def _missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+class OrderStore:
+    """
+    The day's orders, held in process with hash indexes by order_id, symbol and status.
+
+    Populated by a full order_list_query load and kept current by order pushes
+    and by the responses of our own place/modify/cancel calls. Lookups such
+    as "open orders for HK.00700" touch only the matching entries.
+    """
+
+    def __init__(self):
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._updated: Dict[str, int] = {}  # order_id -> sequence number of its last update
+        self._seq = 0
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._counters = {"loads": 0, "updates": 0, "queries": 0, "rejected_locally": 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def age(self) -> float:
+        """Seconds since the last full load (inf if never loaded)."""
+        return float("inf") if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    def begin_load(self) -> int:
+        """Marks the start of a full load; pass the result to load()."""
+        with self._lock:
+            return self._seq
+
+    def load(self, records: Iterable[Dict[str, Any]], since: Optional[int] = None):
+        """
+        Replaces the store with an order_list_query result. Orders updated by a
+        push after `since` (see begin_load) keep their pushed state.
+        """
+        with self._lock:
+            newer = {oid: self._orders[oid] for oid, seq in self._updated.items()
+                     if since is not None and seq > since and oid in self._orders}
+            self._orders.clear()
+            self._by_symbol.clear()
+            self._by_status.clear()
+            self._updated.clear()
+            for r in records:
+                self._put(dict(r))
+            for order in newer.values():
+                self._put(order)
+            self._loaded_at = time.monotonic()
+            self._counters["loads"] += 1
+
+    def upsert(self, records: Iterable[Dict[str, Any]]):
+        """Applies order updates (pushes or our own responses); missing fields keep their old values."""
+        with self._lock:
+            for r in records:
+                oid = r.get("order_id")
+                if _missing(oid):
+                    continue
+                oid = str(oid)
+                update = {k: v for k, v in r.items() if not _missing(v)}
+                old = self._orders.get(oid)
+                self._put({**old, **update} if old else update)
+                self._seq += 1
+                self._updated[oid] = self._seq
+                self._counters["updates"] += 1
+
+    def _put(self, order: Dict[str, Any]):
+        oid = str(order["order_id"])
+        order["order_id"] = oid
+        old = self._orders.get(oid)
+        if old is not None:
+            self._unindex(oid, old)
+        self._orders[oid] = order
+        self._by_symbol.setdefault(order.get("code", ""), set()).add(oid)
+        self._by_status.setdefault(status_name(order.get("order_status", "")), set()).add(oid)
+
+    def _unindex(self, oid: str, order: Dict[str, Any]):
+        for index, key in ((self._by_symbol, order.get("code", "")), (self._by_status, status_name(order.get("order_status", "")))):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(oid)
+                if not ids:
+                    del index[key]
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self._orders.get(str(order_id))
+            return dict(order) if order is not None else None
+
+    def query(self, symbol: str = "", statuses: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        """Orders matching symbol and any of `statuses` (empty = all), in creation order."""
+        wanted = {status_name(s) for s in statuses}
+        with self._lock:
+            self._counters["queries"] += 1
+            candidates: Optional[Set[str]] = None
+            if symbol:
+                candidates = set(self._by_symbol.get(symbol, ()))
+            if wanted:
+                by_status = set().union(*(self._by_status.get(s, set()) for s in wanted))
+                candidates = by_status if candidates is None else candidates & by_status
+            if candidates is None:
+                rows = list(self._orders.values())
+            else:
+                rows = [self._orders[oid] for oid in candidates]
+            rows = [dict(o) for o in rows]
+        rows.sort(key=lambda o: (str(o.get("create_time", "")), o["order_id"]))
+        return rows
+
+    def terminal_status(self, order_id: str) -> Optional[str]:
+        """The order's status if it is known and terminal, else None."""
+        with self._lock:
+            order = self._orders.get(str(order_id))
+            if order is None:
+                return None
+            status = status_name(order.get("order_status", ""))
+            if status in TERMINAL_STATUSES:
+                self._counters["rejected_locally"] += 1
+                return status
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "orders": len(self._orders),
+                "symbols": len(self._by_symbol),
+                "by_status": {s: len(ids) for s, ids in self._by_status.items()},
+                "loaded_age_s": round(self.age(), 1) if self._loaded_at is not None else None,
+                **self._counters,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._orders.clear()
+            self._by_symbol.clear()
+            self._by_status.clear()
+            self._updated.clear()
+            self._loaded_at = None
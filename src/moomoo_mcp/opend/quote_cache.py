@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from futu import RET_OK, RET_ERROR, StockQuoteHandlerBase
+
+logger = logging.getLogger(__name__)
+
+# Quote fields that also appear in get_market_snapshot rows and move with every tick
+LIVE_FIELDS = (
+    "last_price", "open_price", "high_price", "low_price", "prev_close_price",
+    "volume", "turnover", "turnover_rate", "amplitude",
+)
+
+class QuoteCache:
+    """
+    Latest-quote store per symbol, fed by QUOTE pushes and by pulled responses.
+
+    Entries carry the monotonic time they were last refreshed; readers pass a
+    staleness bound and get None when the entry is missing or too old.
+    """
+
+    def __init__(self, max_age: float = 3.0):
+        self.max_age = max_age
+        self._quotes: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._snapshots: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "pushes": 0}
+
+    def get_quote(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        return self._get(self._quotes, symbol, max_age)
+
+    def get_snapshot(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        return self._get(self._snapshots, symbol, max_age)
+
+    def put_quote(self, symbol: str, record: Dict[str, Any]):
+        with self._lock:
+            self._quotes[symbol] = (record, time.monotonic())
+
+    def put_snapshots(self, records: Iterable[Dict[str, Any]]):
+        now = time.monotonic()
+        with self._lock:
+            for r in records:
+                self._snapshots[r["code"]] = (r, now)
+
+    def on_push(self, records: Iterable[Dict[str, Any]]):
+        """Applies pushed quote rows; also refreshes live fields of cached snapshot rows."""
+        now = time.monotonic()
+        with self._lock:
+            for r in records:
+                symbol = r.get("code")
+                if not symbol:
+                    continue
+                self._quotes[symbol] = (r, now)
+                snap = self._snapshots.get(symbol)
+                if snap is not None:
+                    merged = dict(snap[0])
+                    merged.update({k: r[k] for k in LIVE_FIELDS if k in r})
+                    self._snapshots[symbol] = (merged, now)
+                self._counters["pushes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"quotes": len(self._quotes), "snapshots": len(self._snapshots), **self._counters}
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+            self._snapshots.clear()
+
+    def _get(self, store: Dict[str, Tuple[Dict[str, Any], float]], symbol: str, max_age: Optional[float]) -> Optional[Dict[str, Any]]:
+        bound = self.max_age if max_age is None else max_age
+        with self._lock:
+            entry = store.get(symbol)
+            if entry is None or time.monotonic() - entry[1] > bound:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            # Copy so callers cannot mutate the cached row
+            return dict(entry[0])
+
+class QuotePushHandler(StockQuoteHandlerBase):
+    """Feeds QUOTE pushes from OpenD into a QuoteCache (runs on futu's callback thread)."""
+
+    def __init__(self, cache: QuoteCache):
+        super().__init__()
+        self._cache = cache
+
+    def on_recv_rsp(self, rsp_pb):
+        ret, data = super().on_recv_rsp(rsp_pb)
+        if ret != RET_OK:
+            logger.warning(f"Quote push error: {data}")
+            return RET_ERROR, data
+        self._cache.on_push(data.to_dict(orient="records"))
+        return RET_OK, data
@@ -0,0 +1,154 @@
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """Lanes for OpenD requests; lower value is served first."""
+    TRADING = 0
+    INTERACTIVE = 1
+    BULK = 2
+
+# OpenD limits per endpoint class: (requests, seconds)
+DEFAULT_LIMITS: Dict[str, Tuple[int, float]] = {
+    "place_order": (15, 30.0),
+    "modify_order": (20, 30.0),
+    "snapshot": (60, 30.0),
+    "history_kline": (60, 30.0),
+    "option_chain": (10, 30.0),
+    "plate_stock": (10, 30.0),
+}
+
+# Share of the window limit that may be spent as an instant burst. The rest refills
+# evenly, so any window of the limit's length sees at most `requests` calls.
+BURST_FRACTION = 0.25
+
+_current_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar(
+    "opend_request_priority", default=None
+)
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Runs the enclosed OpenD calls in the given lane (e.g. BULK for universe scans)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority(default: Priority = Priority.INTERACTIVE) -> Priority:
+    p = _current_priority.get()
+    return default if p is None else p
+
+class TokenBucket:
+    """Classic token bucket; the scheduler serialises access, so it holds no lock itself."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self._last = time.monotonic()
+
+    @classmethod
+    def for_window(cls, requests: int, period: float, burst_fraction: float = BURST_FRACTION) -> "TokenBucket":
+        capacity = max(1, int(requests * burst_fraction))
+        return cls(capacity, (requests - capacity) / period)
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if one is available now)."""
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+class _Endpoint:
+    def __init__(self, name: str, bucket: TokenBucket):
+        self.name = name
+        self.bucket = bucket
+        self.waiters: List[Tuple[int, int]] = []  # heap of (priority, seq)
+        self.granted = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+class RequestScheduler:
+    """
+    Per-endpoint token buckets with priority lanes.
+
+    acquire() blocks until the endpoint has a token and no higher-priority (or
+    earlier same-priority) request is waiting for it, so bursts are smoothed
+    instead of failing with OpenD's rate-limit error and trading calls are
+    never queued behind analytics pulls.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._endpoints: Dict[str, _Endpoint] = {
+            name: _Endpoint(name, TokenBucket.for_window(n, period))
+            for name, (n, period) in (DEFAULT_LIMITS if limits is None else limits).items()
+        }
+
+    def acquire(self, endpoint: str, priority: Optional[Priority] = None) -> float:
+        """Waits for a token of `endpoint`; returns the seconds spent waiting."""
+        ep = self._endpoints.get(endpoint)
+        if ep is None:
+            return 0.0
+        prio = current_priority() if priority is None else priority
+        entry = (int(prio), next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(ep.waiters, entry)
+            throttled = False
+            while True:
+                now = time.monotonic()
+                ep.bucket.refill(now)
+                if ep.waiters[0] == entry:
+                    delay = ep.bucket.wait_time()
+                    if delay <= 0:
+                        break
+                else:
+                    delay = None  # woken when the head is served
+                throttled = True
+                self._cond.wait(delay)
+            heapq.heappop(ep.waiters)
+            ep.bucket.tokens -= 1
+            waited = time.monotonic() - start
+            ep.granted += 1
+            ep.total_wait += waited
+            ep.max_wait = max(ep.max_wait, waited)
+            if throttled:
+                ep.throttled += 1
+            self._cond.notify_all()
+        if waited > 1.0:
+            logger.info(f"Rate limit: {endpoint} request waited {waited:.2f}s (lane {prio.name})")
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and throttle counts per endpoint class."""
+        with self._cond:
+            now = time.monotonic()
+            out = {}
+            for name, ep in self._endpoints.items():
+                ep.bucket.refill(now)
+                out[name] = {
+                    "queue_depth": len(ep.waiters),
+                    "tokens": round(ep.bucket.tokens, 2),
+                    "capacity": ep.bucket.capacity,
+                    "rate_per_s": round(ep.bucket.rate, 3),
+                    "granted": ep.granted,
+                    "throttled": ep.throttled,
+                    "avg_wait_ms": round(1000 * ep.total_wait / ep.granted, 2) if ep.granted else 0.0,
+                    "max_wait_ms": round(1000 * ep.max_wait, 2),
+                }
+            return out
@@ -0,0 +1,101 @@
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from ..utils.symbols import normalize_symbol
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+def _share(result: Any) -> Any:
+    """Per-caller copy of a shared result so one caller's edits don't leak to another."""
+    if isinstance(result, list):
+        return [dict(r) if isinstance(r, dict) else r for r in result]
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive (a copy of) the same result or error.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _share(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self._counters["calls"]
+            return {
+                **self._counters,
+                "in_flight": len(self._calls),
+                "coalesce_rate": round(self._counters["coalesced"] / calls, 3) if calls else 0.0,
+            }
+
+def _key_part(name: str, value: Any) -> Hashable:
+    if name == "symbol" and isinstance(value, str):
+        return normalize_symbol(value)
+    if name == "symbols" and value is not None:
+        return tuple(normalize_symbol(s) for s in value)
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+def coalesce(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Routes a MoomooClient method through its SingleFlight (self._singleflight).
+    The key is the method name plus its bound arguments, with symbols normalized,
+    so get_kline("00700") and get_kline("HK.00700", limit=100) share one request.
+    """
+    sig = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = sig.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(
+            _key_part(name, value) for name, value in bound.arguments.items() if name != "self"
+        )
+        return self._singleflight.do(key, lambda: method(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from futu import RET_OK
+from .errors import QuoteError
+
+logger = logging.getLogger(__name__)
+
+# OpenD rejects unsubscribing a (symbol, SubType) within a minute of subscribing it.
+MIN_HOLD_SECONDS = 60.0
+
+SubKey = Tuple[str, str]
+
+@dataclass
+class Subscription:
+    symbol: str
+    subtype: str
+    push: bool
+    subscribed_at: float
+    last_used: float
+    refcount: int = 0
+
+class SubscriptionManager:
+    """
+    Central registry of OpenD subscriptions keyed by (symbol, SubType).
+
+    Subscriptions stay open after a request finishes so repeat calls skip the
+    subscribe round-trip. When usage reaches the high watermark of the quota,
+    the least-recently-used idle entries are unsubscribed in one batch.
+    """
+
+    def __init__(
+        self,
+        quote_ctx_getter: Callable[[], Any],
+        quota: int = 100,
+        high_watermark: float = 0.9,
+        evict_batch: int = 0,
+    ):
+        self._get_ctx = quote_ctx_getter
+        self.quota = quota
+        self.high_watermark = high_watermark
+        self.evict_batch = evict_batch or max(1, quota // 10)
+        # Ordered oldest-used first, so LRU candidates are at the front
+        self._subs: "OrderedDict[SubKey, Subscription]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._counters = {"subscribe_calls": 0, "skipped": 0, "evicted": 0, "unsubscribe_calls": 0}
+
+    def acquire(self, symbols: Iterable[str], subtypes: Iterable[Any], subscribe_push: bool = False) -> List[SubKey]:
+        """
+        Ensures every (symbol, subtype) pair is subscribed and pins it.
+        Only the missing pairs are sent to OpenD, one subscribe call per SubType.
+        """
+        keys = [(s, str(t)) for s in symbols for t in subtypes]
+        now = time.time()
+        with self._lock:
+            missing = [k for k in keys if k not in self._subs or (subscribe_push and not self._subs[k].push)]
+            # Pin what already exists so eviction cannot take it while we subscribe the rest
+            present = [k for k in keys if k in self._subs]
+            self._pin(present, now)
+            if missing:
+                self._make_room(len([k for k in missing if k not in self._subs]))
+            else:
+                self._counters["skipped"] += 1
+        if missing:
+            # The round-trip runs outside the lock so cold symbols subscribe concurrently;
+            # a racing duplicate subscribe is harmless to OpenD.
+            try:
+                self._subscribe(missing, subscribe_push, now)
+            except Exception:
+                self.release(present)
+                raise
+            with self._lock:
+                self._pin([k for k in keys if k not in present], now)
+        return keys
+
+    def _pin(self, keys: List[SubKey], now: float):
+        for k in keys:
+            sub = self._subs[k]
+            sub.refcount += 1
+            sub.last_used = now
+            self._subs.move_to_end(k)
+
+    def release(self, keys: Iterable[SubKey]):
+        """Unpins pairs; they stay subscribed but become eligible for eviction."""
+        now = time.time()
+        with self._lock:
+            for k in keys:
+                sub = self._subs.get(k)
+                if sub is not None and sub.refcount > 0:
+                    sub.refcount -= 1
+                    sub.last_used = now
+
+    @contextmanager
+    def hold(self, symbols: Iterable[str], subtypes: Iterable[Any], subscribe_push: bool = False) -> Iterator[List[SubKey]]:
+        """Pins the subscriptions for the duration of a request."""
+        keys = self.acquire(symbols, subtypes, subscribe_push=subscribe_push)
+        try:
+            yield keys
+        finally:
+            self.release(keys)
+
+    def touch(self, symbol: str, subtype: Any):
+        """Marks a pair as recently used without pinning it (e.g. on a cache hit)."""
+        k = (symbol, str(subtype))
+        with self._lock:
+            sub = self._subs.get(k)
+            if sub is not None:
+                sub.last_used = time.time()
+                self._subs.move_to_end(k)
+
+    def is_subscribed(self, symbol: str, subtype: Any, push: bool = False) -> bool:
+        """True if the pair is subscribed (and, with push=True, receiving pushes)."""
+        with self._lock:
+            sub = self._subs.get((symbol, str(subtype)))
+            return sub is not None and (sub.push or not push)
+
+    def capacity(self) -> int:
+        """
+        Pairs that could be newly held right now without exceeding the high watermark:
+        free slots plus idle entries old enough to evict. At least 1, so callers progress.
+        """
+        limit = int(self.quota * self.high_watermark)
+        now = time.time()
+        with self._lock:
+            stuck = sum(1 for sub in self._subs.values()
+                        if sub.refcount > 0 or now - sub.subscribed_at < MIN_HOLD_SECONDS)
+        return max(1, limit - stuck)
+
+    def stats(self) -> Dict[str, Any]:
+        """Quota usage and hit counters."""
+        with self._lock:
+            used = len(self._subs)
+            active = sum(1 for s in self._subs.values() if s.refcount > 0)
+            return {
+                "used": used,
+                "quota": self.quota,
+                "remaining": max(0, self.quota - used),
+                "usage_pct": round(100.0 * used / self.quota, 1) if self.quota else 0.0,
+                "active": active,
+                "idle": used - active,
+                **self._counters,
+            }
+
+    def reset(self):
+        """Forgets all bookkeeping (after unsubscribe_all / disconnect)."""
+        with self._lock:
+            self._subs.clear()
+
+    def _subscribe(self, keys: List[SubKey], subscribe_push: bool, now: float):
+        ctx = self._get_ctx()
+        # One call per SubType, since subscribe() covers the cross product of its lists
+        by_subtype: Dict[str, List[str]] = {}
+        for symbol, subtype in keys:
+            by_subtype.setdefault(subtype, []).append(symbol)
+        for subtype, symbols in by_subtype.items():
+            ret, err = ctx.subscribe(symbols, [subtype], subscribe_push=subscribe_push)
+            with self._lock:
+                self._counters["subscribe_calls"] += 1
+                if ret != RET_OK:
+                    raise QuoteError(f"Subscription failed for {', '.join(symbols)} {subtype}: {err}")
+                for s in symbols:
+                    sub = self._subs.get((s, subtype))
+                    if sub is None:
+                        self._subs[(s, subtype)] = Subscription(s, subtype, subscribe_push, now, now)
+                    else:
+                        sub.push = sub.push or subscribe_push
+
+    def _make_room(self, needed: int):
+        limit = int(self.quota * self.high_watermark)
+        if len(self._subs) + needed <= limit:
+            return
+        now = time.time()
+        target = max(self.evict_batch, len(self._subs) + needed - limit)
+        victims = [
+            k for k, sub in self._subs.items()
+            if sub.refcount == 0 and now - sub.subscribed_at >= MIN_HOLD_SECONDS
+        ][:target]
+        if not victims:
+            logger.warning(f"Subscription quota near limit ({len(self._subs)}/{self.quota}) and nothing is evictable")
+            return
+        self._unsubscribe(victims)
+
+    def _unsubscribe(self, keys: List[SubKey]):
+        ctx = self._get_ctx()
+        by_subtype: Dict[str, List[str]] = {}
+        for symbol, subtype in keys:
+            by_subtype.setdefault(subtype, []).append(symbol)
+        for subtype, symbols in by_subtype.items():
+            ret, err = ctx.unsubscribe(symbols, [subtype])
+            self._counters["unsubscribe_calls"] += 1
+            if ret != RET_OK:
+                logger.warning(f"Evicting {subtype} for {len(symbols)} symbols failed: {err}")
+                continue
+            for s in symbols:
+                self._subs.pop((s, subtype), None)
+                self._counters["evicted"] += 1
+        logger.info(f"Evicted {len(keys)} idle subscriptions ({len(self._subs)}/{self.quota} in use)")
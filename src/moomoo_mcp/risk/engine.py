@@ -0,0 +1,317 @@
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple, Union
+from ..config import config
+from ..opend.order_store import OPEN_STATUSES, status_name
+from .manager import RiskError
+
+logger = logging.getLogger(__name__)
+
+RATE_WINDOW = 60.0  # seconds covered by max_orders_per_minute
+MAX_EVENT_IDS = 10000  # order/deal ids remembered for de-duplication (oldest dropped first)
+
+def side_sign(side: Any) -> int:
+    """+1 for buys (incl. BUY_BACK), -1 for sells (incl. SELL_SHORT)."""
+    return 1 if status_name(side).startswith("BUY") else -1
+
+@dataclass
+class RiskLimits:
+    """Stateful limits; 0 disables a limit."""
+    max_position_value: float = 0.0
+    max_gross_exposure: float = 0.0
+    max_net_exposure: float = 0.0
+    max_daily_turnover: float = 0.0
+    max_orders_per_minute: int = 0
+
+    @classmethod
+    def from_config(cls) -> "RiskLimits":
+        return cls(
+            max_position_value=config.max_position_value,
+            max_gross_exposure=config.max_gross_exposure,
+            max_net_exposure=config.max_net_exposure,
+            max_daily_turnover=config.max_daily_turnover,
+            max_orders_per_minute=config.max_orders_per_minute,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.max_position_value, self.max_gross_exposure, self.max_net_exposure,
+                    self.max_daily_turnover, self.max_orders_per_minute))
+
+def _remember(ids: Dict[Any, None], key: Any):
+    """Adds to an insertion-ordered id set, dropping the oldest ids beyond MAX_EVENT_IDS."""
+    ids.pop(key, None)
+    ids[key] = None
+    while len(ids) > MAX_EVENT_IDS:
+        del ids[next(iter(ids))]
+
+class _Book:
+    """Per-symbol state: held quantity, open order quantity (signed) and last mark price."""
+    __slots__ = ("qty", "open_qty", "mark", "exposure")
+
+    def __init__(self):
+        self.qty = 0.0
+        self.open_qty = 0.0
+        self.mark = 0.0
+        self.exposure = 0.0  # (qty + open_qty) * mark, as last added to the portfolio totals
+
+class RiskEngine:
+    """
+    Pre-trade limits checked against running counters, with no I/O on the order path.
+
+    Positions and open orders are seeded from OpenD, then kept current by order
+    and deal events. Per-symbol exposure is (held + open order quantity) x mark;
+    gross/net portfolio exposure is maintained incrementally as symbols change,
+    so check() is O(1) regardless of how many symbols are held. Turnover counts
+    the value of orders sent today; the order rate is a sliding 60 s window.
+
+    A passing check reserves the order as pending (a token) until confirm()
+    binds it to the real order id or release() drops it, so concurrent orders
+    see each other.
+
+    Seeding follows OrderStore's begin/since protocol: symbols filled and orders
+    updated by an event after begin_seed() keep their event-maintained state, so
+    a snapshot queried before a push cannot roll it back.
+    """
+
+    def __init__(self, limits: Optional[RiskLimits] = None):
+        self.limits = limits or RiskLimits()
+        self._books: Dict[str, _Book] = {}
+        # order_id (or reservation token) -> (symbol, signed open quantity)
+        self._open: Dict[Union[str, int], Tuple[str, float]] = {}
+        self._known: Dict[str, None] = {}  # order ids seen in any order event (insertion-ordered, bounded)
+        self._deal_ids: Dict[Any, None] = {}
+        # Event sequence, and the last sequence that touched each order id / filled symbol
+        self._seq = 0
+        self._order_seq: Dict[str, int] = {}
+        self._fill_seq: Dict[str, int] = {}
+        self._gross = 0.0
+        self._net = 0.0
+        self._turnover = 0.0
+        self._turnover_day = date.today()
+        self._sent: Deque[float] = deque()
+        self._tokens = itertools.count(1)
+        self._seeded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._counters = {"checks": 0, "rejects": 0, "order_events": 0, "deal_events": 0, "seeds": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.limits.enabled
+
+    def age(self) -> float:
+        """Seconds since the last seed (inf if never seeded)."""
+        return float("inf") if self._seeded_at is None else time.monotonic() - self._seeded_at
+
+    def begin_seed(self) -> int:
+        """Marks the start of a position/order query; pass the result to seed()."""
+        with self._lock:
+            return self._seq
+
+    def seed(self, positions: Iterable[Dict[str, Any]], open_orders: Iterable[Dict[str, Any]],
+             since: Optional[int] = None):
+        """
+        Replaces held and open quantities with a fresh position/order query. Reservations
+        survive, as do symbols and orders changed by events after `since` (see begin_seed).
+        """
+        with self._lock:
+            newer = lambda seqs, key: since is not None and seqs.get(key, -1) > since
+            for symbol, book in self._books.items():
+                if not newer(self._fill_seq, symbol):
+                    book.qty = 0.0
+                book.open_qty = 0.0
+            self._open = {k: v for k, v in self._open.items() if isinstance(k, int) or newer(self._order_seq, k)}
+            for symbol, qty in self._open.values():
+                self._book(symbol).open_qty += qty
+            for p in positions:
+                book = self._book(p["code"])
+                if not newer(self._fill_seq, p["code"]):
+                    book.qty = float(p.get("qty") or 0.0)
+                book.mark = float(p.get("nominal_price") or book.mark)
+            for o in open_orders:
+                if not newer(self._order_seq, str(o.get("order_id"))):
+                    self._apply_order(o)
+            self._gross = self._net = 0.0
+            for book in self._books.values():
+                book.exposure = 0.0
+                self._refresh(book)
+            # Older events are in the snapshot now
+            floor = since if since is not None else self._seq
+            self._order_seq = {k: v for k, v in self._order_seq.items() if v > floor}
+            self._fill_seq = {k: v for k, v in self._fill_seq.items() if v > floor}
+            self._seeded_at = time.monotonic()
+            self._counters["seeds"] += 1
+
+    def check(self, symbol: str, side: Any, quantity: float, price: float) -> int:
+        """
+        Validates one order against every enabled limit; raises RiskError on a breach.
+        On success the order is reserved and a token for confirm()/release() is returned.
+        """
+        limits = self.limits
+        signed = side_sign(side) * float(quantity)
+        value = abs(signed) * price
+        now = time.monotonic()
+        with self._lock:
+            self._counters["checks"] += 1
+            book = self._books.get(symbol) or _Book()
+            mark = price or book.mark
+            projected = (book.qty + book.open_qty + signed) * mark
+            gross = self._gross - abs(book.exposure) + abs(projected)
+            net = self._net - book.exposure + projected
+            self._roll_day()
+            while self._sent and now - self._sent[0] > RATE_WINDOW:
+                self._sent.popleft()
+
+            reason = None
+            increases = abs(projected) > abs(book.exposure)  # risk-reducing orders always pass
+            if limits.max_position_value and abs(projected) > limits.max_position_value and increases:
+                reason = f"position value {abs(projected):.2f} in {symbol} exceeds limit {limits.max_position_value:.2f}"
+            elif limits.max_gross_exposure and gross > limits.max_gross_exposure and increases:
+                reason = f"gross exposure {gross:.2f} exceeds limit {limits.max_gross_exposure:.2f}"
+            elif limits.max_net_exposure and abs(net) > limits.max_net_exposure and abs(net) > abs(self._net):
+                reason = f"net exposure {net:.2f} exceeds limit {limits.max_net_exposure:.2f}"
+            elif limits.max_daily_turnover and self._turnover + value > limits.max_daily_turnover:
+                reason = f"daily turnover {self._turnover + value:.2f} exceeds limit {limits.max_daily_turnover:.2f}"
+            elif limits.max_orders_per_minute and len(self._sent) >= limits.max_orders_per_minute:
+                reason = f"order rate limit of {limits.max_orders_per_minute}/min reached"
+            if reason is not None:
+                self._counters["rejects"] += 1
+                msg = f"Risk Reject: {reason}"
+                logger.warning(msg)
+                raise RiskError(msg)
+
+            token = next(self._tokens)
+            book = self._book(symbol)
+            if price:
+                book.mark = price
+            self._set_open(token, symbol, signed)
+            self._turnover += value
+            self._sent.append(now)
+            return token
+
+    def confirm(self, token: Optional[int], order: Dict[str, Any]):
+        """Binds a reservation to the placed order (its pushes then update it by order id)."""
+        if token is None:
+            return
+        with self._lock:
+            reserved = self._open.get(token)
+            if reserved is None:
+                return
+            self._set_open(token, reserved[0], 0.0)
+            # Our own response counts as an event, so a seed queried before it cannot drop the order
+            self._seq += 1
+            self._order_seq[str(order.get("order_id"))] = self._seq
+            if str(order.get("order_id")) not in self._known:
+                self._apply_order({"code": reserved[0], "qty": abs(reserved[1]),
+                                   "trd_side": "BUY" if reserved[1] > 0 else "SELL", **order})
+
+    def release(self, token: Optional[int]):
+        """Drops a reservation whose order was never placed (turnover and rate stay counted)."""
+        if token is None:
+            return
+        with self._lock:
+            reserved = self._open.get(token)
+            if reserved is not None:
+                self._set_open(token, reserved[0], 0.0)
+
+    def on_orders(self, records: Iterable[Dict[str, Any]]):
+        with self._lock:
+            for r in records:
+                self._counters["order_events"] += 1
+                self._seq += 1
+                self._order_seq[str(r.get("order_id"))] = self._seq
+                self._apply_order(r)
+
+    def on_deals(self, records: Iterable[Dict[str, Any]]):
+        """Fills move quantity from open orders into the held position."""
+        with self._lock:
+            for d in records:
+                deal_id = d.get("deal_id")
+                if deal_id is not None:
+                    if deal_id in self._deal_ids:
+                        continue
+                    _remember(self._deal_ids, deal_id)
+                self._counters["deal_events"] += 1
+                self._seq += 1
+                self._fill_seq[d["code"]] = self._seq
+                book = self._book(d["code"])
+                book.qty += side_sign(d.get("trd_side", "")) * float(d.get("qty") or 0.0)
+                book.mark = float(d.get("price") or book.mark)
+                self._refresh(book)
+
+    def _apply_order(self, order: Dict[str, Any]):
+        oid = str(order.get("order_id"))
+        _remember(self._known, oid)
+        if status_name(order.get("order_status", "")) in OPEN_STATUSES:
+            remaining = float(order.get("qty") or 0.0) - float(order.get("dealt_qty") or 0.0)
+            signed = side_sign(order.get("trd_side", "")) * max(remaining, 0.0)
+        else:
+            signed = 0.0
+        symbol = order.get("code") or (self._open.get(oid) or ("",))[0]
+        if not symbol:
+            return
+        book = self._book(symbol)
+        if order.get("price"):
+            book.mark = book.mark or float(order["price"])
+        self._set_open(oid, symbol, signed)
+
+    def _set_open(self, key: Union[str, int], symbol: str, signed: float):
+        old = self._open.pop(key, None)
+        book = self._book(symbol)
+        if old is not None:
+            self._book(old[0]).open_qty -= old[1]
+            if old[0] != symbol:
+                self._refresh(self._books[old[0]])
+        if signed:
+            self._open[key] = (symbol, signed)
+            book.open_qty += signed
+        self._refresh(book)
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        return book
+
+    def _refresh(self, book: _Book):
+        exposure = (book.qty + book.open_qty) * book.mark
+        self._gross += abs(exposure) - abs(book.exposure)
+        self._net += exposure - book.exposure
+        book.exposure = exposure
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._turnover_day:
+            self._turnover_day = today
+            self._turnover = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._roll_day()
+            return {
+                "enabled": self.enabled,
+                "symbols": len(self._books),
+                "open_orders": sum(1 for k in self._open if isinstance(k, str)),
+                "gross_exposure": round(self._gross, 2),
+                "net_exposure": round(self._net, 2),
+                "turnover_today": round(self._turnover, 2),
+                "orders_last_minute": len(self._sent),
+                "seeded_age_s": round(self.age(), 1) if self._seeded_at is not None else None,
+                **self._counters,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._books.clear()
+            self._open.clear()
+            self._known.clear()
+            self._deal_ids.clear()
+            self._order_seq.clear()
+            self._fill_seq.clear()
+            self._gross = self._net = 0.0
+            self._seeded_at = None
@@ -1,4 +1,6 @@
 import logging
+from typing import List, Optional, Sequence
+import numpy as np
 from ..config import config
 
 logger = logging.getLogger(__name__)
@@ -28,3 +30,40 @@ class RiskManager:
             
         logger.info(f"Risk Pass: Order {symbol} {quantity}@{price} ({estimated_value:.2f})")
         return True
+
+    @staticmethod
+    def check_basket(symbols: Sequence[str], quantities: Sequence[float], prices: Sequence[float]) -> List[Optional[str]]:
+        """
+        Validates a whole basket in one pass.
+        Returns a reject reason per leg (None = pass); raises RiskError if the
+        gross value of the passing legs exceeds max_basket_value.
+        """
+        qty = np.asarray(quantities, dtype=float)
+        px = np.asarray(prices, dtype=float)
+        values = qty * px
+        reasons: List[Optional[str]] = [None] * len(qty)
+
+        bad_qty = ~(qty > 0)
+        unpriced = ~bad_qty & ~(px > 0)
+        too_big = ~bad_qty & ~unpriced & (values > config.max_order_value)
+        for i in np.flatnonzero(bad_qty):
+            reasons[i] = f"Risk Reject: quantity {quantities[i]} must be positive"
+        for i in np.flatnonzero(unpriced):
+            reasons[i] = "Risk Reject: no price available to value the order"
+        for i in np.flatnonzero(too_big):
+            reasons[i] = (f"Risk Reject: Order value {values[i]:.2f} exceeds limit "
+                          f"{config.max_order_value:.2f} for {symbols[i]}")
+
+        passed = ~(bad_qty | unpriced | too_big)
+        gross = float(values[passed].sum())
+        if gross > config.max_basket_value:
+            msg = (f"Risk Reject: Basket gross value {gross:.2f} exceeds limit "
+                   f"{config.max_basket_value:.2f}")
+            logger.warning(msg)
+            raise RiskError(msg)
+
+        rejected = len(qty) - int(passed.sum())
+        if rejected:
+            logger.warning(f"Risk: {rejected}/{len(qty)} basket legs rejected")
+        logger.info(f"Risk Pass: basket of {int(passed.sum())} legs ({gross:.2f})")
+        return reasons
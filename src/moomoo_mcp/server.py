@@ -2,22 +2,33 @@ from mcp.server.fastmcp import FastMCP
 import logging
 from .market_data.get_quote import get_quote
 from .market_data.get_kline import get_kline
+from .market_data.backfill_kline import backfill_kline
 from .market_data.get_option_chain import get_option_chain
 from .market_data.get_financials import get_financials
 from .market_data.get_order_book import get_order_book
+from .market_data.get_order_book_depth import get_order_book_depth
 from .account.get_positions import get_positions
 from .account.get_balance import get_balance
 from .account.get_orders import get_orders
 from .account.get_max_buyable import get_max_buyable
 from .trading.buy_stock import buy_stock
+from .trading.place_basket import place_basket
 from .trading.sell_stock import sell_stock
 from .trading.cancel_order import cancel_order
+from .trading.cancel_orders import cancel_orders
 from .trading.modify_order import modify_order
 from .trading.get_deals import get_deals
 from .account.get_margin_ratio import get_margin_ratio
 from .market_data.get_market_snapshot import get_market_snapshot
+from .market_data.get_universe_snapshot import get_universe_snapshot
 from .analysis.get_technical_indicators import get_technical_indicators
+from .analysis.scan_indicators import scan_indicators
+from .analysis.get_multi_timeframe_indicators import get_multi_timeframe_indicators
+from .analysis.backtest import backtest
+from .analysis.analyze_option_chain import analyze_option_chain
 from .system.run_diagnostics import run_diagnostics
+from .opend.async_client import async_tool
+from .opend.scheduler import Priority
 
 # Initialize FastMCP
 mcp = FastMCP("moomoo-mcp-server")
@@ -26,24 +37,38 @@ mcp = FastMCP("moomoo-mcp-server")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-mcp.add_tool(get_quote)
-mcp.add_tool(get_kline)
-mcp.add_tool(get_option_chain)
-mcp.add_tool(get_financials)
-mcp.add_tool(get_order_book)
-mcp.add_tool(get_positions)
-mcp.add_tool(get_balance)
-mcp.add_tool(get_orders)
-mcp.add_tool(get_max_buyable)
-mcp.add_tool(buy_stock)
-mcp.add_tool(sell_stock)
-mcp.add_tool(cancel_order)
-mcp.add_tool(modify_order)
-mcp.add_tool(get_deals)
-mcp.add_tool(get_margin_ratio)
-mcp.add_tool(get_market_snapshot)
-mcp.add_tool(get_technical_indicators)
-mcp.add_tool(run_diagnostics)
+# Tools are registered as coroutines so blocking OpenD calls run on the
+# bounded executor and concurrent requests overlap. Order tools use the
+# trading lane, which has its own workers and rate-limit priority; history
+# backfills and universe scans use the bulk lane so they yield to
+# interactive requests.
+mcp.add_tool(async_tool(get_quote))
+mcp.add_tool(async_tool(get_kline))
+mcp.add_tool(async_tool(backfill_kline, priority=Priority.BULK))
+mcp.add_tool(async_tool(get_option_chain))
+mcp.add_tool(async_tool(get_financials))
+mcp.add_tool(async_tool(get_order_book))
+mcp.add_tool(async_tool(get_order_book_depth))
+mcp.add_tool(async_tool(get_positions))
+mcp.add_tool(async_tool(get_balance))
+mcp.add_tool(async_tool(get_orders))
+mcp.add_tool(async_tool(get_max_buyable))
+mcp.add_tool(async_tool(buy_stock, priority=Priority.TRADING))
+mcp.add_tool(async_tool(sell_stock, priority=Priority.TRADING))
+mcp.add_tool(async_tool(place_basket, priority=Priority.TRADING))
+mcp.add_tool(async_tool(cancel_order, priority=Priority.TRADING))
+mcp.add_tool(async_tool(cancel_orders, priority=Priority.TRADING))
+mcp.add_tool(async_tool(modify_order, priority=Priority.TRADING))
+mcp.add_tool(async_tool(get_deals))
+mcp.add_tool(async_tool(get_margin_ratio))
+mcp.add_tool(async_tool(get_market_snapshot))
+mcp.add_tool(async_tool(get_universe_snapshot, priority=Priority.BULK))
+mcp.add_tool(async_tool(get_technical_indicators))
+mcp.add_tool(async_tool(scan_indicators, priority=Priority.BULK))
+mcp.add_tool(async_tool(get_multi_timeframe_indicators, priority=Priority.BULK))
+mcp.add_tool(async_tool(backtest, priority=Priority.BULK))
+mcp.add_tool(async_tool(analyze_option_chain))
+mcp.add_tool(async_tool(run_diagnostics))
 
 @mcp.tool()
 def health_ping() -> str:
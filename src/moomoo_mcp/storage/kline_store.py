@@ -0,0 +1,323 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Bar length per ktype, used to decide how long a gap-fill stays fresh
+KTYPE_SECONDS = {
+    "K_1M": 60, "K_3M": 180, "K_5M": 300, "K_15M": 900, "K_30M": 1800, "K_60M": 3600,
+    "K_DAY": 86400, "K_WEEK": 7 * 86400, "K_MON": 30 * 86400, "K_QUARTER": 91 * 86400, "K_YEAR": 365 * 86400,
+}
+
+# Rows buffered by merge_pages before they are merged into the on-disk series
+FLUSH_ROWS = 20000
+
+KlineKey = Tuple[str, str, str]
+
+def _epoch(ts: str, end_of_day: bool = False) -> int:
+    """Seconds since epoch for a "YYYY-MM-DD[ HH:MM:SS]" string (date-only ends use 23:59:59)."""
+    if end_of_day and len(ts) <= 10:
+        ts = ts + " 23:59:59"
+    return int(pd.Timestamp(ts).value // 10**9)
+
+def _earliest(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    return min(x for x in (a, b) if x) if (a or b) else None
+
+def freshness_ttl(ktype: str) -> float:
+    """Seconds a gap-filled series is served without asking OpenD for newer bars."""
+    return min(60.0, KTYPE_SECONDS.get(str(ktype), 86400) / 4)
+
+def _json_value(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+def _rewrite_header(f, version: Tuple[int, int], offset: int, header: Dict[str, Any]) -> bool:
+    """
+    Rewrites a .npy header in place, padded to its old length (numpy reserves room
+    for the row count to grow). False if the new header no longer fits.
+    """
+    text = repr(header).encode("latin1")
+    size = 2 if version == (1, 0) else 4
+    room = offset - len(np.lib.format.MAGIC_PREFIX) - 2 - size
+    if len(text) + 1 > room:
+        return False
+    f.seek(len(np.lib.format.MAGIC_PREFIX) + 2 + size)
+    f.write(text + b" " * (room - len(text) - 1) + b"\n")
+    return True
+
+class KlineStore:
+    """
+    Columnar on-disk kline store keyed by (symbol, ktype, autype).
+
+    Each series is a directory with one .npy file per column plus meta.json.
+    Reads memory-map the arrays, so returning the newest N bars only touches
+    the tail of each file. Writes merge new bars by time (newer rows win, since
+    the latest bar may still be forming). Bars at or after the stored tail are
+    appended to the column files in place; overlapping or older bars rewrite the
+    series and swap the directory atomically. Each series has its own lock held
+    across read-modify-write, so concurrent merges of one key cannot drop bars.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[KlineKey, threading.RLock] = {}
+        self._counters = {"appends": 0, "rewrites": 0}
+
+    def _key_lock(self, key: KlineKey) -> threading.RLock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.RLock()
+            return lock
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _dir(self, key: KlineKey) -> str:
+        symbol, ktype, autype = key
+        return os.path.join(self.root, symbol, f"{ktype}_{autype}")
+
+    def meta(self, key: KlineKey) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self._dir(key), "meta.json")
+        with self._lock:
+            if not os.path.exists(path):
+                return None
+            with open(path) as f:
+                return json.load(f)
+
+    def length(self, key: KlineKey) -> int:
+        m = self.meta(key)
+        return m["rows"] if m else 0
+
+    def is_fresh(self, key: KlineKey) -> bool:
+        m = self.meta(key)
+        return bool(m) and time.time() - m["fetched_at"] < freshness_ttl(key[1])
+
+    def last_time(self, key: KlineKey) -> Optional[str]:
+        m = self.meta(key)
+        return m["last_time"] if m else None
+
+    def read(self, key: KlineKey, limit: Optional[int] = None, start: Optional[str] = None,
+             end: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Newest `limit` bars (all when None) between start and end, as a DataFrame in
+        futu's column layout. The range is located by binary search on the mapped times,
+        so only the selected rows are read from disk.
+        """
+        d = self._dir(key)
+        with self._lock:
+            meta_path = os.path.join(d, "meta.json")
+            if not os.path.exists(meta_path):
+                return None
+            with open(meta_path) as f:
+                meta = json.load(f)
+            # Rows beyond meta["rows"] belong to an append that has not completed
+            times = np.load(os.path.join(d, "time.npy"), mmap_mode="r")[:meta["rows"]]
+            lo = 0 if not start else int(np.searchsorted(times, _epoch(start), "left"))
+            hi = len(times) if not end else int(np.searchsorted(times, _epoch(end, end_of_day=True), "right"))
+            if limit is not None:
+                lo = max(lo, hi - limit)
+            lo = min(lo, hi)
+            cols: Dict[str, Any] = {"time": np.array(times[lo:hi])}  # copy the rows out of the mapping
+            for name in meta["numeric"]:
+                cols[name] = np.array(np.load(os.path.join(d, f"{name}.npy"), mmap_mode="r")[lo:hi])
+        stamps = pd.to_datetime(cols.pop("time"), unit="s").strftime(TIME_FORMAT)
+        n = len(stamps)
+        out: Dict[str, Any] = {}
+        for name in meta["columns"]:
+            if name == "time_key":
+                out[name] = stamps
+            elif name in meta["constants"]:
+                out[name] = [meta["constants"][name]] * n
+            else:
+                out[name] = cols[name]
+        return pd.DataFrame(out, columns=meta["columns"])
+
+    def merge(self, key: KlineKey, bars: pd.DataFrame, exhausted: Optional[bool] = None,
+              covered_from: Optional[str] = None, fresh: bool = True):
+        """
+        Merges bars into the stored series.
+        `exhausted` records that OpenD has no older bars (the listing's full history is stored);
+        `covered_from` records that every bar since that date is stored. `fresh` marks the
+        tail as just fetched.
+        """
+        with self._key_lock(key):
+            prev = self.meta(key) or {}
+            if bars is None or bars.empty:
+                if prev:
+                    self._update_meta(key, exhausted, covered_from, fresh)
+                return
+            exhausted = prev.get("exhausted", False) if exhausted is None else exhausted
+            covered_from = _earliest(prev.get("covered_from"), covered_from)
+            fetched_at = time.time() if fresh else prev.get("fetched_at", 0.0)
+            bars = bars.drop_duplicates(subset="time_key", keep="last").sort_values("time_key", kind="stable")
+            if prev.get("last_time") and bars["time_key"].iloc[0] >= prev["last_time"] \
+                    and self._append(key, prev, bars.reset_index(drop=True), exhausted, covered_from, fetched_at):
+                return
+            old = self.read(key)
+            merged = bars if old is None else pd.concat([old, bars], ignore_index=True)
+            merged = merged.drop_duplicates(subset="time_key", keep="last").sort_values("time_key", kind="stable")
+            self._write(key, merged.reset_index(drop=True), exhausted, covered_from, fetched_at)
+
+    def _append(self, key: KlineKey, meta: Dict[str, Any], bars: pd.DataFrame, exhausted: bool,
+                covered_from: Optional[str], fetched_at: float) -> bool:
+        """
+        Writes bars starting at or after the stored tail into the column files in place
+        (a re-sent tail bar overwrites the last row). Data goes first, then the .npy
+        headers, then meta.json, whose row count readers trust. False when the layout
+        differs and a full rewrite is needed.
+        """
+        if list(bars.columns) != meta["columns"]:
+            return False
+        numeric = [c for c in bars.columns if c != "time_key" and pd.api.types.is_numeric_dtype(bars[c])]
+        if numeric != meta["numeric"]:
+            return False
+        d = self._dir(key)
+        keep = meta["rows"] - (1 if bars["time_key"].iloc[0] == meta["last_time"] else 0)
+        columns = {"time": pd.to_datetime(bars["time_key"]).to_numpy(dtype="datetime64[s]").astype(np.int64)}
+        columns.update((c, bars[c].to_numpy()) for c in numeric)
+        with self._lock:
+            files = {}
+            try:
+                for name, values in columns.items():
+                    f = files[name] = open(os.path.join(d, f"{name}.npy"), "r+b")
+                    version = np.lib.format.read_magic(f)
+                    read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                                   else np.lib.format.read_array_header_2_0)
+                    header = read_header(f)
+                    if not np.can_cast(values.dtype, header[2], "same_kind"):
+                        return False
+                    files[name] = (f, version, header, f.tell(), values.astype(header[2], copy=False))
+                rows = keep + len(bars)
+                for f, version, (_, fortran, dtype), offset, values in files.values():
+                    f.truncate(offset + keep * dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(np.ascontiguousarray(values).tobytes())
+                for f, version, (_, fortran, dtype), offset, values in files.values():
+                    if not _rewrite_header(f, version, offset, {"descr": np.lib.format.dtype_to_descr(dtype),
+                                                                "fortran_order": fortran, "shape": (rows,)}):
+                        return False
+            finally:
+                for entry in files.values():
+                    (entry[0] if isinstance(entry, tuple) else entry).close()
+            meta = dict(meta, rows=rows, last_time=bars["time_key"].iloc[-1], fetched_at=fetched_at,
+                        exhausted=exhausted, covered_from=covered_from)
+            for c in meta["constants"]:
+                meta["constants"][c] = _json_value(bars[c].iloc[-1])
+            with open(os.path.join(d, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            self._counters["appends"] += 1
+        return True
+
+    def merge_pages(self, key: KlineKey, pages: Iterable[pd.DataFrame], flush_rows: int = FLUSH_ROWS,
+                    covered_from: Optional[str] = None, fresh: bool = False) -> int:
+        """
+        Streams pages of bars into the store, merging every `flush_rows` rows so a long
+        backfill never holds more than one buffer in memory. Returns the number of bars seen.
+        """
+        buffer: List[pd.DataFrame] = []
+        buffered = total = 0
+        for page in pages:
+            if page is None or page.empty:
+                continue
+            buffer.append(page)
+            buffered += len(page)
+            total += len(page)
+            if buffered >= flush_rows:
+                self.merge(key, pd.concat(buffer, ignore_index=True), fresh=False)
+                buffer, buffered = [], 0
+        # covered_from is only recorded once every page has landed
+        self.merge(key, pd.concat(buffer, ignore_index=True) if buffer else None,
+                   covered_from=covered_from, fresh=fresh)
+        return total
+
+    def replace(self, key: KlineKey, bars: pd.DataFrame, exhausted: bool = False):
+        """Overwrites the stored series (e.g. when a gap was too large to fill)."""
+        with self._key_lock(key):
+            self._write(key, bars.drop_duplicates(subset="time_key", keep="last").reset_index(drop=True),
+                        exhausted, None, time.time())
+
+    def touch(self, key: KlineKey, fetched_at: Optional[float] = None):
+        """Marks the stored tail as fetched at `fetched_at` (default: now)."""
+        self._update_meta(key, fetched_at=time.time() if fetched_at is None else fetched_at)
+
+    def covers(self, key: KlineKey, start: str) -> bool:
+        """True if every bar from `start` onwards (up to the stored tail) is on disk."""
+        m = self.meta(key)
+        if not m:
+            return False
+        return m["exhausted"] or (m.get("covered_from") is not None and m["covered_from"] <= start)
+
+    def _update_meta(self, key: KlineKey, exhausted: Optional[bool] = None, covered_from: Optional[str] = None,
+                     fresh: bool = False, fetched_at: Optional[float] = None):
+        meta_path = os.path.join(self._dir(key), "meta.json")
+        with self._key_lock(key), self._lock:
+            if not os.path.exists(meta_path):
+                return
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if exhausted is not None:
+                meta["exhausted"] = exhausted
+            meta["covered_from"] = _earliest(meta.get("covered_from"), covered_from)
+            if fresh:
+                meta["fetched_at"] = time.time()
+            if fetched_at is not None:
+                meta["fetched_at"] = fetched_at
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+
+    def series(self) -> List[KlineKey]:
+        """All stored (symbol, ktype, autype) keys."""
+        keys = []
+        for symbol in sorted(os.listdir(self.root)):
+            sdir = os.path.join(self.root, symbol)
+            if not os.path.isdir(sdir):
+                continue
+            for name in sorted(os.listdir(sdir)):
+                if name.endswith((".tmp", ".old")) or "_" not in name:
+                    continue
+                ktype, _, autype = name.rpartition("_")
+                keys.append((symbol, ktype, autype))
+        return keys
+
+    def _write(self, key: KlineKey, df: pd.DataFrame, exhausted: bool, covered_from: Optional[str], fetched_at: float):
+        d = self._dir(key)
+        tmp, old = d + ".tmp", d + ".old"
+        numeric = [c for c in df.columns if c != "time_key" and pd.api.types.is_numeric_dtype(df[c])]
+        constants = {
+            c: (df[c].iloc[-1] if len(df) else None)
+            for c in df.columns if c != "time_key" and c not in numeric
+        }
+        times = pd.to_datetime(df["time_key"]).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        with self._lock:
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            np.save(os.path.join(tmp, "time.npy"), times)
+            for c in numeric:
+                np.save(os.path.join(tmp, f"{c}.npy"), df[c].to_numpy())
+            meta = {
+                "symbol": key[0], "ktype": key[1], "autype": key[2],
+                "columns": list(df.columns), "numeric": numeric, "constants": constants,
+                "rows": len(df), "first_time": df["time_key"].iloc[0] if len(df) else None,
+                "last_time": df["time_key"].iloc[-1] if len(df) else None,
+                "fetched_at": fetched_at, "exhausted": exhausted, "covered_from": covered_from,
+            }
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(d):
+                os.replace(d, old)
+            os.replace(tmp, d)
+            shutil.rmtree(old, ignore_errors=True)
+            self._counters["rewrites"] += 1
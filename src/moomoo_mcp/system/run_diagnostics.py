@@ -7,6 +7,8 @@ from ..market_data.get_kline import get_kline
 from ..market_data.get_order_book import get_order_book
 from ..account.get_balance import get_balance
 from ..account.get_positions import get_positions
+from ..analysis.streaming import streams
+from ..analysis.result_cache import results as indicator_results
 from ..config import config
 
 def run_diagnostics(symbol: str = "HK.00700") -> str:
@@ -102,4 +104,34 @@ def run_diagnostics(symbol: str = "HK.00700") -> str:
     except Exception as e:
         add_result("positions", False, error=str(e))
 
+    # 7. Subscription quota (local registry, no OpenD call)
+    add_result("subscriptions", True, **client.subscription_stats())
+
+    # 8. Request coalescing counters
+    add_result("coalescing", True, **client.coalescing_stats())
+
+    # 9. Micro-batching counters
+    add_result("batching", True, **client.batching_stats())
+
+    # 10. Rate-limit scheduler (per endpoint class)
+    add_result("rate_limits", True, endpoints=client.scheduler_stats())
+
+    # 11. Chunked snapshot counters
+    add_result("chunking", True, **client.chunking_stats())
+
+    # 12. Account state cache
+    add_result("account_cache", True, **client.account_cache_stats())
+
+    # 13. Stateful risk counters
+    add_result("risk", True, **client.risk_stats())
+
+    # 14. Incremental indicator streams
+    add_result("indicator_streams", True, **streams.stats())
+
+    # 15. Indicator result cache
+    add_result("indicator_cache", True, **indicator_results.stats())
+
+    # 16. Option chain cache
+    add_result("option_chains", True, **client.option_chain_stats())
+
     return json.dumps(results, indent=2)
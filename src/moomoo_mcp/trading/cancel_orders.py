@@ -0,0 +1,25 @@
+from typing import Any, Dict, List, Optional
+from ..opend.client import get_client
+
+def cancel_orders(
+    symbol: str = "",
+    side: Optional[str] = None,
+    statuses: Optional[List[str]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_age_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Cancel all orders matching the filters in one call (default: every open order).
+    Returns matched, cancelled and failed order ids.
+
+    Args:
+        symbol: Only orders on this symbol (e.g., "HK.00700")
+        side: "BUY" or "SELL"
+        statuses: Order statuses to match (Default: open orders, e.g. ["SUBMITTED", "FILLED_PART"])
+        min_price: Only orders priced at or above this
+        max_price: Only orders priced at or below this
+        min_age_seconds: Only orders created at least this many seconds ago
+    """
+    client = get_client()
+    return client.cancel_orders(symbol, side, statuses, min_price, max_price, min_age_seconds)
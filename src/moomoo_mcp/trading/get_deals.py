@@ -1,12 +1,16 @@
-from typing import Any, List, Dict, Optional
+from typing import Optional
 from ..opend.client import get_client
+from ..utils.encoding import Encoded, validate_format
 
-def get_deals(symbol: str = "") -> List[Dict[str, Any]]:
+def get_deals(symbol: str = "", format: str = "records", precision: Optional[int] = None) -> Encoded:
     """
     Get list of executed deals (trades) for the current day.
     
     Args:
         symbol: Optional stock symbol to filter by (e.g., "HK.00700").
+        format: "records" (list of row objects, default) or "columns" (column name -> array; smaller, for bulk data).
+        precision: Float decimals in "columns" format (default: server setting).
     """
+    validate_format(format)
     client = get_client()
-    return client.get_deals(symbol=symbol)
+    return client.get_deals(symbol=symbol, format=format, precision=precision)
@@ -0,0 +1,16 @@
+from typing import Any, Dict, List
+from ..opend.client import get_client
+
+def place_basket(legs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Place several orders at once (e.g. a rebalance).
+    The basket is risk-checked as a whole (per-order and gross value limits),
+    market legs are priced from one snapshot, and legs are submitted concurrently.
+    Returns a result per leg ("placed", "rejected" or "failed") and the total wall time.
+
+    Args:
+        legs: List of orders, each {"symbol": "HK.00700", "quantity": 100, "side": "BUY" or "SELL",
+              "price": 300.0 (LIMIT only), "order_type": "LIMIT" or "MARKET" (Default: "LIMIT")}
+    """
+    client = get_client()
+    return client.place_basket(legs)
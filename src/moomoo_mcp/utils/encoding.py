@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from ..config import config
+
+FORMATS = ("records", "columns")
+
+Encoded = Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+
+def validate_format(format: str) -> str:
+    if format not in FORMATS:
+        raise ValueError(f"Invalid format: {format}. Allowed: {list(FORMATS)}")
+    return format
+
+def encode_frame(df: pd.DataFrame, format: str = "records", precision: Optional[int] = None) -> Encoded:
+    """
+    Encodes a futu DataFrame for a tool response.
+    "records" is a list of row dicts (the historical shape); "columns" maps each
+    column name to an array, with floats rounded to `precision` decimals
+    (default: config.float_precision) and NaN as null.
+    """
+    if format != "columns":
+        return df.to_dict(orient="records")
+    digits = config.float_precision if precision is None else precision
+    return {str(name): _column(df[name], digits) for name in df.columns}
+
+def encode_records(rows: List[Dict[str, Any]], format: str = "records", precision: Optional[int] = None) -> Encoded:
+    """encode_frame for rows already held as dicts (e.g. merged from a cache)."""
+    if format != "columns":
+        return rows
+    return encode_frame(pd.DataFrame.from_records(rows), format, precision)
+
+def _column(col: pd.Series, digits: int) -> List[Any]:
+    if pd.api.types.is_float_dtype(col):
+        arr = col.to_numpy(dtype=float)
+        if digits >= 0:
+            arr = np.round(arr, digits)
+        values = arr.tolist()
+        if np.isnan(arr).any():
+            values = [None if v != v else v for v in values]
+        return values
+    values = col.tolist()
+    if not col.hasnans:
+        return values
+    # Object/string columns: missing values (NaN, None, pd.NA) become null
+    return [None if missing else v for v, missing in zip(values, col.isna().tolist())]
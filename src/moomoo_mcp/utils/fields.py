@@ -0,0 +1,43 @@
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+# Named field sets for the `fields` parameter. Each is a union over the futu
+# quote/snapshot/position/account columns; names a response lacks are skipped.
+FIELD_PRESETS: Dict[str, List[str]] = {
+    "price": [
+        "code", "name", "last_price", "open_price", "high_price", "low_price", "prev_close_price",
+        "volume", "turnover", "data_date", "data_time", "update_time",
+    ],
+    "fundamentals": [
+        "code", "name", "lot_size", "pe_ratio", "pe_ttm", "pe_ttm_ratio", "pb_ratio",
+        "total_market_val", "circular_market_val", "earning_per_share", "net_asset_per_share",
+        "dividend_ttm", "dividend_ratio_ttm", "issued_shares",
+    ],
+    "risk": [
+        "code", "last_price", "amplitude", "turnover_rate", "suspension",
+        "qty", "can_sell_qty", "cost_price", "nominal_price", "market_val", "pl_val", "pl_ratio",
+        "power", "net_cash_power", "max_power_short", "total_assets", "cash",
+        "risk_status", "risk_level", "margin_call_margin", "initial_margin", "maintenance_margin",
+    ],
+}
+
+def resolve_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """Expands preset names into column names (order kept, duplicates dropped). None means all fields."""
+    if not fields:
+        return None
+    names: List[str] = []
+    for f in fields:
+        names.extend(FIELD_PRESETS.get(f, [f]))
+    return list(dict.fromkeys(names))
+
+def project_frame(df: pd.DataFrame, fields: Optional[List[str]]) -> pd.DataFrame:
+    """Keeps only the requested columns, before any per-row conversion."""
+    if not fields:
+        return df
+    return df[[c for c in fields if c in df.columns]]
+
+def project_row(row: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """project_frame for a single row dict (e.g. a cached quote)."""
+    if not fields:
+        return row
+    return {f: row[f] for f in fields if f in row}